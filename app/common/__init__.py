@@ -1,6 +1,25 @@
 """Common utilities and configuration for the ad-campaign agent system."""
 
-from .config import settings, Settings
-from .http_client import MCPClient
+from .config import settings, Settings, get_settings
+from .http_client import (
+    MCPClient,
+    AsyncMCPClient,
+    get_async_client,
+    get_sync_client,
+    get_shared_client,
+    warmup_async_clients,
+    close_async_clients,
+)
 
-__all__ = ["settings", "Settings", "MCPClient"]
+__all__ = [
+    "settings",
+    "Settings",
+    "get_settings",
+    "MCPClient",
+    "AsyncMCPClient",
+    "get_async_client",
+    "get_sync_client",
+    "get_shared_client",
+    "warmup_async_clients",
+    "close_async_clients",
+]
@@ -0,0 +1,112 @@
+"""
+Async micro-batching.
+
+Collects items submitted within a short window and hands them to a batch
+handler in one call, e.g. to parse several prompts with a single LLM request.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent submissions into batches.
+
+    Args:
+        handler: Async function mapping a list of items to a list of results
+            of the same length and order. A result that is an exception
+            instance is raised to that item's caller only.
+        max_size: Maximum number of items per batch
+        max_wait: Seconds to wait for more items after the first one arrives
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_size: int = 16,
+        max_wait: float = 0.02
+    ):
+        self.handler = handler
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._queue: Optional["asyncio.Queue[Tuple[Any, asyncio.Future]]"] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue item for the next batch and await its result."""
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((item, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop collecting batches and fail any items still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("batcher closed"))
+
+    def _ensure_worker(self) -> "asyncio.Queue[Tuple[Any, asyncio.Future]]":
+        # Queues and tasks are bound to one event loop; start fresh on a new one
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect(self._queue))
+        return self._queue
+
+    async def _collect(self, queue: "asyncio.Queue[Tuple[Any, asyncio.Future]]") -> None:
+        # Runs only while items are queued; the next submit starts a new worker
+        loop = asyncio.get_running_loop()
+        while not queue.empty():
+            batch = [queue.get_nowait()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            while len(batch) < self.max_size and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            # Dispatch without waiting so the next batch can fill meanwhile
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+        try:
+            results = await self.handler([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"batch handler returned {len(results)} results for {len(batch)} items")
+        except Exception as exc:
+            logger.warning("Batch of %d items failed: %s", len(batch), exc)
+            results = [exc] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,107 @@
+"""
+Circuit breaker for calls to downstream services.
+
+After fail_max consecutive failures the breaker opens and calls fail fast
+with CircuitBreakerError instead of waiting on a service that is down.
+After reset_timeout seconds one trial call is let through (half-open); its
+outcome closes the breaker again or re-opens it.
+"""
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreakerError(Exception):
+    """Raised when a call is rejected because the breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"Service '{name}' is unavailable (circuit open, retry in {retry_after:.0f}s)")
+
+
+class CircuitBreaker:
+    """
+    Async circuit breaker.
+
+    Args:
+        name: Name of the protected service (used in errors and logs)
+        fail_max: Consecutive failures that open the breaker
+        reset_timeout: Seconds to stay open before allowing a trial call
+        is_failure: Predicate deciding whether an exception counts as a
+            failure; by default every exception does
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fail_max: int = 5,
+        reset_timeout: float = 30.0,
+        is_failure: Optional[Callable[[BaseException], bool]] = None
+    ):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure or (lambda exc: True)
+        self.failure_count = 0
+        self._opened_at = 0.0
+        self._state = STATE_CLOSED
+
+    @property
+    def state(self) -> str:
+        """Current state; an open breaker turns half-open once reset_timeout passes."""
+        if self._state == STATE_OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = STATE_HALF_OPEN
+        return self._state
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """
+        Await func(*args, **kwargs) through the breaker.
+
+        Raises:
+            CircuitBreakerError: If the breaker is open
+        """
+        state = self.state
+        if state == STATE_OPEN:
+            retry_after = self.reset_timeout - (time.monotonic() - self._opened_at)
+            raise CircuitBreakerError(self.name, max(retry_after, 0.0))
+        if state == STATE_HALF_OPEN:
+            # Only one trial call at a time; others keep failing fast
+            self._open()
+
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as exc:
+            if self.is_failure(exc):
+                self._record_failure(state)
+            elif state == STATE_HALF_OPEN:
+                self.reset()
+            raise
+        self.reset()
+        return result
+
+    def reset(self) -> None:
+        """Close the breaker and clear the failure count."""
+        if self._state != STATE_CLOSED:
+            logger.info("Circuit breaker '%s' closed", self.name)
+        self._state = STATE_CLOSED
+        self.failure_count = 0
+
+    def _record_failure(self, state: str) -> None:
+        self.failure_count += 1
+        if state == STATE_HALF_OPEN or self.failure_count >= self.fail_max:
+            self._open()
+            logger.warning(
+                "Circuit breaker '%s' opened after %d failures", self.name, self.failure_count
+            )
+
+    def _open(self) -> None:
+        self._state = STATE_OPEN
+        self._opened_at = time.monotonic()
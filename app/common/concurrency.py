@@ -0,0 +1,23 @@
+"""
+Structured-concurrency helpers for fanning out independent async calls.
+"""
+
+import asyncio
+from typing import Any, Awaitable, List
+
+
+async def gather_or_cancel(*aws: Awaitable[Any]) -> List[Any]:
+    """
+    Run awaitables concurrently and return their results in order.
+    
+    Unlike asyncio.gather, the first failure cancels the remaining tasks
+    (via asyncio.TaskGroup) instead of leaving them running. The first
+    exception is re-raised as-is rather than wrapped in an ExceptionGroup,
+    so callers can keep catching specific exception types.
+    """
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(aw) for aw in aws]
+    except BaseExceptionGroup as eg:
+        raise eg.exceptions[0]
+    return [task.result() for task in tasks]
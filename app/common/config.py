@@ -13,6 +13,7 @@ Example for production (.env or environment variables):
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
@@ -49,6 +50,14 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: Optional[str] = None
     GEMINI_MODEL: str = "gemini-2.0-flash-lite"  # Text generation model
     GEMINI_IMAGE_MODEL: str = "gemini-3-pro-image-preview"  # Image generation model
+    # Intent requests arriving within the wait window are parsed in one Gemini call
+    INTENT_BATCH_MAX_SIZE: int = 16
+    INTENT_BATCH_MAX_WAIT_MS: int = 20
+    # Concurrent provider calls per creative_service event loop (keeps fan-out under rate limits)
+    LLM_MAX_CONCURRENCY: int = 16
+    # Serve repeated identical prompts (text, images, videos) from an in-process cache;
+    # disable when every call must re-sample
+    LLM_CACHE_ENABLED: bool = True
     
     # Replicate settings (for video generation)
     REPLICATE_API_TOKEN: Optional[str] = None
@@ -56,8 +65,14 @@ class Settings(BaseSettings):
     
     # General settings
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" (structured, one object per line) or "text"
     ENVIRONMENT: str = "development"
     
+    # Outbound HTTP (MCP service calls); HTTP/2 needs httpx[http2]
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 50
+    
     # Database settings
     DATABASE_URL: Optional[str] = None
     
@@ -69,5 +84,16 @@ class Settings(BaseSettings):
     )
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings instance.
+    
+    The environment and .env file are parsed once; call
+    get_settings.cache_clear() to pick up changes (e.g. in tests).
+    """
+    return Settings()
+
+
+# Global settings instance (kept for modules that import it directly)
+settings = get_settings()
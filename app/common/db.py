@@ -5,7 +5,8 @@ Supports PostgreSQL with SQLAlchemy, with CSV fallback mode.
 """
 
 import os
-from typing import Optional
+import orjson
+from typing import Any, Optional
 from contextlib import contextmanager
 from app.common.middleware import get_logger
 
@@ -13,14 +14,19 @@ logger = get_logger(__name__)
 
 # Try to import SQLAlchemy (optional dependency)
 try:
-    from sqlalchemy import create_engine, Column, String, Float, Integer, JSON, Text
+    from sqlalchemy import create_engine, text, Column, String, Float, Integer, JSON, Text
     from sqlalchemy.ext.declarative import declarative_base
     from sqlalchemy.orm import sessionmaker, Session
+    from sqlalchemy.pool import NullPool
+    from sqlalchemy.dialects.postgresql import JSONB
     SQLALCHEMY_AVAILABLE = True
     Base = declarative_base()
+    # JSON column type: native JSONB on PostgreSQL, generic JSON elsewhere
+    JSONType = JSON().with_variant(JSONB(), "postgresql")
 except ImportError:
     SQLALCHEMY_AVAILABLE = False
     Base = None
+    JSONType = None
     logger.info("SQLAlchemy not available, database features disabled")
 
 
@@ -35,7 +41,7 @@ if SQLALCHEMY_AVAILABLE:
         price = Column(Float, nullable=False)
         category = Column(String, nullable=False, index=True)
         image_url = Column(String, nullable=True)
-        metadata = Column(JSON, nullable=True)
+        metadata = Column(JSONType, nullable=True)
         stock_quantity = Column(Integer, default=0)
         created_at = Column(String, nullable=True)
         updated_at = Column(String, nullable=True)
@@ -52,6 +58,49 @@ except ImportError:
 # Database connection
 _engine = None
 _SessionLocal = None
+_fork_hook_registered = False
+
+
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON column values with orjson (SQLAlchemy expects str)."""
+    return orjson.dumps(value).decode()
+
+
+def _engine_options() -> dict:
+    """
+    Build create_engine() keyword arguments from the environment.
+    
+    DB_POOL_SIZE / DB_MAX_OVERFLOW size the connection pool (defaults 20 / 30).
+    DB_NULL_POOL=true disables pooling entirely, which is the safest choice
+    when an external pooler (e.g. PgBouncer) sits in front of the database.
+    SQLALCHEMY_ECHO_POOL=true logs every checkout/checkin, useful for
+    verifying that sessions are returned to the pool.
+    """
+    if os.getenv("DB_NULL_POOL", "").lower() in ("1", "true", "yes"):
+        options = {"poolclass": NullPool, "pool_pre_ping": True}
+    else:
+        options = {
+            "pool_pre_ping": True,
+            "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "30")),
+            "pool_recycle": 1800,
+            "pool_timeout": 10,
+        }
+    
+    if os.getenv("SQLALCHEMY_ECHO_POOL", "").lower() in ("1", "true", "yes"):
+        options["echo_pool"] = "debug"
+    
+    # JSON / JSONB columns are encoded and decoded with orjson
+    options["json_serializer"] = _json_serializer
+    options["json_deserializer"] = orjson.loads
+    
+    return options
+
+
+def _dispose_engine_after_fork() -> None:
+    """Drop pooled connections inherited from the parent process."""
+    if _engine is not None:
+        _engine.dispose(close=False)
 
 
 def init_db(database_url: Optional[str] = None) -> bool:
@@ -64,7 +113,7 @@ def init_db(database_url: Optional[str] = None) -> bool:
     Returns:
         True if database connection successful, False otherwise
     """
-    global _engine, _SessionLocal
+    global _engine, _SessionLocal, _fork_hook_registered
     
     if not SQLALCHEMY_AVAILABLE:
         logger.info("SQLAlchemy not available, will use CSV fallback mode")
@@ -78,17 +127,17 @@ def init_db(database_url: Optional[str] = None) -> bool:
         return False
     
     try:
-        _engine = create_engine(
-            database_url,
-            pool_pre_ping=True,
-            pool_size=5,
-            max_overflow=10
-        )
+        _engine = create_engine(database_url, **_engine_options())
         _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
         
+        # Forked workers (e.g. gunicorn --preload) must not reuse the parent's sockets
+        if not _fork_hook_registered and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_dispose_engine_after_fork)
+            _fork_hook_registered = True
+        
         # Test connection
         with _engine.connect() as conn:
-            conn.execute("SELECT 1")
+            conn.execute(text("SELECT 1"))
         
         logger.info("Database connection established successfully")
         return True
@@ -99,32 +148,18 @@ def init_db(database_url: Optional[str] = None) -> bool:
         return False
 
 
-def get_db():  # type: ignore
+def get_db():
     """
-    Get database session.
+    Yield a database session and always return it to the pool.
     
-    Returns:
-        Database session if connection available, None otherwise
+    Usable directly as a FastAPI dependency (Depends(get_db)); yields None
+    when no database connection is configured.
     """
     if _SessionLocal is None:
-        return None
-    
-    db = _SessionLocal()
-    try:
-        return db
-    except Exception as e:
-        logger.error(f"Error creating database session: {e}")
-        return None
-
-
-@contextmanager
-def get_db_session():
-    """Context manager for database session."""
-    db = get_db()
-    if db is None:
         yield None
         return
     
+    db = _SessionLocal()
     try:
         yield db
     except Exception as e:
@@ -135,6 +170,10 @@ def get_db_session():
         db.close()
 
 
+# Context manager for database session
+get_db_session = contextmanager(get_db)
+
+
 def is_db_available() -> bool:
     """Check if database is available."""
     return _engine is not None and _SessionLocal is not None
@@ -5,15 +5,23 @@ Provides standard exception classes and global exception handlers
 for consistent error responses across all services.
 """
 
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from app.common.schemas import ErrorResponse
-from app.common.middleware import get_logger
+from app.common.middleware import get_logger, request_id_context
 from typing import Optional, Dict, Any
 
 logger = get_logger(__name__)
 
+# Traceback formatting reads source files, so it runs off the event loop.
+# The pool is small on purpose: an error storm queues log work instead of
+# spawning unbounded threads.
+_error_log_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="error-log")
+
 
 class ServiceException(Exception):
     """
@@ -156,17 +164,34 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+def _log_unexpected_error(request_id: str, exc: Exception) -> None:
+    """Log an unhandled exception with its full traceback."""
+    logger.error(
+        f"[{request_id}] Unexpected error: {exc}",
+        exc_info=(type(exc), exc, exc.__traceback__),
+        extra={"exception_type": type(exc).__name__}
+    )
+
+
 async def global_exception_handler(request: Request, exc: Exception):
     """
     Global exception handler for unexpected errors.
     
     Catches all unhandled exceptions and returns standardized error response.
+    The traceback is logged from a worker thread so the response is not
+    delayed by traceback formatting.
     """
     request_id = getattr(request.state, "request_id", "unknown")
-    logger.error(
-        f"[{request_id}] Unexpected error: {exc}",
-        exc_info=True,
-        extra={"exception_type": type(exc).__name__}
+    # This handler runs in ServerErrorMiddleware, outside RequestIDMiddleware,
+    # which has already reset request_id_context; restore it for the log record
+    ctx = contextvars.copy_context()
+    ctx.run(request_id_context.set, request_id)
+    asyncio.get_running_loop().run_in_executor(
+        _error_log_executor,
+        ctx.run,
+        _log_unexpected_error,
+        request_id,
+        exc
     )
     
     return JSONResponse(
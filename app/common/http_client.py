@@ -4,12 +4,274 @@ Common HTTP client utilities for making requests to MCP services.
 Supports both synchronous and asynchronous clients for different use cases.
 """
 
+import asyncio
+import atexit
+import contextlib
+import functools
+import time
 import httpx
-from typing import Any, Dict, Optional
+import orjson
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlparse
 import logging
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_exponential_jitter,
+    retry_if_exception
+)
+from app.common.config import settings
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 requires the 'h2' package (pip install httpx[http2]); when enabled,
+# concurrent calls to a service share one connection
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+USE_HTTP2 = HTTP2_AVAILABLE and settings.HTTP2_ENABLED
+
+# prometheus-client is a declared dependency; without it metrics are skipped
+try:
+    from prometheus_client import Histogram
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+# Per-call latency of outbound MCP requests, labelled by target service,
+# endpoint and HTTP status ("error" for transport failures)
+MCP_CLIENT_LATENCY = Histogram(
+    "mcp_client_latency_seconds",
+    "Latency of MCP service calls",
+    labelnames=("service", "endpoint", "status"),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+) if PROMETHEUS_AVAILABLE else None
+
+
+class _CallLatency:
+    """Context manager that records one MCP call in MCP_CLIENT_LATENCY."""
+    
+    __slots__ = ("service", "endpoint", "status", "_start")
+    
+    def __init__(self, service: str, endpoint: str):
+        self.service = service
+        self.endpoint = endpoint
+        self.status = "error"
+    
+    def __enter__(self) -> "_CallLatency":
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if MCP_CLIENT_LATENCY is not None:
+            if isinstance(exc, httpx.HTTPStatusError):
+                self.status = str(exc.response.status_code)
+            MCP_CLIENT_LATENCY.labels(
+                service=self.service,
+                endpoint=self.endpoint,
+                status=self.status
+            ).observe(time.perf_counter() - self._start)
+        return False
+
+
+def _service_name(base_url: str) -> str:
+    """Metric label for a service: host:port of its base URL."""
+    return urlparse(base_url).netloc or base_url
+
+
+# Connection pool settings shared by all async MCP clients
+ASYNC_CLIENT_LIMITS = httpx.Limits(
+    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    max_connections=settings.HTTP_MAX_CONNECTIONS,
+    keepalive_expiry=30.0,
+)
+ASYNC_CLIENT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Connection pool settings for the synchronous MCPClient
+SYNC_CLIENT_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=50,
+    keepalive_expiry=30.0,
+)
+
+# Request bodies are serialized with orjson and sent as raw bytes
+JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _dump_json(data: Any) -> bytes:
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Upstream statuses worth retrying (gateway / overload errors)
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+
+def _is_retryable_error(exc: BaseException) -> bool:
+    """Retry transport failures and gateway errors, never other 4xx/5xx."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, httpx.TransportError)
+
+
+# Request-level retry with jittered exponential backoff, applied to every MCP call
+retry_request = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(initial=0.1, max=2.0),
+    retry=retry_if_exception(_is_retryable_error),
+    reraise=True
+)
+
+# Shared AsyncClient registry keyed by base URL; each entry remembers the
+# event loop it was created on since pooled connections are loop-bound.
+# In-repo callers (orchestrators, AsyncMCPClient, warmup) all use the ""
+# key with absolute URLs, so the process has one pool to keep warm.
+_async_clients: Dict[str, Tuple[httpx.AsyncClient, Optional[asyncio.AbstractEventLoop]]] = {}
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+# Close tasks for replaced clients; held so they are not garbage collected mid-close
+_closing: Set["asyncio.Task[None]"] = set()
+
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    # Sockets bound to a closed loop cannot be shut down cleanly; release what can be
+    with contextlib.suppress(Exception):
+        await client.aclose()
+
+
+def _close_stale_client(
+    client: httpx.AsyncClient,
+    client_loop: Optional[asyncio.AbstractEventLoop],
+    loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """Close a client replaced because it belongs to another event loop."""
+    if client_loop is not None and client_loop is not loop and client_loop.is_running():
+        # Its connections belong to that loop, so close it there
+        asyncio.run_coroutine_threadsafe(_aclose_quietly(client), client_loop)
+    elif loop is not None:
+        task = loop.create_task(_aclose_quietly(client))
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+
+def get_async_client(base_url: str = "") -> httpx.AsyncClient:
+    """
+    Get the shared, connection-pooled AsyncClient for a base URL.
+    
+    Clients are created lazily and reused across requests so that
+    keep-alive connections survive between calls.
+    
+    Args:
+        base_url: Base URL of the MCP service
+        
+    Returns:
+        Shared httpx.AsyncClient instance
+    """
+    key = base_url.rstrip("/")
+    loop = _current_loop()
+    entry = _async_clients.get(key)
+    if entry is not None:
+        client, client_loop = entry
+        if not client.is_closed and client_loop is loop:
+            return client
+        if not client.is_closed:
+            _close_stale_client(client, client_loop, loop)
+    
+    client = httpx.AsyncClient(
+        base_url=key,
+        http2=USE_HTTP2,
+        timeout=ASYNC_CLIENT_TIMEOUT,
+        limits=ASYNC_CLIENT_LIMITS,
+    )
+    _async_clients[key] = (client, loop)
+    return client
+
+
+async def _warm_one(base_url: str, health_path: str) -> None:
+    """Resolve DNS and open one connection to a service in the shared pool."""
+    parsed = urlparse(base_url)
+    if parsed.hostname:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        await asyncio.get_running_loop().getaddrinfo(parsed.hostname, port)
+    # Warm the same client the orchestrators call through (get_async_client())
+    await get_async_client().get(f"{base_url.rstrip('/')}{health_path}")
+
+
+async def warmup_async_clients(
+    base_urls: Iterable[str],
+    health_path: str = "/health",
+    timeout: float = 2.0
+) -> None:
+    """
+    Pre-open pooled connections to the given services (call on startup).
+    
+    Pays DNS resolution and TCP/TLS handshakes before the first user request.
+    Connections are opened on the shared client returned by get_async_client(),
+    so the first call made through that client reuses a warm keep-alive socket. Unreachable
+    services are ignored; warmup never blocks startup for longer than timeout.
+    
+    Args:
+        base_urls: Service base URLs to warm
+        health_path: Cheap endpoint to request on each service
+        timeout: Overall time budget in seconds
+    """
+    tasks = [_warm_one(url, health_path) for url in dict.fromkeys(base_urls) if url]
+    if not tasks:
+        return
+    with contextlib.suppress(Exception):
+        await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout)
+    logger.info(f"Warmed connections to {len(tasks)} services")
+
+
+async def close_async_clients() -> None:
+    """Close all shared async clients (call on application shutdown)."""
+    entries = list(_async_clients.values())
+    _async_clients.clear()
+    for client, _ in entries:
+        if not client.is_closed:
+            await client.aclose()
+
+
+# Process-wide synchronous client shared by every MCPClient instance
+_sync_client: Optional[httpx.Client] = None
+
+
+def get_sync_client() -> httpx.Client:
+    """
+    Get the shared, connection-pooled synchronous httpx.Client.
+    
+    All MCPClient instances use this client, so keep-alive connections to a
+    service are reused no matter how many client objects are created.
+    """
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=httpx.HTTPTransport(
+                http2=USE_HTTP2,
+                limits=SYNC_CLIENT_LIMITS,
+                retries=2
+            )
+        )
+    return _sync_client
+
+
+@atexit.register
+def close_sync_client() -> None:
+    """Close the shared synchronous client (registered to run at exit)."""
+    global _sync_client
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
+
 
 class MCPClient:
     """
@@ -27,8 +289,22 @@ class MCPClient:
             timeout: Request timeout in seconds
         """
         self.base_url = base_url.rstrip("/")
+        self.service_name = _service_name(self.base_url)
         self.timeout = timeout
-        self.client = httpx.Client(timeout=timeout)
+        # Shared long-lived client: keep-alive connections are reused across
+        # calls and instances, and the transport retries failed connects.
+        self.client = get_sync_client()
+    
+    @retry_request
+    def _send(self, method: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying transient failures."""
+        with _CallLatency(self.service_name, endpoint) as call:
+            response = self.client.request(
+                method, f"{self.base_url}{endpoint}", timeout=self.timeout, **kwargs
+            )
+            call.status = str(response.status_code)
+            response.raise_for_status()
+            return response
     
     def post(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -48,9 +324,8 @@ class MCPClient:
         logger.info(f"POST {url}")
         
         try:
-            response = self.client.post(url, json=data)
-            response.raise_for_status()
-            return response.json()
+            response = self._send("POST", endpoint, content=_dump_json(data), headers=JSON_HEADERS)
+            return orjson.loads(response.content)
         except httpx.HTTPError as e:
             logger.error(f"HTTP error calling {url}: {e}")
             raise
@@ -73,16 +348,20 @@ class MCPClient:
         logger.info(f"GET {url}")
         
         try:
-            response = self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            return orjson.loads(self._send("GET", endpoint, params=params).content)
         except httpx.HTTPError as e:
             logger.error(f"HTTP error calling {url}: {e}")
             raise
     
     def close(self):
-        """Close the HTTP client."""
-        self.client.close()
+        """
+        Close the HTTP client.
+        
+        The shared pooled client stays open for other instances; it is
+        closed at interpreter exit by close_sync_client().
+        """
+        if self.client is not _sync_client:
+            self.client.close()
     
     def __enter__(self):
         return self
@@ -91,11 +370,24 @@ class MCPClient:
         self.close()
 
 
+@functools.lru_cache(maxsize=None)
+def get_shared_client(base_url: str) -> MCPClient:
+    """
+    Get the process-wide MCPClient for a service URL.
+    
+    Every service client object created for the same URL reuses one
+    MCPClient; the underlying pool is closed at exit by close_sync_client().
+    """
+    return MCPClient(base_url)
+
+
 class AsyncMCPClient:
     """
     Asynchronous HTTP client for communicating with MCP microservices.
     
     Recommended for orchestrator services that need to call multiple services concurrently.
+    Requests go through the process-wide pooled client from get_async_client(),
+    so instances are cheap to create and calls can be overlapped with asyncio.gather.
     """
     
     def __init__(self, base_url: str, timeout: int = 30):
@@ -107,18 +399,36 @@ class AsyncMCPClient:
             timeout: Request timeout in seconds
         """
         self.base_url = base_url.rstrip("/")
+        self.service_name = _service_name(self.base_url)
         self.timeout = timeout
         self.client: Optional[httpx.AsyncClient] = None
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self.client = httpx.AsyncClient(timeout=self.timeout)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
         await self.close()
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the explicitly assigned client or the shared pooled one."""
+        if self.client is not None:
+            return self.client
+        # Requests use absolute URLs, so they share the orchestrators' pool
+        return get_async_client()
+    
+    @retry_request
+    async def _send(self, method: str, endpoint: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying transient failures."""
+        with _CallLatency(self.service_name, endpoint) as call:
+            response = await self._get_client().request(
+                method, f"{self.base_url}{endpoint}", timeout=self.timeout, **kwargs
+            )
+            call.status = str(response.status_code)
+            response.raise_for_status()
+            return response
+    
     async def post(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Make an async POST request to the MCP service.
@@ -133,16 +443,12 @@ class AsyncMCPClient:
         Raises:
             httpx.HTTPError: If the request fails
         """
-        if not self.client:
-            self.client = httpx.AsyncClient(timeout=self.timeout)
-        
         url = f"{self.base_url}{endpoint}"
         logger.info(f"POST {url}")
         
         try:
-            response = await self.client.post(url, json=data)
-            response.raise_for_status()
-            return response.json()
+            response = await self._send("POST", endpoint, content=_dump_json(data), headers=JSON_HEADERS)
+            return orjson.loads(response.content)
         except httpx.HTTPError as e:
             logger.error(f"HTTP error calling {url}: {e}")
             raise
@@ -161,22 +467,21 @@ class AsyncMCPClient:
         Raises:
             httpx.HTTPError: If the request fails
         """
-        if not self.client:
-            self.client = httpx.AsyncClient(timeout=self.timeout)
-        
         url = f"{self.base_url}{endpoint}"
         logger.info(f"GET {url}")
         
         try:
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            response = await self._send("GET", endpoint, params=params)
+            return orjson.loads(response.content)
         except httpx.HTTPError as e:
             logger.error(f"HTTP error calling {url}: {e}")
             raise
     
     async def close(self):
-        """Close the async HTTP client."""
-        if self.client:
-            await self.client.aclose()
-            self.client = None
+        """
+        Release the client.
+        
+        The shared pool is left open for other callers; it is closed by
+        close_async_clients() on application shutdown.
+        """
+        self.client = None
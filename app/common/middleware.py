@@ -2,7 +2,7 @@
 Common middleware and logging configuration for all services.
 
 This module provides:
-- Unified logging configuration with request ID tracking
+- Unified logging configuration with request ID tracking (JSON or plain text)
 - CORS middleware factory
 - Request ID middleware for request tracing
 """
@@ -10,65 +10,136 @@ This module provides:
 import logging
 import uuid
 import time
-from typing import Optional
-from fastapi import Request, Response
+from functools import lru_cache
+from typing import Any, Optional
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from contextvars import ContextVar
+import orjson
+from pythonjsonlogger import jsonlogger
 
 # Context variable for request ID
 request_id_context: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
 
+# Fields emitted by the JSON formatter. 'created' is the raw epoch timestamp,
+# so no strftime runs per record.
+JSON_LOG_FORMAT = '%(created)f %(levelname)s %(name)s %(request_id)s %(message)s'
+TEXT_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s'
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+
+class RequestIDMiddleware:
     """
     Middleware to add request ID to all requests for tracing.
     
     Adds X-Request-ID header to responses and makes request_id available
     in request.state for logging.
+    
+    The ID is also set on request_id_context for the duration of the request.
+    Work started in the background (threads, tasks created outside the request)
+    does not inherit it automatically; run it under contextvars.copy_context()
+    or set request_id_context explicitly.
+    
+    Implemented as plain ASGI middleware (rather than BaseHTTPMiddleware) so
+    it adds no extra task or body-buffering hop per request.
     """
     
-    async def dispatch(self, request: Request, call_next):
-        # Generate or extract request ID
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())[:8]
-        request.state.request_id = request_id
-        request_id_context.set(request_id)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Process request
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
+        # Reuse the caller's request ID; only generate one when it is missing
+        request_id = None
+        for key, value in scope["headers"]:
+            if key == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id:
+            request_id = uuid.uuid4().hex[:8]
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_context.set(request_id)
+        start_ns = time.perf_counter_ns()
         
-        # Add headers
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Process-Time"] = f"{process_time:.4f}"
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                process_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Process-Time"] = f"{process_ms:.3f}ms"
+            await send(message)
         
-        return response
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            # Don't let this request's ID leak into whatever runs next in this context
+            request_id_context.reset(token)
 
 
 class RequestIDFilter(logging.Filter):
-    """Logging filter to add request ID to log records."""
+    """
+    Logging filter to add request ID to log records.
+    
+    Kept for handlers configured outside setup_logging(); records created
+    through the logging module already carry request_id via the record factory.
+    """
     
     def filter(self, record):
         record.request_id = request_id_context.get() or "no-request-id"
         return True
 
 
-def setup_logging(level: str = "INFO", service_name: Optional[str] = None):
+_base_record_factory = logging.getLogRecordFactory()
+
+
+def _request_id_record_factory(*args, **kwargs) -> logging.LogRecord:
+    """Stamp each record with the current request ID once, at creation time."""
+    record = _base_record_factory(*args, **kwargs)
+    record.request_id = request_id_context.get() or "no-request-id"
+    return record
+
+
+logging.setLogRecordFactory(_request_id_record_factory)
+
+
+def _json_dumps(obj: Any, default=None, cls=None, indent=None, ensure_ascii=True) -> str:
+    """json.dumps-compatible serializer (backed by orjson) used by the JSON log formatter."""
+    return orjson.dumps(obj, default=default or str).decode()
+
+
+def _build_formatter(log_format: str, service_name: Optional[str] = None) -> logging.Formatter:
+    """Create the console formatter for the given format ("json" or "text")."""
+    if log_format.lower() == "text":
+        return logging.Formatter(fmt=TEXT_LOG_FORMAT, datefmt='%Y-%m-%d %H:%M:%S')
+    
+    return jsonlogger.JsonFormatter(
+        fmt=JSON_LOG_FORMAT,
+        rename_fields={"created": "ts", "levelname": "level", "name": "logger"},
+        static_fields={"service": service_name} if service_name else {},
+        json_serializer=_json_dumps,
+        json_default=str
+    )
+
+
+def setup_logging(level: str = "INFO", service_name: Optional[str] = None, log_format: Optional[str] = None):
     """
     Configure unified logging format for all services.
     
     Args:
         level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         service_name: Optional service name to include in logs
+        log_format: "json" (one JSON object per line) or "text"; defaults to settings.LOG_FORMAT
     """
     log_level = getattr(logging, level.upper(), logging.INFO)
     
-    # Create formatter with request ID support
-    formatter = logging.Formatter(
-        fmt='%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    if log_format is None:
+        from app.common.config import settings
+        log_format = settings.LOG_FORMAT
+    
+    formatter = _build_formatter(log_format, service_name)
     
     # Configure root logger
     root_logger = logging.getLogger()
@@ -82,7 +153,6 @@ def setup_logging(level: str = "INFO", service_name: Optional[str] = None):
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    console_handler.addFilter(RequestIDFilter())
     root_logger.addHandler(console_handler)
     
     # Set service-specific logger if provided
@@ -93,7 +163,6 @@ def setup_logging(level: str = "INFO", service_name: Optional[str] = None):
             service_handler = logging.StreamHandler()
             service_handler.setLevel(log_level)
             service_handler.setFormatter(formatter)
-            service_handler.addFilter(RequestIDFilter())
             service_logger.addHandler(service_handler)
 
 
@@ -136,19 +205,40 @@ def get_cors_middleware_class(allowed_origins: Optional[list] = None):
     return create_cors_middleware
 
 
+def mount_metrics_endpoint(app, path: str = "/metrics") -> bool:
+    """
+    Expose Prometheus metrics (e.g. MCP client latency histograms) on the app.
+    
+    Args:
+        app: FastAPI application instance
+        path: Mount path for the metrics endpoint
+    
+    Returns:
+        True if mounted, False when prometheus-client is not installed
+    """
+    try:
+        from prometheus_client import make_asgi_app
+    except ImportError:
+        return False
+    
+    app.mount(path, make_asgi_app())
+    return True
+
+
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance with request ID support.
     
+    Request IDs are attached by the log record factory, so no per-logger
+    filter is needed. Results are memoized per name, so calling this inside
+    functions costs a dict lookup.
+    
     Args:
         name: Logger name (typically __name__)
     
     Returns:
         Configured logger instance
     """
-    logger = logging.getLogger(name)
-    # Ensure RequestIDFilter is applied
-    if not any(isinstance(f, RequestIDFilter) for f in logger.filters):
-        logger.addFilter(RequestIDFilter())
-    return logger
+    return logging.getLogger(name)
 
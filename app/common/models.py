@@ -4,13 +4,13 @@ SQLAlchemy ORM models for database persistence.
 This module defines all database models used across services.
 """
 
-from app.common.db import Base, SQLALCHEMY_AVAILABLE
+from app.common.db import Base, JSONType, SQLALCHEMY_AVAILABLE
 from app.common.middleware import get_logger
 
 logger = get_logger(__name__)
 
 if SQLALCHEMY_AVAILABLE:
-    from sqlalchemy import Column, String, Text, Boolean, DateTime, JSON, Index
+    from sqlalchemy import Column, String, Text, Boolean, DateTime, Index
     from sqlalchemy.dialects.postgresql import UUID
     import uuid
     
@@ -24,7 +24,7 @@ if SQLALCHEMY_AVAILABLE:
         service = Column(String(100), nullable=False, index=True)
         level = Column(String(20), nullable=False, index=True)  # INFO, ERROR, WARNING
         message = Column(Text, nullable=True)
-        context = Column(JSON, nullable=True)  # Merged request/response/metadata
+        context = Column(JSONType, nullable=True)  # Merged request/response/metadata
         correlation_id = Column(String(100), nullable=True, index=True)
         success = Column(Boolean, nullable=False, default=True)
         created_at = Column(DateTime, nullable=False, server_default='now()')
@@ -0,0 +1,19 @@
+"""
+Uvicorn launch settings shared by every service entrypoint.
+"""
+
+from typing import Any
+
+# uvloop/httptools come with uvicorn[standard] (not available on Windows)
+try:
+    import uvloop  # noqa: F401
+    import httptools  # noqa: F401
+    UVICORN_LOOP, UVICORN_HTTP = "uvloop", "httptools"
+except ImportError:
+    UVICORN_LOOP, UVICORN_HTTP = "asyncio", "h11"
+
+
+def run_server(app: Any, port: int, host: str = "0.0.0.0") -> None:
+    """Serve app with uvicorn on the fastest available event loop and HTTP parser."""
+    import uvicorn
+    uvicorn.run(app, host=host, port=port, loop=UVICORN_LOOP, http=UVICORN_HTTP)
@@ -8,51 +8,105 @@ All validation uses Pydantic models from app.common.schemas, leveraging FastAPI'
 built-in validation mechanisms.
 """
 
-from typing import Dict, Any, List, Optional, Type
-from pydantic import BaseModel, ValidationError
+import importlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Type
+from pydantic import BaseModel, TypeAdapter, ValidationError
 import logging
 
-from .schemas import (
-    CampaignSpec,
-    Product,
-    ProductGroup,
-    Creative,
-    AbstractStrategy,
-    PlatformStrategy,
-    ErrorResponse,
-    LogEvent,
-)
-
 logger = logging.getLogger(__name__)
 
-# Schema mapping for validation
-SCHEMA_MODELS: Dict[str, Type[BaseModel]] = {
-    "campaign_spec": CampaignSpec,
-    "product": Product,
-    "product_group": ProductGroup,
-    "creative": Creative,
-    "abstract_strategy": AbstractStrategy,
-    "platform_strategy": PlatformStrategy,
-    "error_response": ErrorResponse,
-    "log_event": LogEvent,
+# Schema registry: name -> "module:ClassName", resolved on first use so a
+# process only imports and compiles the schemas it actually validates.
+_SCHEMA_PATHS: Dict[str, str] = {
+    "campaign_spec": "app.common.schemas:CampaignSpec",
+    "product": "app.common.schemas:Product",
+    "product_group": "app.common.schemas:ProductGroup",
+    "creative": "app.common.schemas:Creative",
+    "abstract_strategy": "app.common.schemas:AbstractStrategy",
+    "platform_strategy": "app.common.schemas:PlatformStrategy",
+    "error_response": "app.common.schemas:ErrorResponse",
+    "log_event": "app.common.schemas:LogEvent",
 }
 
 
+@lru_cache(maxsize=None)
+def _get_model(schema_name: str) -> Type[BaseModel]:
+    """Resolve a schema name to its model class (raises KeyError if unknown)."""
+    module_name, class_name = _SCHEMA_PATHS[schema_name].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+@lru_cache(maxsize=None)
+def _get_adapter(schema_name: str) -> TypeAdapter:
+    """Compiled validator for a single item of the schema."""
+    return TypeAdapter(_get_model(schema_name))
+
+
+@lru_cache(maxsize=None)
+def _get_list_adapter(schema_name: str) -> TypeAdapter:
+    """Compiled validator for a list of items of the schema."""
+    return TypeAdapter(List[_get_model(schema_name)])
+
+
+@dataclass(slots=True, frozen=True)
 class ValidationResult:
     """Result of a validation operation."""
     
-    def __init__(self, valid: bool, errors: List[Dict[str, Any]] = None):
-        self.valid = valid
-        self.errors = errors or []
+    valid: bool
+    errors: Tuple[Dict[str, Any], ...] = ()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format."""
         return {
             "valid": self.valid,
-            "errors": self.errors
+            "errors": list(self.errors)
         }
 
 
+# Shared result for successful validations (immutable, so safe to reuse)
+_OK_RESULT = ValidationResult(valid=True)
+
+
+def _unknown_schema_result(schema_name: str) -> ValidationResult:
+    """Build the result returned for an unregistered schema name."""
+    logger.warning(f"Unknown schema name: {schema_name}")
+    return ValidationResult(
+        valid=False,
+        errors=({
+            "field": "schema_name",
+            "error": f"Unknown schema: {schema_name}",
+            "value": schema_name
+        },)
+    )
+
+
+def _format_errors(exc: ValidationError, list_input: bool = False) -> List[Dict[str, Any]]:
+    """
+    Convert a Pydantic ValidationError into field/error/value dicts.
+    
+    For list validation the first loc element is the item index, which is
+    rendered as an "[idx]." prefix on the field path.
+    """
+    errors: List[Dict[str, Any]] = []
+    append = errors.append
+    for error in exc.errors(include_url=False):
+        loc = error["loc"]
+        if list_input and loc:
+            field = "[%s]" % loc[0]
+            if len(loc) > 1:
+                field += "." + ".".join(map(str, loc[1:]))
+        else:
+            field = ".".join(map(str, loc))
+        append({
+            "field": field,
+            "error": error.get("msg", "Validation error"),
+            "value": error.get("input")
+        })
+    return errors
+
+
 def validate_data(schema_name: str, data: Dict[str, Any]) -> ValidationResult:
     """
     Validate data against a schema using Pydantic models.
@@ -74,47 +128,30 @@ def validate_data(schema_name: str, data: Dict[str, Any]) -> ValidationResult:
         >>> if result.valid:
         ...     logger.info("Validation passed")
     """
-    if schema_name not in SCHEMA_MODELS:
-        logger.warning(f"Unknown schema name: {schema_name}")
-        return ValidationResult(
-            valid=False,
-            errors=[{
-                "field": "schema_name",
-                "error": f"Unknown schema: {schema_name}",
-                "value": schema_name
-            }]
-        )
-    
-    model_class = SCHEMA_MODELS[schema_name]
+    try:
+        adapter = _get_adapter(schema_name)
+    except KeyError:
+        return _unknown_schema_result(schema_name)
     
     try:
-        # Attempt to create model instance - Pydantic will validate
-        instance = model_class(**data)
-        logger.debug(f"Validation passed for schema: {schema_name}")
-        return ValidationResult(valid=True, errors=[])
+        adapter.validate_python(data)
+        logger.debug("Validation passed for schema: %s", schema_name)
+        return _OK_RESULT
     
     except ValidationError as e:
-        # Extract validation errors
-        errors = []
-        for error in e.errors():
-            errors.append({
-                "field": ".".join(str(loc) for loc in error.get("loc", [])),
-                "error": error.get("msg", "Validation error"),
-                "value": error.get("input")
-            })
-        
+        errors = _format_errors(e)
         logger.warning(f"Validation failed for schema {schema_name}: {len(errors)} errors")
-        return ValidationResult(valid=False, errors=errors)
+        return ValidationResult(valid=False, errors=tuple(errors))
     
     except Exception as e:
         logger.error(f"Unexpected error during validation: {e}", exc_info=True)
         return ValidationResult(
             valid=False,
-            errors=[{
+            errors=({
                 "field": "validation",
                 "error": f"Unexpected validation error: {str(e)}",
                 "value": None
-            }]
+            },)
         )
 
 
@@ -144,17 +181,67 @@ def validate_list(schema_name: str, data_list: List[Dict[str, Any]]) -> Validati
     Returns:
         ValidationResult with validation status and all errors
     """
-    all_errors = []
-    all_valid = True
-    
-    for idx, item in enumerate(data_list):
-        result = validate_data(schema_name, item)
-        if not result.valid:
-            all_valid = False
-            # Prefix errors with index
-            for error in result.errors:
-                error["field"] = f"[{idx}].{error['field']}"
-                all_errors.append(error)
+    try:
+        adapter = _get_list_adapter(schema_name)
+    except KeyError:
+        return _unknown_schema_result(schema_name)
     
-    return ValidationResult(valid=all_valid, errors=all_errors)
+    # One validation pass over the whole list; item indices come from the error locations
+    try:
+        adapter.validate_python(data_list)
+        return _OK_RESULT
+    except ValidationError as e:
+        errors = _format_errors(e, list_input=True)
+        logger.warning(f"Validation failed for schema {schema_name}: {len(errors)} errors")
+        return ValidationResult(valid=False, errors=tuple(errors))
 
+
+def validate_many(schema_name: str, items: List[Dict[str, Any]]) -> List[ValidationResult]:
+    """
+    Validate several items against a schema, returning one result per item.
+    
+    Unlike validate_list, errors are not merged: each item gets its own
+    ValidationResult. The whole list is still validated in a single
+    pydantic-core pass.
+    
+    Args:
+        schema_name: Name of the schema to validate against
+        items: List of data dictionaries to validate
+        
+    Returns:
+        List of ValidationResult, in the same order as items; a single failed
+        result if items is not a list
+    """
+    try:
+        adapter = _get_list_adapter(schema_name)
+    except KeyError:
+        return [_unknown_schema_result(schema_name)] * len(items)
+    
+    try:
+        adapter.validate_python(items)
+        return [_OK_RESULT] * len(items)
+    except ValidationError as e:
+        errors = e.errors(include_url=False)
+        if any(not error["loc"] for error in errors):
+            # Not a list at all (e.g. a single dict): there are no items to report on
+            logger.warning("Validation failed for schema %s: input is not a list", schema_name)
+            return [ValidationResult(valid=False, errors=tuple(
+                {"field": "", "error": error.get("msg", "Validation error"), "value": error.get("input")}
+                for error in errors if not error["loc"]
+            ))]
+        item_errors: Dict[int, List[Dict[str, Any]]] = {}
+        for error in errors:
+            loc = error["loc"]
+            item_errors.setdefault(loc[0], []).append({
+                "field": ".".join(map(str, loc[1:])),
+                "error": error.get("msg", "Validation error"),
+                "value": error.get("input")
+            })
+        logger.warning(
+            "Validation failed for schema %s: %d of %d items invalid",
+            schema_name, len(item_errors), len(items)
+        )
+        return [
+            ValidationResult(valid=False, errors=tuple(item_errors[i])) if i in item_errors else _OK_RESULT
+            for i in range(len(items))
+        ]
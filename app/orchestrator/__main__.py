@@ -4,8 +4,8 @@ Allows: python -m app.orchestrator.llm_service
 """
 
 if __name__ == "__main__":
-    import uvicorn
+    from app.common.server import run_server
     from .llm_service import app
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    run_server(app, port=8000)
 
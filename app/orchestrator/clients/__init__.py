@@ -4,7 +4,7 @@ from .product_client import ProductClient
 from .creative_client import CreativeClient
 from .strategy_client import StrategyClient
 from .meta_client import MetaClient
-from .logs_client import LogsClient
+from .logs_client import LogsClient, close_logs_clients
 from .validator_client import ValidatorClient
 from .optimizer_client import OptimizerClient
 
@@ -14,6 +14,7 @@ __all__ = [
     "StrategyClient",
     "MetaClient",
     "LogsClient",
+    "close_logs_clients",
     "ValidatorClient",
     "OptimizerClient"
 ]
@@ -3,8 +3,8 @@ Client for interacting with the Creative Service.
 """
 
 from typing import Dict, Any, List, Optional
-from app.common.http_client import MCPClient
-from app.common.config import settings
+from app.common.http_client import AsyncMCPClient
+from app.common.config import get_settings
 
 
 class CreativeClient:
@@ -12,9 +12,9 @@ class CreativeClient:
     
     def __init__(self):
         """Initialize the creative service client."""
-        self.client = MCPClient(settings.CREATIVE_SERVICE_URL)
+        self.client = AsyncMCPClient(get_settings().CREATIVE_SERVICE_URL)
     
-    def generate_creatives(
+    async def generate_creatives(
         self,
         product_ids: List[str],
         campaign_objective: str,
@@ -45,25 +45,37 @@ class CreativeClient:
         if creative_types:
             request_data["creative_types"] = creative_types
         
-        return self.client.post("/generate_creatives", request_data)
+        return await self.client.post("/generate_creatives", request_data)
     
-    def close(self) -> None:
+    async def close(self) -> None:
         """Close the client connection."""
-        self.client.close()
+        await self.client.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
 
 
 if __name__ == "__main__":
     # Example usage
+    import asyncio
+    from app.common.http_client import close_async_clients
     from app.common.middleware import get_logger
     logger = get_logger(__name__)
     
-    client = CreativeClient()
-    try:
-        result = client.generate_creatives(
-            product_ids=["PROD-001", "PROD-002"],
-            campaign_objective="increase sales",
-            target_audience="tech enthusiasts"
-        )
-        logger.info(f"Generated creatives: {result}")
-    finally:
-        client.close()
+    async def main():
+        client = CreativeClient()
+        try:
+            result = await client.generate_creatives(
+                product_ids=["PROD-001", "PROD-002"],
+                campaign_objective="increase sales",
+                target_audience="tech enthusiasts"
+            )
+            logger.info(f"Generated creatives: {result}")
+        finally:
+            await client.close()
+            await close_async_clients()
+
+    asyncio.run(main())
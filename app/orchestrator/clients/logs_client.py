@@ -2,66 +2,202 @@
 Client for interacting with the Logs Service.
 """
 
-from typing import Dict, Any, Optional
-from app.common.http_client import MCPClient
-from app.common.config import settings
+import asyncio
+import logging
+import weakref
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Any, List, Optional
+from app.common.http_client import AsyncMCPClient
+from app.common.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Event types that may be dropped when the queue is full; all others block
+DROPPABLE_EVENT_TYPES = frozenset({"debug", "trace"})
+
+
+class _LogBatcher:
+    """
+    Buffers log events in an asyncio.Queue and ships them in batches.
+    
+    A background task flushes whenever max_batch events are queued or
+    max_wait seconds have passed since the first event of the batch.
+    """
+    
+    def __init__(
+        self,
+        send_batch: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+        max_batch: int = 64,
+        max_wait: float = 0.05,
+        max_queue: int = 4096
+    ):
+        self._send_batch = send_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+    
+    def _ensure_started(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flusher())
+    
+    async def enqueue(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue an event for delivery; non-critical events are dropped on overflow."""
+        self._ensure_started()
+        if self._queue.full() and event.get("stage") in DROPPABLE_EVENT_TYPES:
+            logger.debug(f"Log queue full, dropping {event.get('stage')} event")
+            return {"status": "dropped"}
+        await self._queue.put(event)
+        return {"status": "queued"}
+    
+    async def _flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._send_batch(batch)
+            except Exception as e:
+                # The HTTP client already retried; don't let logging failures kill the flusher
+                logger.error(f"Failed to deliver {len(batch)} log events: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def flush(self) -> None:
+        """Wait until every queued event has been sent (or failed)."""
+        if self._task is not None and not self._task.done():
+            await self._queue.join()
+    
+    async def close(self) -> None:
+        """Drain the queue and stop the background task."""
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Batching clients whose queues must be drained on shutdown (close_logs_clients)
+_batching_clients: "weakref.WeakSet[LogsClient]" = weakref.WeakSet()
 
 
 class LogsClient:
     """Client for the Logs Service MCP."""
     
-    def __init__(self):
-        """Initialize the logs service client."""
-        self.client = MCPClient(settings.LOGS_SERVICE_URL)
+    def __init__(self, batched: bool = True, service: str = "orchestrator"):
+        """
+        Initialize the logs service client.
+        
+        Args:
+            batched: Queue events and send them via /append_events_batch
+                instead of one request per event
+            service: Service name recorded on every event
+        """
+        self.service = service
+        self.client = AsyncMCPClient(get_settings().LOGS_SERVICE_URL)
+        self._batcher = _LogBatcher(self._send_batch) if batched else None
+        if batched:
+            _batching_clients.add(self)
+    
+    async def _send_batch(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return await self.client.post("/append_events_batch", events)
     
-    def append_event(
+    async def append_event(
         self,
         event_type: str,
         message: str,
         metadata: Optional[Dict[str, Any]] = None,
-        campaign_id: Optional[str] = None
+        campaign_id: Optional[str] = None,
+        success: bool = True
     ) -> Dict[str, Any]:
         """
         Append an event to the logs.
         
+        The event is sent in the logs service's AppendEventRequest shape:
+        event_type becomes the stage, and message and campaign_id are stored
+        in metadata.
+        
         Args:
             event_type: Type of event
             message: Event message
             metadata: Additional event metadata
             campaign_id: Associated campaign ID
+            success: Whether the logged operation succeeded
             
         Returns:
-            Status and event ID
+            Status and event ID, or {"status": "queued"} when batching
         """
+        event_metadata = {**(metadata or {}), "message": message}
+        if campaign_id:
+            event_metadata["campaign_id"] = campaign_id
+        
         request_data = {
-            "event_type": event_type,
-            "message": message
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "stage": event_type,
+            "service": self.service,
+            "success": success,
+            "metadata": event_metadata
         }
         
-        if metadata:
-            request_data["metadata"] = metadata
-        if campaign_id:
-            request_data["campaign_id"] = campaign_id
-        
-        return self.client.post("/append_event", request_data)
+        if self._batcher is not None:
+            return await self._batcher.enqueue(request_data)
+        return await self.client.post("/append_event", request_data)
+    
+    async def flush(self) -> None:
+        """Wait for all queued events to be delivered."""
+        if self._batcher is not None:
+            await self._batcher.flush()
+    
+    async def close(self) -> None:
+        """Flush queued events and close the client connection."""
+        _batching_clients.discard(self)
+        if self._batcher is not None:
+            await self._batcher.close()
+        await self.client.close()
+    
+    async def __aenter__(self):
+        return self
     
-    def close(self) -> None:
-        """Close the client connection."""
-        self.client.close()
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+async def close_logs_clients() -> None:
+    """Drain and close every open batching LogsClient (call on application shutdown)."""
+    for client in list(_batching_clients):
+        await client.close()
 
 
 if __name__ == "__main__":
     # Example usage
+    from app.common.http_client import close_async_clients
     from app.common.middleware import get_logger
     logger = get_logger(__name__)
     
-    client = LogsClient()
-    try:
-        result = client.append_event(
-            event_type="campaign_created",
-            message="Campaign created successfully",
-            campaign_id="CAMP-123"
-        )
-        logger.info(f"Event logged: {result}")
-    finally:
-        client.close()
+    async def main():
+        client = LogsClient()
+        try:
+            result = await client.append_event(
+                event_type="campaign_created",
+                message="Campaign created successfully",
+                campaign_id="CAMP-123"
+            )
+            logger.info(f"Event logged: {result}")
+        finally:
+            await client.close()
+            await close_async_clients()
+
+    asyncio.run(main())
@@ -3,8 +3,8 @@ Client for interacting with the Meta Service.
 """
 
 from typing import Dict, Any, List, Optional
-from app.common.http_client import MCPClient
-from app.common.config import settings
+from app.common.http_client import AsyncMCPClient
+from app.common.config import get_settings
 
 
 class MetaClient:
@@ -12,9 +12,9 @@ class MetaClient:
     
     def __init__(self):
         """Initialize the meta service client."""
-        self.client = MCPClient(settings.META_SERVICE_URL)
+        self.client = AsyncMCPClient(get_settings().META_SERVICE_URL)
     
-    def create_campaign(
+    async def create_campaign(
         self,
         campaign_name: str,
         objective: str,
@@ -51,35 +51,47 @@ class MetaClient:
         if end_date:
             request_data["end_date"] = end_date
         
-        return self.client.post("/create_campaign", request_data)
+        return await self.client.post("/create_campaign", request_data)
     
-    def close(self) -> None:
+    async def close(self) -> None:
         """Close the client connection."""
-        self.client.close()
+        await self.client.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
 
 
 if __name__ == "__main__":
     # Example usage
+    import asyncio
+    from app.common.http_client import close_async_clients
     from app.common.middleware import get_logger
     logger = get_logger(__name__)
     
-    client = MetaClient()
-    try:
-        result = client.create_campaign(
-            campaign_name="Test Campaign",
-            objective="CONVERSIONS",
-            daily_budget=100.0,
-            targeting={"age_range": "25-45", "location": "US"},
-            creatives=[
-                {
-                    "creative_id": "CREATIVE-001",
-                    "headline": "Test Headline",
-                    "body_text": "Test Body",
-                    "call_to_action": "Shop Now"
-                }
-            ],
-            start_date="2024-01-01T00:00:00Z"
-        )
-        logger.info(f"Created campaign: {result}")
-    finally:
-        client.close()
+    async def main():
+        client = MetaClient()
+        try:
+            result = await client.create_campaign(
+                campaign_name="Test Campaign",
+                objective="CONVERSIONS",
+                daily_budget=100.0,
+                targeting={"age_range": "25-45", "location": "US"},
+                creatives=[
+                    {
+                        "creative_id": "CREATIVE-001",
+                        "headline": "Test Headline",
+                        "body_text": "Test Body",
+                        "call_to_action": "Shop Now"
+                    }
+                ],
+                start_date="2024-01-01T00:00:00Z"
+            )
+            logger.info(f"Created campaign: {result}")
+        finally:
+            await client.close()
+            await close_async_clients()
+
+    asyncio.run(main())
@@ -3,8 +3,8 @@ Client for interacting with the Optimizer Service.
 """
 
 from typing import Dict, Any, List, Optional
-from app.common.http_client import MCPClient
-from app.common.config import settings
+from app.common.http_client import get_shared_client
+from app.common.config import get_settings
 
 
 class OptimizerClient:
@@ -12,7 +12,7 @@ class OptimizerClient:
     
     def __init__(self):
         """Initialize the optimizer service client."""
-        self.client = MCPClient(settings.OPTIMIZER_SERVICE_URL)
+        self.client = get_shared_client(get_settings().OPTIMIZER_SERVICE_URL)
     
     def summarize_recent_runs(
         self,
@@ -39,8 +39,13 @@ class OptimizerClient:
         return self.client.post("/summarize_recent_runs", request_data)
     
     def close(self) -> None:
-        """Close the client connection."""
-        self.client.close()
+        """No-op: the shared connection pool is closed at process exit."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
 
 if __name__ == "__main__":
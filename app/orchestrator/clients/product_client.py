@@ -3,8 +3,8 @@ Client for interacting with the Product Service.
 """
 
 from typing import Dict, Any
-from app.common.http_client import MCPClient
-from app.common.config import settings
+from app.common.http_client import get_shared_client
+from app.common.config import get_settings
 
 
 class ProductClient:
@@ -12,7 +12,7 @@ class ProductClient:
     
     def __init__(self):
         """Initialize the product service client."""
-        self.client = MCPClient(settings.PRODUCT_SERVICE_URL)
+        self.client = get_shared_client(get_settings().PRODUCT_SERVICE_URL)
     
     def select_products(
         self,
@@ -43,8 +43,13 @@ class ProductClient:
         return self.client.post("/select_products", request_data)
     
     def close(self) -> None:
-        """Close the client connection."""
-        self.client.close()
+        """No-op: the shared connection pool is closed at process exit."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
 
 if __name__ == "__main__":
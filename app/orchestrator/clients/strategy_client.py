@@ -3,8 +3,8 @@ Client for interacting with the Strategy Service.
 """
 
 from typing import Dict, Any, List
-from app.common.http_client import MCPClient
-from app.common.config import settings
+from app.common.http_client import get_shared_client
+from app.common.config import get_settings
 
 
 class StrategyClient:
@@ -12,7 +12,7 @@ class StrategyClient:
     
     def __init__(self):
         """Initialize the strategy service client."""
-        self.client = MCPClient(settings.STRATEGY_SERVICE_URL)
+        self.client = get_shared_client(get_settings().STRATEGY_SERVICE_URL)
     
     def generate_strategy(
         self,
@@ -46,8 +46,13 @@ class StrategyClient:
         return self.client.post("/generate_strategy", request_data)
     
     def close(self) -> None:
-        """Close the client connection."""
-        self.client.close()
+        """No-op: the shared connection pool is closed at process exit."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
 
 if __name__ == "__main__":
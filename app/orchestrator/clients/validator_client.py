@@ -5,8 +5,8 @@ This client has been refactored to use app.common.validators for fast,
 in-process validation, eliminating the need for a separate HTTP service.
 """
 
-from typing import Dict, Any
-from app.common.validators import validate_data, ValidationResult
+from typing import Dict, Any, List
+from app.common.validators import validate_data, validate_many, ValidationResult
 
 
 class ValidatorClient:
@@ -39,6 +39,23 @@ class ValidatorClient:
         result = validate_data(schema_name, data)
         return result.to_dict()
     
+    def validate_many(
+        self,
+        schema_name: str,
+        items: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate several items against a schema in one pass.
+        
+        Args:
+            schema_name: Name of the schema to validate against
+            items: Data items to validate
+            
+        Returns:
+            One validation result dictionary per item, in order
+        """
+        return [result.to_dict() for result in validate_many(schema_name, items)]
+    
     def close(self) -> None:
         """Close the client (no-op for local validation)."""
         pass
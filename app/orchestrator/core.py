@@ -0,0 +1,109 @@
+"""
+Pieces shared by the LLM and simple orchestrators.
+
+Service URLs, the JSON POST helper and the cached /services/status probe
+live here so both entrypoints use one implementation and, when imported
+together, one cache.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict
+
+import httpx
+import orjson
+
+from app.common.config import settings
+from app.common.http_client import JSON_HEADERS, get_async_client, retry_request
+
+# 服务URL配置 - 优先使用环境变量，否则使用本地默认值
+PRODUCT_SERVICE_URL = os.getenv("PRODUCT_SERVICE_URL", settings.PRODUCT_SERVICE_URL)
+CREATIVE_SERVICE_URL = os.getenv("CREATIVE_SERVICE_URL", settings.CREATIVE_SERVICE_URL)
+STRATEGY_SERVICE_URL = os.getenv("STRATEGY_SERVICE_URL", settings.STRATEGY_SERVICE_URL)
+META_SERVICE_URL = os.getenv("META_SERVICE_URL", settings.META_SERVICE_URL)
+LOGS_SERVICE_URL = os.getenv("LOGS_SERVICE_URL", settings.LOGS_SERVICE_URL)
+# VALIDATOR_SERVICE_URL removed - validation now uses local Pydantic models
+OPTIMIZER_SERVICE_URL = os.getenv("OPTIMIZER_SERVICE_URL", settings.OPTIMIZER_SERVICE_URL)
+
+# 由编排器协调的微服务（用于健康检查和/services/status）
+SERVICE_URLS: Dict[str, str] = {
+    "product_service": PRODUCT_SERVICE_URL,
+    "creative_service": CREATIVE_SERVICE_URL,
+    "strategy_service": STRATEGY_SERVICE_URL,
+    "meta_service": META_SERVICE_URL,
+    "logs_service": LOGS_SERVICE_URL,
+    "optimizer_service": OPTIMIZER_SERVICE_URL,
+}
+
+# /services/status结果短时缓存：轮询的仪表盘不会每次都触发全部健康探测
+STATUS_CACHE_TTL = 2.0
+STATUS_CACHE_CONTROL = f"max-age={STATUS_CACHE_TTL:.0f}"
+_STATUS_CACHE: Dict[str, Any] = {"at": 0.0, "value": None}
+_STATUS_LOCK = asyncio.Lock()
+
+
+async def get_services_status() -> Dict[str, Any]:
+    """返回所有微服务的健康状态（结果缓存STATUS_CACHE_TTL秒）"""
+    if time.monotonic() - _STATUS_CACHE["at"] < STATUS_CACHE_TTL:
+        return _STATUS_CACHE["value"]
+
+    async with _STATUS_LOCK:
+        # 等锁期间其他请求可能已刷新缓存
+        if time.monotonic() - _STATUS_CACHE["at"] < STATUS_CACHE_TTL:
+            return _STATUS_CACHE["value"]
+
+        value = await probe_services()
+        _STATUS_CACHE["value"] = value
+        _STATUS_CACHE["at"] = time.monotonic()
+        return value
+
+
+def clear_status_cache() -> None:
+    """Drop the cached status so the next request probes again."""
+    _STATUS_CACHE.update(at=0.0, value=None)
+
+
+@retry_request
+async def send_json(client: httpx.AsyncClient, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    POST a JSON payload to an MCP service and return the decoded response.
+
+    Transport errors and gateway errors (502/503/504) are retried with jittered backoff.
+    """
+    response = await client.post(
+        url, content=orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS), headers=JSON_HEADERS
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+async def _check_service(url: str) -> Dict[str, Any]:
+    try:
+        response = await get_async_client().get(f"{url}/health", timeout=3.0)
+        health = orjson.loads(response.content)
+        return {
+            "status": "healthy" if health.get("status") == "healthy" else "unhealthy",
+            "url": url,
+            "response": health
+        }
+    except Exception as e:
+        return {
+            "status": "unreachable",
+            "url": url,
+            "error": str(e)
+        }
+
+
+async def probe_services() -> Dict[str, Any]:
+    """并发探测所有微服务的健康状态，总耗时约等于最慢的单个探测"""
+    results = await asyncio.gather(*(_check_service(url) for url in SERVICE_URLS.values()))
+    services_status = dict(zip(SERVICE_URLS, results))
+    healthy = sum(1 for s in services_status.values() if s["status"] == "healthy")
+
+    return {
+        "orchestrator_status": "healthy" if healthy == len(services_status) else "degraded",
+        "services": services_status,
+        "total_services": len(services_status),
+        "healthy_services": healthy
+    }
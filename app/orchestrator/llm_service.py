@@ -3,12 +3,16 @@ Enhanced Orchestrator Agent with LLM Integration
 Based on the Agent Prompt design pattern
 """
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Optional
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, field_validator
+from typing import AsyncIterator, Dict, Any, List, Optional
+import asyncio
 import os
+import re
 import httpx
-import json
+import orjson
 import google.generativeai as genai
 from tenacity import (
     retry,
@@ -17,22 +21,68 @@ from tenacity import (
     retry_if_exception_type
 )
 
+from app.common.http_client import (
+    get_async_client,
+    warmup_async_clients,
+    close_async_clients
+)
+from app.common.middleware import mount_metrics_endpoint
+from app.common.batching import MicroBatcher
+from app.common.cache import SingleFlight, TTLCache, hash_key
+from app.common.circuit_breaker import CircuitBreaker, CircuitBreakerError
+from app.common.concurrency import gather_or_cancel
+from app.orchestrator.clients.logs_client import close_logs_clients
+from app.common.config import settings
+from app.orchestrator.core import (
+    PRODUCT_SERVICE_URL,
+    CREATIVE_SERVICE_URL,
+    STRATEGY_SERVICE_URL,
+    META_SERVICE_URL,
+    LOGS_SERVICE_URL,
+    OPTIMIZER_SERVICE_URL,
+    SERVICE_URLS,
+    STATUS_CACHE_CONTROL,
+    get_services_status,
+    send_json
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm pooled MCP connections on startup; drain queued log events and release them on shutdown."""
+    await warmup_async_clients([
+        PRODUCT_SERVICE_URL,
+        STRATEGY_SERVICE_URL,
+        CREATIVE_SERVICE_URL,
+        META_SERVICE_URL,
+        LOGS_SERVICE_URL
+    ])
+    yield
+    await intent_batcher.close()
+    await close_logs_clients()
+    await close_async_clients()
+
+
 app = FastAPI(
     title="Ad Campaign Orchestrator Agent (LLM-Enhanced)",
     description="AI-powered orchestrator with natural language understanding and fixed pipeline execution",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# 服务URL配置 - 优先使用环境变量，否则使用本地默认值
-from app.common.config import settings
-
-PRODUCT_SERVICE_URL = os.getenv("PRODUCT_SERVICE_URL", settings.PRODUCT_SERVICE_URL)
-CREATIVE_SERVICE_URL = os.getenv("CREATIVE_SERVICE_URL", settings.CREATIVE_SERVICE_URL)
-STRATEGY_SERVICE_URL = os.getenv("STRATEGY_SERVICE_URL", settings.STRATEGY_SERVICE_URL)
-META_SERVICE_URL = os.getenv("META_SERVICE_URL", settings.META_SERVICE_URL)
-LOGS_SERVICE_URL = os.getenv("LOGS_SERVICE_URL", settings.LOGS_SERVICE_URL)
-# VALIDATOR_SERVICE_URL removed - validation now uses local Pydantic models
-OPTIMIZER_SERVICE_URL = os.getenv("OPTIMIZER_SERVICE_URL", settings.OPTIMIZER_SERVICE_URL)
+# Prometheus metrics (MCP client latency per service/endpoint), if available
+mount_metrics_endpoint(app)
+
+# 可通过/batch调用的服务
+BATCH_SERVICE_URLS = {
+    "product": PRODUCT_SERVICE_URL,
+    "creative": CREATIVE_SERVICE_URL,
+    "strategy": STRATEGY_SERVICE_URL,
+    "meta": META_SERVICE_URL,
+    "logs": LOGS_SERVICE_URL,
+    "optimizer": OPTIMIZER_SERVICE_URL,
+}
 
 # 初始化Gemini客户端
 gemini_api_key = os.getenv("GEMINI_API_KEY", settings.GEMINI_API_KEY)
@@ -43,6 +93,13 @@ if gemini_api_key:
 else:
     gemini_model = None
 
+# LLM response caches: identical requests skip the Gemini round-trip
+_INTENT_CACHE = TTLCache(maxsize=1024, ttl=3600)
+_SUMMARY_CACHE = TTLCache(maxsize=1024, ttl=600)
+# Concurrent identical requests share one in-flight Gemini call
+_INTENT_FLIGHTS = SingleFlight()
+_SUMMARY_FLIGHTS = SingleFlight()
+
 # Agent Prompt
 AGENT_PROMPT = """You are the main orchestrator agent of an ad campaign automation system.
 
@@ -73,11 +130,59 @@ CampaignSpec JSON structure:
 
 When parsing user input, extract these fields and return ONLY valid JSON."""
 
+SUMMARY_SYSTEM_PROMPT = "You are a helpful assistant that summarizes ad campaign creation results."
+ERROR_SYSTEM_PROMPT = "You are a helpful assistant that explains errors clearly."
+
+# Per-call prompt templates; only the placeholders vary between calls
+INTENT_PROMPT_TEMPLATE = (
+    "Parse this campaign request into CampaignSpec JSON:\n\n{user_request}\n\n"
+    "Return ONLY valid JSON matching the schema."
+)
+
+SUMMARY_PROMPT_TEMPLATE = """Based on the campaign creation results, generate a concise, human-readable summary.
+
+Campaign Spec:
+{spec_json}
+
+Results:
+- Products selected: {n_products}
+- Creatives generated: {n_creatives}
+- Strategy created: {strategy_id}{campaign_line}
+
+Generate a 2-3 sentence summary explaining what was accomplished."""
+
+ERROR_PROMPT_TEMPLATE = """An error occurred during campaign creation:
+
+Error: {error}
+Context: {context_json}
+
+Explain this error in simple terms and suggest what information the user should provide to fix it."""
+
+
+def _model_with_instruction(system_instruction: str) -> Optional[Any]:
+    """Build a Gemini model that sends system_instruction with every call."""
+    if not gemini_model:
+        return None
+    return genai.GenerativeModel(settings.GEMINI_MODEL, system_instruction=system_instruction)
+
+
+# Each LLM task gets its own model whose system prompt is sent as a
+# byte-identical system instruction on every call, so the stable prefix can
+# hit the server-side context cache; only the per-call content varies
+intent_model = _model_with_instruction(AGENT_PROMPT)
+summary_model = _model_with_instruction(SUMMARY_SYSTEM_PROMPT)
+error_model = _model_with_instruction(ERROR_SYSTEM_PROMPT)
+
 
 # Models
+# Response models are built once and never mutated
+RESPONSE_MODEL_CONFIG = ConfigDict(extra="ignore", frozen=True)
+
+
 class NaturalLanguageRequest(BaseModel):
     """自然语言请求"""
     user_request: str = Field(..., description="Natural language description of the campaign needs")
+    fast_mode: bool = Field(False, description="Skip LLM summary/error explanation and return templated text")
     
 
 class CampaignSpec(BaseModel):
@@ -90,6 +195,18 @@ class CampaignSpec(BaseModel):
     platforms: List[str] = ["facebook", "instagram"]
 
 
+# JSON schemas for intent parsing in JSON Mode (built once)
+CAMPAIGN_SPEC_SCHEMA = CampaignSpec.model_json_schema()
+_CAMPAIGN_SPEC_LIST = TypeAdapter(List[CampaignSpec])
+CAMPAIGN_SPEC_LIST_SCHEMA = _CAMPAIGN_SPEC_LIST.json_schema()
+
+# A CampaignSpec JSON object is well under 200 tokens
+INTENT_MAX_TOKENS = 300
+
+# Upper bound for a single Gemini call so a hung request can't pin a worker slot
+GEMINI_TIMEOUT_SECONDS = 15.0
+
+
 class CampaignResult(BaseModel):
     """单个活动结果"""
     platform: str
@@ -98,6 +215,8 @@ class CampaignResult(BaseModel):
     creatives: List[Dict[str, Any]] = []
     strategy: Dict[str, Any] = {}
     summary: str
+    
+    model_config = RESPONSE_MODEL_CONFIG
 
 
 class OrchestratorResponse(BaseModel):
@@ -107,6 +226,53 @@ class OrchestratorResponse(BaseModel):
     errors: List[str] = []
     summary: str
     campaign_spec: Optional[Dict[str, Any]] = None
+    
+    model_config = RESPONSE_MODEL_CONFIG
+
+
+# /batch endpoints: absolute path made of letters, digits, "_", "-" and "/"
+_ENDPOINT_RE = re.compile(r"^/[A-Za-z0-9_/-]*$")
+
+
+class BatchCall(BaseModel):
+    """批量请求中的单个MCP调用"""
+    id: str = Field(..., description="Caller-chosen identifier echoed in the result")
+    service: str = Field(..., description="Target service: " + ", ".join(BATCH_SERVICE_URLS))
+    endpoint: str = Field(..., description="Service endpoint path, e.g. /select_products")
+    payload: Dict[str, Any] = {}
+    input_from: int = Field(-1, description="Index of an earlier call whose result is forwarded (-1 = none)")
+    input_key: str = Field("input", description="Payload key that receives the forwarded result")
+    
+    @field_validator("endpoint")
+    @classmethod
+    def _endpoint_is_relative_path(cls, endpoint: str) -> str:
+        # The endpoint is appended to a fixed service URL; anything but a plain path
+        # ("@host", ".host", "//host", "..") could redirect the call to another host
+        if not _ENDPOINT_RE.match(endpoint) or "//" in endpoint or ".." in endpoint or "@" in endpoint:
+            raise ValueError("endpoint must be a relative path like /select_products")
+        return endpoint
+
+
+class BatchRequest(BaseModel):
+    """批量MCP调用请求（一次往返执行整个依赖图）"""
+    calls: List[BatchCall]
+
+
+class BatchCallResult(BaseModel):
+    """单个调用的结果"""
+    id: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    
+    model_config = RESPONSE_MODEL_CONFIG
+
+
+class BatchResponse(BaseModel):
+    """批量调用响应"""
+    results: List[BatchCallResult]
+    
+    model_config = RESPONSE_MODEL_CONFIG
 
 
 @retry(
@@ -115,11 +281,12 @@ class OrchestratorResponse(BaseModel):
     retry=retry_if_exception_type((Exception,)),
     reraise=True
 )
-def _call_gemini_with_retry(
+async def _call_gemini_with_retry(
     prompt: str, 
     temperature: float = 0.3, 
     max_tokens: int = 500,
-    response_schema: Optional[Dict[str, Any]] = None
+    response_schema: Optional[Dict[str, Any]] = None,
+    model: Optional[Any] = None
 ):
     """
     Internal function to call Gemini API with retry logic and structured output support.
@@ -129,8 +296,10 @@ def _call_gemini_with_retry(
         temperature: Sampling temperature
         max_tokens: Maximum output tokens
         response_schema: Optional JSON schema for structured output (JSON Mode)
+        model: Model to call (defaults to gemini_model)
     """
-    if not gemini_model:
+    model = model or gemini_model
+    if not model:
         raise HTTPException(
             status_code=500,
             detail="GEMINI_API_KEY not configured. Please set GEMINI_API_KEY environment variable."
@@ -146,44 +315,107 @@ def _call_gemini_with_retry(
         generation_config.response_schema = response_schema
         generation_config.response_mime_type = "application/json"
     
-    response = gemini_model.generate_content(
-        prompt,
-        generation_config=generation_config
+    response = await asyncio.wait_for(
+        model.generate_content_async(prompt, generation_config=generation_config),
+        timeout=GEMINI_TIMEOUT_SECONDS
     )
     
     # If using JSON mode, response.text is already valid JSON
     return response.text if response and response.text else None
 
 
-def parse_user_intent(user_request: str) -> CampaignSpec:
+def _dump_indented(data: Dict[str, Any]) -> str:
+    """Pretty-print a dict as JSON for embedding in LLM prompts."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _is_service_failure(exc: BaseException) -> bool:
+    """Transport errors and 5xx responses count against a service's breaker; 4xx do not."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.HTTPError)
+
+
+# Per-service circuit breakers, keyed by BATCH_SERVICE_URLS name
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+
+
+def _get_breaker(service: str) -> CircuitBreaker:
+    """Return the circuit breaker for a service (a BATCH_SERVICE_URLS name)."""
+    breaker = _BREAKERS.get(service)
+    if breaker is None:
+        breaker = _BREAKERS[service] = CircuitBreaker(
+            service, fail_max=5, reset_timeout=30.0, is_failure=_is_service_failure
+        )
+    return breaker
+
+
+async def _post_json(
+    client: httpx.AsyncClient, url: str, payload: Dict[str, Any], *, service: str
+) -> Dict[str, Any]:
+    """
+    POST a JSON payload to an MCP service and return the decoded response.
+    
+    Transport errors and gateway errors (502/503/504) are retried with jittered
+    backoff; a call that still fails counts once against the service's breaker.
+    
+    Args:
+        service: BATCH_SERVICE_URLS name of the target service (selects its breaker)
+    
+    Raises:
+        CircuitBreakerError: If the service has been failing and its breaker is open
+    """
+    return await _get_breaker(service).call(send_json, client, url, payload)
+
+
+def _intent_cache_key(user_request: str) -> str:
+    return hash_key(user_request.strip().lower())
+
+
+async def parse_user_intent(user_request: str) -> CampaignSpec:
     """
     使用LLM解析用户意图并生成CampaignSpec（使用JSON Mode强制结构化输出）
+    
+    相同请求并发到达时只调用一次Gemini，其余请求共享其结果。
     """
+    cache_key = _intent_cache_key(user_request)
+    cached = _INTENT_CACHE.get(cache_key)
+    if cached is not None:
+        return cached.model_copy()
+    
     try:
-        # Get JSON schema from Pydantic model
-        campaign_spec_schema = CampaignSpec.model_json_schema()
-        
-        prompt = f"{AGENT_PROMPT}\n\nParse this campaign request into CampaignSpec JSON:\n\n{user_request}\n\nReturn ONLY valid JSON matching the schema."
+        prompt = INTENT_PROMPT_TEMPLATE.format(user_request=user_request)
         
-        # Use JSON Mode with response_schema for guaranteed structured output
-        content = _call_gemini_with_retry(
+        # Use JSON Mode with response_schema for guaranteed structured output;
+        # no markdown wrapper is generated, so a small token budget suffices
+        content = await _INTENT_FLIGHTS.do(
+            cache_key,
+            _call_gemini_with_retry,
             prompt, 
-            temperature=0.3, 
-            max_tokens=500,
-            response_schema=campaign_spec_schema
+            temperature=0.1, 
+            max_tokens=INTENT_MAX_TOKENS,
+            response_schema=CAMPAIGN_SPEC_SCHEMA,
+            model=intent_model
         )
         
         if not content:
             raise ValueError("Empty response from Gemini API")
         
-        # With JSON Mode, response is already valid JSON (no markdown wrapping)
-        spec_dict = json.loads(content)
-        return CampaignSpec(**spec_dict)
+        # With JSON Mode, response is already valid JSON (no markdown wrapping),
+        # so it is parsed and validated in a single pass
+        campaign_spec = CampaignSpec.model_validate_json(content)
+        _INTENT_CACHE.set(cache_key, campaign_spec)
+        return campaign_spec.model_copy()
         
-    except json.JSONDecodeError as e:
+    except ValidationError as e:
+        if any(err["type"] == "json_invalid" for err in e.errors()):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid JSON response from LLM: {str(e)}. Please try again."
+            )
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid JSON response from LLM: {str(e)}. Please try again."
+            detail=f"Failed to parse user intent: {str(e)}. Please provide more specific information."
         )
     except Exception as e:
         raise HTTPException(
@@ -192,58 +424,202 @@ def parse_user_intent(user_request: str) -> CampaignSpec:
         )
 
 
-def generate_summary(campaign_spec: CampaignSpec, results: Dict[str, Any]) -> str:
+async def _parse_intent_batch(user_requests: List[str]) -> List[CampaignSpec]:
+    """一次Gemini调用解析多条请求，返回与输入顺序一致的CampaignSpec列表"""
+    numbered = "\n\n".join(f"Request {i}:\n{r}" for i, r in enumerate(user_requests, 1))
+    prompt = (
+        f"Parse each of the following {len(user_requests)} campaign requests into CampaignSpec JSON:\n\n"
+        f"{numbered}\n\nReturn ONLY a JSON array with exactly one object per request, in the same order."
+    )
+    content = await _call_gemini_with_retry(
+        prompt,
+        temperature=0.1,
+        max_tokens=INTENT_MAX_TOKENS * len(user_requests),
+        response_schema=CAMPAIGN_SPEC_LIST_SCHEMA,
+        model=intent_model
+    )
+    if not content:
+        raise ValueError("Empty response from Gemini API")
+    
+    specs = _CAMPAIGN_SPEC_LIST.validate_json(content)
+    if len(specs) != len(user_requests):
+        raise ValueError(f"Expected {len(user_requests)} campaign specs, got {len(specs)}")
+    for user_request, spec in zip(user_requests, specs):
+        _INTENT_CACHE.set(_intent_cache_key(user_request), spec)
+    return specs
+
+
+async def parse_user_intents(user_requests: List[str]) -> List[Any]:
     """
-    使用LLM生成最终摘要（带重试机制）
+    批量解析用户意图（供intent_batcher使用）
+    
+    缓存命中和重复的请求不会重复调用LLM；其余请求合并为一次Gemini调用，
+    批量调用失败时逐条回退到parse_user_intent。返回值与输入一一对应，
+    解析失败的项为异常实例。
     """
-    try:
-        summary_prompt = f"""Based on the campaign creation results, generate a concise, human-readable summary.
+    results: List[Any] = [None] * len(user_requests)
+    pending: Dict[str, List[int]] = {}
+    for i, user_request in enumerate(user_requests):
+        cache_key = _intent_cache_key(user_request)
+        cached = _INTENT_CACHE.get(cache_key)
+        if cached is not None:
+            results[i] = cached.model_copy()
+        else:
+            pending.setdefault(cache_key, []).append(i)
+    if not pending:
+        return results
+    
+    unique_requests = [user_requests[indexes[0]] for indexes in pending.values()]
+    specs = None
+    if len(unique_requests) > 1:
+        try:
+            specs = await _parse_intent_batch(unique_requests)
+        except Exception:
+            specs = None
+    if specs is None:
+        specs = await asyncio.gather(
+            *(parse_user_intent(r) for r in unique_requests), return_exceptions=True
+        )
+    
+    for indexes, spec in zip(pending.values(), specs):
+        for i in indexes:
+            results[i] = spec.model_copy() if isinstance(spec, CampaignSpec) else spec
+    return results
 
-Campaign Spec:
-{json.dumps(campaign_spec.dict(), indent=2)}
 
-Results:
-- Products selected: {len(results.get('products', []))}
-- Creatives generated: {len(results.get('creatives', []))}
-- Strategy created: {results.get('strategy', {}).get('strategy_id', 'N/A')}
-- Campaign ID: {results.get('campaign_id', 'N/A')}
+# Concurrent intent-parsing requests arriving within a short window share one Gemini call
+intent_batcher = MicroBatcher(
+    parse_user_intents,
+    max_size=settings.INTENT_BATCH_MAX_SIZE,
+    max_wait=settings.INTENT_BATCH_MAX_WAIT_MS / 1000
+)
 
-Generate a 2-3 sentence summary explaining what was accomplished."""
 
-        if not gemini_model:
-            return f"Campaign created successfully with {len(results.get('products', []))} products and {len(results.get('creatives', []))} creatives."
+async def resolve_intent(user_request: str) -> CampaignSpec:
+    """缓存命中时直接返回，否则加入批量解析队列"""
+    cached = _INTENT_CACHE.get(_intent_cache_key(user_request))
+    if cached is not None:
+        return cached.model_copy()
+    return await intent_batcher.submit(user_request)
+
+
+def _build_summary_prompt(spec_dump: Dict[str, Any], results: Dict[str, Any]) -> str:
+    """
+    构建摘要提示词
+    
+    摘要可能在Meta活动创建完成前生成，此时results中没有campaign_id，提示词省略该行。
+    """
+    campaign_line = f"\n- Campaign ID: {results['campaign_id']}" if "campaign_id" in results else ""
+    return SUMMARY_PROMPT_TEMPLATE.format(
+        spec_json=_dump_indented(spec_dump),
+        n_products=len(results.get('products', [])),
+        n_creatives=len(results.get('creatives', [])),
+        strategy_id=results.get('strategy', {}).get('strategy_id', 'N/A'),
+        campaign_line=campaign_line
+    )
+
+
+def _fallback_summary(results: Dict[str, Any]) -> str:
+    """LLM不可用时的默认摘要"""
+    return (
+        f"Campaign created successfully with {len(results.get('products', []))} products "
+        f"and {len(results.get('creatives', []))} creatives."
+    )
+
+
+async def generate_summary(spec_dump: Dict[str, Any], results: Dict[str, Any]) -> str:
+    """
+    使用LLM生成最终摘要（带重试机制；相同提示词的并发请求共享一次Gemini调用）
+    
+    Args:
+        spec_dump: CampaignSpec.model_dump()的结果（每个请求只序列化一次）
+        results: 管道各阶段结果
+    """
+    try:
+        if not summary_model:
+            return _fallback_summary(results)
         
-        prompt = "You are a helpful assistant that summarizes ad campaign creation results.\n\n" + summary_prompt
-        content = _call_gemini_with_retry(prompt, temperature=0.7, max_tokens=200)
+        summary_prompt = _build_summary_prompt(spec_dump, results)
+        cache_key = hash_key(summary_prompt)
+        cached = _SUMMARY_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
         
-        return content.strip() if content else f"Campaign created successfully with {len(results.get('products', []))} products and {len(results.get('creatives', []))} creatives."
+        content = await _SUMMARY_FLIGHTS.do(
+            cache_key,
+            _call_gemini_with_retry,
+            summary_prompt,
+            temperature=0.7,
+            max_tokens=200,
+            model=summary_model
+        )
         
-    except Exception as e:
-        return f"Campaign created successfully with {len(results.get('products', []))} products and {len(results.get('creatives', []))} creatives."
+        if content:
+            _SUMMARY_CACHE.set(cache_key, content.strip())
+        return content.strip() if content else _fallback_summary(results)
+        
+    except Exception:
+        return _fallback_summary(results)
 
 
-def explain_error(error: str, context: Dict[str, Any]) -> str:
+async def stream_summary(spec_dump: Dict[str, Any], results: Dict[str, Any]) -> AsyncIterator[str]:
     """
-    使用LLM解释错误并生成澄清问题
+    流式生成最终摘要，逐段产出LLM返回的文本
+    
+    缓存命中或LLM不可用时一次性产出完整摘要；流式调用失败且尚未产出任何内容时
+    回退到默认摘要。
     """
+    summary_prompt = _build_summary_prompt(spec_dump, results)
+    cache_key = hash_key(summary_prompt)
+    cached = _SUMMARY_CACHE.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+    if not summary_model:
+        yield _fallback_summary(results)
+        return
+    
+    parts: List[str] = []
     try:
-        error_prompt = f"""An error occurred during campaign creation:
-
-Error: {error}
-Context: {json.dumps(context, indent=2)}
+        response = await summary_model.generate_content_async(
+            summary_prompt,
+            generation_config=genai.types.GenerationConfig(temperature=0.7, max_output_tokens=200),
+            stream=True
+        )
+        async for chunk in response:
+            text = chunk.text
+            if text:
+                parts.append(text)
+                yield text
+    except Exception:
+        if not parts:
+            yield _fallback_summary(results)
+        return
+    
+    if parts:
+        _SUMMARY_CACHE.set(cache_key, "".join(parts).strip())
+    else:
+        yield _fallback_summary(results)
 
-Explain this error in simple terms and suggest what information the user should provide to fix it."""
 
-        if not gemini_model:
+async def explain_error(error: str, context: Dict[str, Any]) -> str:
+    """
+    使用LLM解释错误并生成澄清问题
+    """
+    try:
+        if not error_model:
             return f"Error: {error}. Please check your input and try again."
         
-        prompt = "You are a helpful assistant that explains errors clearly.\n\n" + error_prompt
-        response = gemini_model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.5,
-                max_output_tokens=200
-            )
+        error_prompt = ERROR_PROMPT_TEMPLATE.format(error=error, context_json=_dump_indented(context))
+        response = await asyncio.wait_for(
+            error_model.generate_content_async(
+                error_prompt,
+                generation_config=genai.types.GenerationConfig(
+                    temperature=0.5,
+                    max_output_tokens=200
+                )
+            ),
+            timeout=GEMINI_TIMEOUT_SECONDS
         )
         
         return response.text.strip()
@@ -252,47 +628,213 @@ Explain this error in simple terms and suggest what information the user should
         return f"Error: {error}. Please check your input and try again."
 
 
-@app.get("/")
+# Static service description, serialized once at import
+_ROOT_BYTES = orjson.dumps({
+    "service": "Ad Campaign Orchestrator Agent (LLM-Enhanced)",
+    "version": "2.0.0",
+    "status": "running",
+    "description": "AI-powered orchestrator with natural language understanding",
+    "capabilities": [
+        "Natural language intent parsing",
+        "Fixed pipeline execution",
+        "Intelligent error handling",
+        "Human-readable summaries"
+    ],
+    "endpoints": {
+        "health": "/health",
+        "create_campaign_nl": "/create_campaign_nl (Natural Language)",
+        "create_campaign_nl_stream": "/create_campaign_nl/stream (Natural Language, streamed summary)",
+        "create_campaign": "/create_campaign (Structured)",
+        "batch": "/batch (Batched MCP calls)",
+        "services_status": "/services/status",
+        "docs": "/docs"
+    }
+})
+
+
+@app.get("/", response_class=Response)
 async def root():
     """根路径"""
-    return {
-        "service": "Ad Campaign Orchestrator Agent (LLM-Enhanced)",
-        "version": "2.0.0",
-        "status": "running",
-        "description": "AI-powered orchestrator with natural language understanding",
-        "capabilities": [
-            "Natural language intent parsing",
-            "Fixed pipeline execution",
-            "Intelligent error handling",
-            "Human-readable summaries"
-        ],
-        "endpoints": {
-            "health": "/health",
-            "create_campaign_nl": "/create_campaign_nl (Natural Language)",
-            "create_campaign": "/create_campaign (Structured)",
-            "services_status": "/services/status",
-            "docs": "/docs"
-        }
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 
-@app.get("/health")
+# Health probes hit this every few seconds; the payload is static, so encode it once
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "service": "orchestrator_agent_llm",
+    "llm_enabled": True,
+    "connected_services": SERVICE_URLS,
+    "validation": "Local Pydantic validation (app.common.validators)"
+})
+
+
+@app.get("/health", response_class=Response)
 async def health_check():
     """健康检查"""
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
+
+
+async def _error_response(error_msg: str, context: Dict[str, Any], fast_mode: bool = False) -> OrchestratorResponse:
+    """Build an error response with an LLM explanation of what went wrong (raw error in fast mode)."""
+    explanation = error_msg if fast_mode else await explain_error(error_msg, context)
+    
+    return OrchestratorResponse(
+        status="error",
+        campaigns=[],
+        errors=[explanation],
+        summary=explanation
+    )
+
+
+# 请求中的固定部分只构建一次，按请求合并动态字段（只读，不可修改）
+_CREATIVE_DEFAULTS: Dict[str, Any] = {"brand_guidelines": {"tone": "professional", "style": "modern"}}
+
+
+async def _prepare_campaign(campaign_spec: CampaignSpec) -> Dict[str, Any]:
+    """执行MCP服务调用（步骤2-4），返回产品、策略和创意"""
+    # 使用共享的连接池异步HTTP客户端
+    client = get_async_client()
+    # Step 2-3: 选择产品 + 生成策略（互不依赖，并发执行；任一失败会取消另一个）
+    product_request = {
+        "campaign_objective": campaign_spec.campaign_objective,
+        "target_audience": campaign_spec.target_audience,
+        "budget": campaign_spec.budget,
+        "product_filters": {"category": campaign_spec.product_category} if campaign_spec.product_category else {}
+    }
+    
+    strategy_request = {
+        "campaign_objective": campaign_spec.campaign_objective,
+        "total_budget": campaign_spec.budget,
+        "duration_days": campaign_spec.duration_days,
+        "target_audience": campaign_spec.target_audience,
+        "platforms": campaign_spec.platforms
+    }
+    
+    products_response, strategy_response = await gather_or_cancel(
+        _post_json(client, f"{PRODUCT_SERVICE_URL}/select_products", product_request, service="product"),
+        _post_json(client, f"{STRATEGY_SERVICE_URL}/generate_strategy", strategy_request, service="strategy")
+    )
+    selected_products = products_response.get("products", [])
+    
+    # Step 4: 生成创意
+    product_ids = [p["product_id"] for p in selected_products[:3]]
+    
+    creative_request = _CREATIVE_DEFAULTS | {
+        "product_ids": product_ids,
+        "campaign_objective": campaign_spec.campaign_objective,
+        "target_audience": campaign_spec.target_audience
+    }
+    
+    creatives_response = await _post_json(
+        client, f"{CREATIVE_SERVICE_URL}/generate_creatives", creative_request, service="creative"
+    )
+    creatives = creatives_response.get("creatives", [])
+    
     return {
-        "status": "healthy",
-        "service": "orchestrator_agent_llm",
-        "llm_enabled": True,
-        "connected_services": {
-            "product_service": PRODUCT_SERVICE_URL,
-            "creative_service": CREATIVE_SERVICE_URL,
-            "strategy_service": STRATEGY_SERVICE_URL,
-            "meta_service": META_SERVICE_URL,
-            "logs_service": LOGS_SERVICE_URL,
-            "optimizer_service": OPTIMIZER_SERVICE_URL
-        },
-        "validation": "Local Pydantic validation (app.common.validators)"
+        "products": selected_products,
+        "strategy": strategy_response,
+        "creatives": creatives
+    }
+
+
+async def _create_meta_campaign(campaign_spec: CampaignSpec, creatives: List[Dict[str, Any]]) -> Optional[str]:
+    """Step 5: 创建Meta广告活动，返回campaign_id"""
+    meta_request = {
+        "campaign_name": f"{campaign_spec.campaign_objective}_campaign",
+        "objective": campaign_spec.campaign_objective,
+        "budget": campaign_spec.budget,
+        "target_audience": campaign_spec.target_audience,
+        "creatives": [c["creative_id"] for c in creatives[:5]]
     }
+    
+    meta_response = await _post_json(
+        get_async_client(), f"{META_SERVICE_URL}/create_campaign", meta_request, service="meta"
+    )
+    return meta_response.get("campaign_id")
+
+
+def _build_response(spec_dump: Dict[str, Any], results: Dict[str, Any], summary: str) -> OrchestratorResponse:
+    """
+    根据管道结果构建成功响应
+    
+    结果均为已解码的服务响应，结构已知，使用model_construct跳过对
+    产品/创意列表的逐项校验。
+    """
+    selected_products = results["products"]
+    creatives = results["creatives"]
+    
+    campaign_result = CampaignResult.model_construct(
+        platform="meta",
+        campaign_id=results["campaign_id"],
+        products=selected_products,
+        creatives=creatives,
+        strategy=results["strategy"],
+        summary=f"Created campaign with {len(selected_products)} products and {len(creatives)} creative variants"
+    )
+    
+    return OrchestratorResponse.model_construct(
+        status="success",
+        campaigns=[campaign_result],
+        errors=[],
+        summary=summary,
+        campaign_spec=spec_dump
+    )
+
+
+def _template_summary(results: Dict[str, Any]) -> str:
+    """fast_mode下替代LLM摘要的模板文本"""
+    return (
+        f"Created {len(results['products'])} products, {len(results['creatives'])} creatives, "
+        f"campaign {results['campaign_id']}."
+    )
+
+
+async def _run_pipeline(
+    campaign_spec: CampaignSpec,
+    error_context: Optional[Dict[str, Any]] = None,
+    fast_mode: bool = False
+) -> OrchestratorResponse:
+    """
+    执行固定的工具调用管道（步骤2-6）
+    
+    Args:
+        campaign_spec: 已解析或由调用方提供的活动规格
+        error_context: 出错时传给explain_error的上下文（默认为活动规格本身）
+        fast_mode: 为True时不调用LLM生成摘要或解释错误
+    """
+    spec_dump = campaign_spec.model_dump()
+    if error_context is None:
+        error_context = {"campaign_spec": spec_dump}
+    
+    try:
+        results = await _prepare_campaign(campaign_spec)
+        
+        if fast_mode:
+            results["campaign_id"] = await _create_meta_campaign(campaign_spec, results["creatives"])
+            return _build_response(spec_dump, results, _template_summary(results))
+        
+        # Step 6: 产品/策略/创意已确定，LLM摘要与Meta调用（Step 5）并发执行
+        summary_task = asyncio.create_task(
+            generate_summary(spec_dump, dict(results))
+        )
+        try:
+            results["campaign_id"] = await _create_meta_campaign(campaign_spec, results["creatives"])
+        except BaseException:
+            summary_task.cancel()
+            raise
+        summary = await summary_task
+        
+        return _build_response(spec_dump, results, summary)
+        
+    except CircuitBreakerError as e:
+        # 下游服务持续失败：快速返回503，而不是逐个等待超时
+        raise HTTPException(status_code=503, detail=str(e))
+        
+    except httpx.HTTPError as e:
+        return await _error_response(f"Service communication error: {str(e)}", error_context, fast_mode)
+        
+    except Exception as e:
+        return await _error_response(str(e), error_context, fast_mode)
 
 
 @app.post("/create_campaign_nl", response_model=OrchestratorResponse)
@@ -303,218 +845,160 @@ async def create_campaign_natural_language(request: NaturalLanguageRequest):
     这是主要的入口点，接受自然语言描述并：
     1. 使用LLM解析意图 → CampaignSpec
     2. 执行固定的工具调用管道
-    3. 使用LLM生成最终摘要
+    3. 使用LLM生成最终摘要（fast_mode时使用模板摘要）
     """
-    errors = []
+    error_context = {"user_request": request.user_request}
     
     try:
         # Step 1: 使用LLM解析用户意图
-        campaign_spec = parse_user_intent(request.user_request)
-        
-        # Step 2-6: 执行固定管道（使用异步HTTP客户端）
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Step 2: 选择产品
-            product_request = {
-                "campaign_objective": campaign_spec.campaign_objective,
-                "target_audience": campaign_spec.target_audience,
-                "budget": campaign_spec.budget,
-                "product_filters": {"category": campaign_spec.product_category} if campaign_spec.product_category else {}
-            }
-            
-            response = await client.post(
-                f"{PRODUCT_SERVICE_URL}/select_products",
-                json=product_request
-            )
-            response.raise_for_status()
-            products_response = response.json()
-            selected_products = products_response.get("products", [])
-            
-            # Step 3: 生成策略
-            strategy_request = {
-                "campaign_objective": campaign_spec.campaign_objective,
-                "total_budget": campaign_spec.budget,
-                "duration_days": campaign_spec.duration_days,
-                "target_audience": campaign_spec.target_audience,
-                "platforms": campaign_spec.platforms
-            }
-            
-            response = await client.post(
-                f"{STRATEGY_SERVICE_URL}/generate_strategy",
-                json=strategy_request
-            )
-            response.raise_for_status()
-            strategy_response = response.json()
-            
-            # Step 4: 生成创意
-            product_ids = [p["product_id"] for p in selected_products[:3]]
-            
-            creative_request = {
-                "product_ids": product_ids,
-                "campaign_objective": campaign_spec.campaign_objective,
-                "target_audience": campaign_spec.target_audience,
-                "brand_guidelines": {"tone": "professional", "style": "modern"}
-            }
-            
-            response = await client.post(
-                f"{CREATIVE_SERVICE_URL}/generate_creatives",
-                json=creative_request
-            )
-            response.raise_for_status()
-            creatives_response = response.json()
-            creatives = creatives_response.get("creatives", [])
+        campaign_spec = await resolve_intent(request.user_request)
+    except Exception as e:
+        return await _error_response(str(e), error_context, request.fast_mode)
+    
+    # Step 2-6: 执行固定管道
+    return await _run_pipeline(campaign_spec, error_context, request.fast_mode)
+
+
+def _ndjson(event: Dict[str, Any]) -> bytes:
+    """Encode one streaming event as a JSON Lines record."""
+    return orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+
+
+@app.post("/create_campaign_nl/stream")
+async def create_campaign_natural_language_stream(request: NaturalLanguageRequest):
+    """
+    从自然语言创建广告活动（流式返回进度和摘要）
+    
+    以JSON Lines返回：每完成一个阶段返回一行进度（type=step），随后是不含摘要的
+    活动结果（type=campaign）、LLM逐段生成的摘要文本（type=summary_delta），
+    最后是结束标记（type=done）。出错时以一行type=error的响应结束。
+    fast_mode=true时返回模板摘要，错误不经LLM解释。
+    """
+    error_context = {"user_request": request.user_request}
+    fast_mode = request.fast_mode
+    
+    async def event_stream() -> AsyncIterator[bytes]:
+        try:
+            campaign_spec = await resolve_intent(request.user_request)
+            spec_dump = campaign_spec.model_dump()
+            yield _ndjson({"type": "step", "step": "intent_parsed", "campaign_spec": spec_dump})
             
-            # Step 5: 创建Meta广告活动
-            meta_request = {
-                "campaign_name": f"{campaign_spec.campaign_objective}_campaign",
-                "objective": campaign_spec.campaign_objective,
-                "budget": campaign_spec.budget,
-                "target_audience": campaign_spec.target_audience,
-                "creatives": [c["creative_id"] for c in creatives[:5]]
-            }
+            results = await _prepare_campaign(campaign_spec)
+            yield _ndjson({
+                "type": "step",
+                "step": "creatives_generated",
+                "products": len(results["products"]),
+                "creatives": len(results["creatives"])
+            })
             
-            response = await client.post(
-                f"{META_SERVICE_URL}/create_campaign",
-                json=meta_request
-            )
-            response.raise_for_status()
-            meta_response = response.json()
-            campaign_id = meta_response.get("campaign_id")
-        
-        # 收集结果
-        results = {
-            "products": selected_products,
-            "strategy": strategy_response,
-            "creatives": creatives,
-            "campaign_id": campaign_id
-        }
-        
-        # Step 6: 使用LLM生成摘要
-        summary = generate_summary(campaign_spec, results)
-        
-        # 构建响应
-        campaign_result = CampaignResult(
-            platform="meta",
-            campaign_id=campaign_id,
-            products=selected_products,
-            creatives=creatives,
-            strategy=strategy_response,
-            summary=f"Created campaign with {len(selected_products)} products and {len(creatives)} creative variants"
-        )
-        
-        return OrchestratorResponse(
-            status="success",
-            campaigns=[campaign_result],
-            errors=[],
-            summary=summary,
-            campaign_spec=campaign_spec.dict()
-        )
-        
-    except httpx.HTTPError as e:
-        error_msg = f"Service communication error: {str(e)}"
-        explanation = explain_error(error_msg, {"user_request": request.user_request})
-        errors.append(explanation)
-        
-        return OrchestratorResponse(
-            status="error",
-            campaigns=[],
-            errors=errors,
-            summary=explanation
-        )
+            results["campaign_id"] = await _create_meta_campaign(campaign_spec, results["creatives"])
+        except CircuitBreakerError as e:
+            # 下游服务持续失败：直接返回原始错误，不调用LLM解释
+            error = await _error_response(str(e), error_context, fast_mode=True)
+            yield _ndjson({"type": "error", **error.model_dump()})
+            return
+        except httpx.HTTPError as e:
+            error = await _error_response(f"Service communication error: {str(e)}", error_context, fast_mode)
+            yield _ndjson({"type": "error", **error.model_dump()})
+            return
+        except Exception as e:
+            error = await _error_response(str(e), error_context, fast_mode)
+            yield _ndjson({"type": "error", **error.model_dump()})
+            return
         
-    except Exception as e:
-        error_msg = str(e)
-        explanation = explain_error(error_msg, {"user_request": request.user_request})
-        errors.append(explanation)
+        response = _build_response(spec_dump, results, summary="")
+        yield _ndjson({"type": "campaign", **response.model_dump()})
         
-        return OrchestratorResponse(
-            status="error",
-            campaigns=[],
-            errors=errors,
-            summary=explanation
-        )
+        if fast_mode:
+            yield _ndjson({"type": "summary_delta", "text": _template_summary(results)})
+        else:
+            async for text in stream_summary(spec_dump, results):
+                yield _ndjson({"type": "summary_delta", "text": text})
+        yield _ndjson({"type": "done"})
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
 
 
 @app.post("/create_campaign", response_model=OrchestratorResponse)
-async def create_campaign_structured(campaign_spec: CampaignSpec):
+async def create_campaign_structured(campaign_spec: CampaignSpec, fast_mode: bool = False):
     """
     从结构化CampaignSpec创建广告活动
     
-    跳过LLM意图解析，直接执行管道
+    跳过LLM意图解析，直接执行管道；fast_mode=true时也跳过LLM摘要和错误解释
     """
-    errors = []
+    return await _run_pipeline(campaign_spec, fast_mode=fast_mode)
+
+
+def _batch_layers(calls: List[BatchCall]) -> List[List[int]]:
+    """
+    按依赖深度将调用分层；同一层内的调用互不依赖，可以并发执行
     
-    try:
-        # 执行固定管道（与create_campaign_nl的步骤2-6相同）
-        # ... (代码与上面相同，为简洁省略)
-        
-        # 简化版：调用自然语言版本
-        nl_request = NaturalLanguageRequest(
-            user_request=f"Create a {campaign_spec.campaign_objective} campaign for {campaign_spec.target_audience} with budget ${campaign_spec.budget}"
-        )
-        
-        return await create_campaign_natural_language(nl_request)
-        
-    except Exception as e:
-        return OrchestratorResponse(
-            status="error",
-            campaigns=[],
-            errors=[str(e)],
-            summary=f"Campaign creation failed: {str(e)}"
-        )
+    Raises:
+        HTTPException: 服务未知或input_from未指向更早的调用
+    """
+    depths: List[int] = []
+    for index, call in enumerate(calls):
+        if call.service not in BATCH_SERVICE_URLS:
+            raise HTTPException(status_code=400, detail=f"Unknown service '{call.service}' in call '{call.id}'")
+        if call.input_from >= index or call.input_from < -1:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Call '{call.id}' must take input from an earlier call (input_from={call.input_from})"
+            )
+        depths.append(0 if call.input_from == -1 else depths[call.input_from] + 1)
+    
+    layers: List[List[int]] = [[] for _ in range(max(depths, default=-1) + 1)]
+    for index, depth in enumerate(depths):
+        layers[depth].append(index)
+    return layers
 
 
-@app.get("/services/status")
-async def check_services_status():
-    """检查所有微服务的状态（使用异步HTTP客户端）"""
-    services_status = {}
-    
-    services = {
-        "product_service": PRODUCT_SERVICE_URL,
-        "creative_service": CREATIVE_SERVICE_URL,
-        "strategy_service": STRATEGY_SERVICE_URL,
-        "meta_service": META_SERVICE_URL,
-        "logs_service": LOGS_SERVICE_URL,
-        "optimizer_service": OPTIMIZER_SERVICE_URL,
-    }
+@app.post("/batch", response_model=BatchResponse)
+async def execute_batch(request: BatchRequest):
+    """
+    在一次往返中执行多个MCP调用
     
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        # 并发检查所有服务状态
-        import asyncio
-        
-        async def check_service(service_name: str, url: str):
-            try:
-                response = await client.get(f"{url}/health")
-                health = response.json()
-                return {
-                    "status": "healthy" if health.get("status") == "healthy" else "unhealthy",
-                    "url": url,
-                    "response": health
-                }
-            except Exception as e:
-                return {
-                    "status": "unreachable",
-                    "url": url,
-                    "error": str(e)
-                }
-        
-        # 并发执行所有健康检查
-        tasks = [check_service(name, url) for name, url in services.items()]
-        results = await asyncio.gather(*tasks)
-        
-        for (service_name, _), result in zip(services.items(), results):
-            services_status[service_name] = result
+    调用按依赖关系分层，每层并发执行；设置了input_from的调用会把上游调用的结果
+    放入payload[input_key]。上游失败时，依赖它的调用会被跳过并标记为错误。
+    """
+    calls = request.calls
+    layers = _batch_layers(calls)
+    results: List[Optional[BatchCallResult]] = [None] * len(calls)
+    client = get_async_client()
     
-    all_healthy = all(s["status"] == "healthy" for s in services_status.values())
+    async def run_call(index: int) -> BatchCallResult:
+        call = calls[index]
+        payload = call.payload
+        if call.input_from != -1:
+            upstream = results[call.input_from]
+            if upstream.status != "success":
+                return BatchCallResult(
+                    id=call.id, status="error", error=f"Skipped: upstream call '{upstream.id}' failed"
+                )
+            payload = {**payload, call.input_key: upstream.result}
+        try:
+            result = await _post_json(
+                client, f"{BATCH_SERVICE_URLS[call.service]}{call.endpoint}", payload, service=call.service
+            )
+            return BatchCallResult(id=call.id, status="success", result=result)
+        except Exception as e:
+            return BatchCallResult(id=call.id, status="error", error=str(e))
     
-    return {
-        "orchestrator_status": "healthy" if all_healthy else "degraded",
-        "llm_enabled": True,
-        "services": services_status,
-        "total_services": len(services),
-        "healthy_services": sum(1 for s in services_status.values() if s["status"] == "healthy")
-    }
+    for layer in layers:
+        layer_results = await asyncio.gather(*(run_call(index) for index in layer))
+        for index, result in zip(layer, layer_results):
+            results[index] = result
+    
+    return BatchResponse(results=results)
+
+
+@app.get("/services/status")
+async def check_services_status(response: Response):
+    """检查所有微服务的状态（结果短时缓存）"""
+    response.headers["Cache-Control"] = STATUS_CACHE_CONTROL
+    return {**await get_services_status(), "llm_enabled": True}
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    from app.common.server import run_server
+    run_server(app, port=8000)
@@ -3,30 +3,48 @@ Orchestrator Agent Web Service (Simplified)
 提供RESTful API来调用orchestrator agent
 """
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, Any, List, Optional
-import os
-import requests
+import httpx
+import orjson
+
+from app.common.schemas import CampaignSpec, Product
+from app.common.http_client import get_async_client, close_async_clients
+from app.common.concurrency import gather_or_cancel
+from app.orchestrator.clients.logs_client import close_logs_clients
+# 服务URL配置在core中统一读取（优先使用环境变量）
+from app.orchestrator.core import (
+    PRODUCT_SERVICE_URL,
+    CREATIVE_SERVICE_URL,
+    STRATEGY_SERVICE_URL,
+    META_SERVICE_URL,
+    OPTIMIZER_SERVICE_URL,
+    SERVICE_URLS,
+    STATUS_CACHE_CONTROL,
+    get_services_status,
+    send_json
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Drain queued log events and release pooled MCP connections on shutdown."""
+    yield
+    await close_logs_clients()
+    await close_async_clients()
+
 
 app = FastAPI(
     title="Ad Campaign Orchestrator Agent",
     description="AI-powered orchestrator for managing ad campaign creation workflow",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# 服务URL配置 - 优先使用环境变量，否则使用本地默认值
-from app.common.config import settings
-from app.common.schemas import CampaignSpec, Product
-
-PRODUCT_SERVICE_URL = os.getenv("PRODUCT_SERVICE_URL", settings.PRODUCT_SERVICE_URL)
-CREATIVE_SERVICE_URL = os.getenv("CREATIVE_SERVICE_URL", settings.CREATIVE_SERVICE_URL)
-STRATEGY_SERVICE_URL = os.getenv("STRATEGY_SERVICE_URL", settings.STRATEGY_SERVICE_URL)
-META_SERVICE_URL = os.getenv("META_SERVICE_URL", settings.META_SERVICE_URL)
-LOGS_SERVICE_URL = os.getenv("LOGS_SERVICE_URL", settings.LOGS_SERVICE_URL)
-# VALIDATOR_SERVICE_URL removed - validation now uses local Pydantic models
-OPTIMIZER_SERVICE_URL = os.getenv("OPTIMIZER_SERVICE_URL", settings.OPTIMIZER_SERVICE_URL)
-
 
 # Request/Response Models
 class CampaignRequest(BaseModel):
@@ -49,6 +67,8 @@ class CampaignResponse(BaseModel):
     strategy: Optional[Dict[str, Any]] = None
     creatives: Optional[List[Dict[str, Any]]] = None
     meta_campaign: Optional[Dict[str, Any]] = None
+    
+    model_config = ConfigDict(extra="ignore", frozen=True)
 
 
 class OptimizationRequest(BaseModel):
@@ -57,39 +77,71 @@ class OptimizationRequest(BaseModel):
     performance_data: Dict[str, Any]
 
 
-@app.get("/")
+async def _post_json(url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """POST a JSON payload over the shared keep-alive client and return the decoded response."""
+    return await send_json(get_async_client(), url, payload)
+
+
+async def _select_products(spec_dump: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """调用产品服务，返回选中的产品列表"""
+    product_request = {
+        "campaign_spec": spec_dump,
+        "limit": 10
+    }
+    
+    products_response = await _post_json(f"{PRODUCT_SERVICE_URL}/select_products", product_request)
+    
+    # Extract products from response (could be in products or groups)
+    selected_products = []
+    if "products" in products_response:
+        selected_products = products_response["products"]
+    elif "groups" in products_response:
+        # Flatten products from groups
+        for group in products_response["groups"]:
+            if "products" in group:
+                selected_products.extend(group["products"])
+    return selected_products
+
+
+async def _generate_strategy(spec_dump: Dict[str, Any]) -> Dict[str, Any]:
+    """调用策略服务，返回生成的策略"""
+    return await _post_json(f"{STRATEGY_SERVICE_URL}/generate_strategy", {"campaign_spec": spec_dump})
+
+
+# Static service description, serialized once at import
+_ROOT_BYTES = orjson.dumps({
+    "service": "Ad Campaign Orchestrator Agent",
+    "version": "1.0.0",
+    "status": "running",
+    "description": "AI-powered orchestrator for ad campaign management",
+    "endpoints": {
+        "health": "/health",
+        "create_campaign": "/create_campaign",
+        "optimize_campaign": "/optimize_campaign",
+        "services_status": "/services/status",
+        "docs": "/docs"
+    }
+})
+
+
+@app.get("/", response_class=Response)
 async def root():
     """根路径"""
-    return {
-        "service": "Ad Campaign Orchestrator Agent",
-        "version": "1.0.0",
-        "status": "running",
-        "description": "AI-powered orchestrator for ad campaign management",
-        "endpoints": {
-            "health": "/health",
-            "create_campaign": "/create_campaign",
-            "optimize_campaign": "/optimize_campaign",
-            "services_status": "/services/status",
-            "docs": "/docs"
-        }
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
+
 
+# Health probes hit this every few seconds; the payload is static, so encode it once
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "service": "orchestrator_agent",
+    "connected_services": SERVICE_URLS
+})
 
-@app.get("/health")
+
+@app.get("/health", response_class=Response)
 async def health_check():
     """健康检查"""
-    return {
-        "status": "healthy",
-        "service": "orchestrator_agent",
-        "connected_services": {
-            "product_service": PRODUCT_SERVICE_URL,
-            "creative_service": CREATIVE_SERVICE_URL,
-            "strategy_service": STRATEGY_SERVICE_URL,
-            "meta_service": META_SERVICE_URL,
-            "logs_service": LOGS_SERVICE_URL,
-            "optimizer_service": OPTIMIZER_SERVICE_URL
-        }
-    }
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
 @app.post("/create_campaign", response_model=CampaignResponse)
@@ -147,52 +199,22 @@ async def create_campaign(request: CampaignRequest):
             }
         )
         
-        # Step 1: 选择产品
-        workflow_steps.append({"step": 1, "action": "Selecting products", "status": "in_progress"})
+        # Step 1-2: 选择产品 + 生成策略（互不依赖，并发执行；任一失败会取消另一个）
+        spec_dump = campaign_spec.model_dump()
+        product_step = {"step": 1, "action": "Selecting products", "status": "in_progress"}
+        strategy_step = {"step": 2, "action": "Generating strategy", "status": "in_progress"}
+        workflow_steps += [product_step, strategy_step]
         
-        product_request = {
-            "campaign_spec": campaign_spec.model_dump(),
-            "limit": 10
-        }
-        
-        response = requests.post(
-            f"{PRODUCT_SERVICE_URL}/select_products",
-            json=product_request,
-            timeout=30
+        selected_products, strategy_response = await gather_or_cancel(
+            _select_products(spec_dump),
+            _generate_strategy(spec_dump)
         )
-        response.raise_for_status()
-        products_response = response.json()
-        
-        # Extract products from response (could be in products or groups)
-        selected_products = []
-        if "products" in products_response:
-            selected_products = products_response["products"]
-        elif "groups" in products_response:
-            # Flatten products from groups
-            for group in products_response["groups"]:
-                if "products" in group:
-                    selected_products.extend(group["products"])
         
-        workflow_steps[-1]["status"] = "completed"
-        workflow_steps[-1]["result"] = f"Selected {len(selected_products)} products"
-        
-        # Step 2: 生成策略
-        workflow_steps.append({"step": 2, "action": "Generating strategy", "status": "in_progress"})
-        
-        strategy_request = {
-            "campaign_spec": campaign_spec.model_dump()
-        }
-        
-        response = requests.post(
-            f"{STRATEGY_SERVICE_URL}/generate_strategy",
-            json=strategy_request,
-            timeout=30
-        )
-        response.raise_for_status()
-        strategy_response = response.json()
-        
-        workflow_steps[-1]["status"] = "completed"
-        workflow_steps[-1]["result"] = f"Strategy generated with {len(strategy_response.get('platform_strategies', []))} platform strategies"
+        product_step["status"] = "completed"
+        product_step["result"] = f"Selected {len(selected_products)} products"
+        strategy_step["status"] = "completed"
+        num_strategies = len(strategy_response.get('platform_strategies', []))
+        strategy_step["result"] = f"Strategy generated with {num_strategies} platform strategies"
         
         # Step 3: 生成创意
         workflow_steps.append({"step": 3, "action": "Generating creatives", "status": "in_progress"})
@@ -217,7 +239,7 @@ async def create_campaign(request: CampaignRequest):
                 products_for_creatives.append(p)
         
         creative_request = {
-            "campaign_spec": campaign_spec.model_dump(),
+            "campaign_spec": spec_dump,
             "products": [p.model_dump() for p in products_for_creatives],
             "ab_config": {
                 "variants_per_product": 2,
@@ -226,13 +248,7 @@ async def create_campaign(request: CampaignRequest):
             }
         }
         
-        response = requests.post(
-            f"{CREATIVE_SERVICE_URL}/generate_creatives",
-            json=creative_request,
-            timeout=30
-        )
-        response.raise_for_status()
-        creatives_response = response.json()
+        creatives_response = await _post_json(f"{CREATIVE_SERVICE_URL}/generate_creatives", creative_request)
         creatives = creatives_response.get("creatives", [])
         
         workflow_steps[-1]["status"] = "completed"
@@ -249,13 +265,7 @@ async def create_campaign(request: CampaignRequest):
             "creatives": [c["creative_id"] for c in creatives[:5]]
         }
         
-        response = requests.post(
-            f"{META_SERVICE_URL}/create_campaign",
-            json=meta_request,
-            timeout=30
-        )
-        response.raise_for_status()
-        meta_response = response.json()
+        meta_response = await _post_json(f"{META_SERVICE_URL}/create_campaign", meta_request)
         campaign_id = meta_response.get("campaign_id")
         
         workflow_steps[-1]["status"] = "completed"
@@ -264,7 +274,8 @@ async def create_campaign(request: CampaignRequest):
         # Step 5: 记录完成
         workflow_steps.append({"step": 5, "action": "Workflow completed", "status": "completed"})
         
-        return CampaignResponse(
+        # All fields come straight from decoded service responses; skip per-item validation
+        return CampaignResponse.model_construct(
             status="success",
             campaign_id=campaign_id,
             message="Campaign created successfully through orchestrator",
@@ -275,7 +286,7 @@ async def create_campaign(request: CampaignRequest):
             meta_campaign=meta_response
         )
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         # 网络或HTTP错误
         workflow_steps.append({
             "step": len(workflow_steps) + 1,
@@ -320,13 +331,7 @@ async def optimize_campaign(request: OptimizationRequest):
             "performance_metrics": request.performance_data
         }
         
-        response = requests.post(
-            f"{OPTIMIZER_SERVICE_URL}/optimize_campaign",
-            json=optimization_request,
-            timeout=30
-        )
-        response.raise_for_status()
-        optimization_response = response.json()
+        optimization_response = await _post_json(f"{OPTIMIZER_SERVICE_URL}/optimize_campaign", optimization_request)
         
         return {
             "status": "success",
@@ -343,47 +348,14 @@ async def optimize_campaign(request: OptimizationRequest):
 
 
 @app.get("/services/status")
-async def check_services_status():
+async def check_services_status(response: Response):
     """
-    检查所有微服务的状态
+    检查所有微服务的状态（结果短时缓存）
     """
-    services_status = {}
-    
-    services = {
-        "product_service": PRODUCT_SERVICE_URL,
-        "creative_service": CREATIVE_SERVICE_URL,
-        "strategy_service": STRATEGY_SERVICE_URL,
-        "meta_service": META_SERVICE_URL,
-        "logs_service": LOGS_SERVICE_URL,
-        "optimizer_service": OPTIMIZER_SERVICE_URL,
-    }
-    
-    for service_name, url in services.items():
-        try:
-            response = requests.get(f"{url}/health", timeout=5)
-            health = response.json()
-            services_status[service_name] = {
-                "status": "healthy" if health.get("status") == "healthy" else "unhealthy",
-                "url": url,
-                "response": health
-            }
-        except Exception as e:
-            services_status[service_name] = {
-                "status": "unreachable",
-                "url": url,
-                "error": str(e)
-            }
-    
-    all_healthy = all(s["status"] == "healthy" for s in services_status.values())
-    
-    return {
-        "orchestrator_status": "healthy" if all_healthy else "degraded",
-        "services": services_status,
-        "total_services": len(services),
-        "healthy_services": sum(1 for s in services_status.values() if s["status"] == "healthy")
-    }
+    response.headers["Cache-Control"] = STATUS_CACHE_CONTROL
+    return await get_services_status()
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    from app.common.server import run_server
+    run_server(app, port=8000)
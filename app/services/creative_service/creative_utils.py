@@ -2,14 +2,21 @@
 Utility functions for creative generation.
 """
 
+import asyncio
+import contextlib
+import hashlib
 import os
+import shutil
+import subprocess
+import tempfile
 import yaml
 import logging
-import json
-import google.generativeai as genai
-from openai import OpenAI
-import replicate
-from typing import Dict, Optional, Tuple, List
+import httpx
+import orjson
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, List
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -17,6 +24,7 @@ from tenacity import (
     retry_if_exception_type,
     RetryError
 )
+from app.common.cache import TTLCache, hash_key
 from app.common.config import settings
 
 logger = logging.getLogger(__name__)
@@ -29,83 +37,243 @@ gemini_model = None
 gemini_image_model = None
 replicate_client = None  # For video generation
 
+# Connection pool for the OpenAI SDK: one client per process is shared by all
+# request threads, so the pool must allow concurrent LLM/image calls
+OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+OPENAI_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Default output budget for one text generation (OpenAI max_tokens / Gemini max_output_tokens)
+TEXT_MAX_TOKENS = 500
+
+# Generation settings shared by every Gemini text/image call
+GEMINI_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "max_output_tokens": TEXT_MAX_TOKENS
+}
+
 # Get API keys from environment (unified to use OPENAI_REAL_KEY)
 openai_real_key = os.getenv("OPENAI_REAL_KEY", settings.OPENAI_REAL_KEY)
+replicate_api_token = os.getenv("REPLICATE_API_TOKEN", settings.REPLICATE_API_TOKEN)
 
-if openai_real_key:
-    try:
-        # Unified client for both text and image generation (uses native OpenAI API)
-        openai_client = OpenAI(
-            api_key=openai_real_key,
-            base_url=settings.OPENAI_BASE_URL
-        )
-        # Same client for image generation
-        openai_image_client = openai_client
-        logger.info("OpenAI client initialized successfully (text and image generation)")
-    except Exception as e:
-        logger.warning(f"Failed to initialize OpenAI client: {e}")
-        openai_client = None
-        openai_image_client = None
+# The OpenAI, Gemini and Replicate SDKs take up to a second to import and
+# their clients open connection pools, so each is imported and built on first
+# use (see load_openai_client, load_gemini_models, load_replicate_client)
+gemini_api_key = None
+_openai_loaded = False
+_gemini_loaded = False
+_replicate_loaded = False
+_client_lock = threading.Lock()
 
-if not openai_client:
+if not openai_real_key:
     # Fallback to Gemini
     gemini_api_key = os.getenv("GEMINI_API_KEY", settings.GEMINI_API_KEY)
     gemini_image_api_key = os.getenv("GEMINI_IMAGE_API_KEY", None)
     
-    if gemini_api_key:
-        genai.configure(api_key=gemini_api_key)
-        gemini_model = genai.GenerativeModel(settings.GEMINI_MODEL)
-        gemini_image_model = genai.GenerativeModel(settings.GEMINI_IMAGE_MODEL) if hasattr(settings, 'GEMINI_IMAGE_MODEL') else gemini_model
-    else:
+    if not gemini_api_key:
         logger.warning("Neither OPENAI_REAL_KEY nor GEMINI_API_KEY set. LLM features will use fallback templates.")
 
-# Initialize Replicate client for video generation
-replicate_api_token = os.getenv("REPLICATE_API_TOKEN", settings.REPLICATE_API_TOKEN)
-if replicate_api_token:
-    try:
-        os.environ["REPLICATE_API_TOKEN"] = replicate_api_token
-        replicate_client = replicate.Client(api_token=replicate_api_token)
-        logger.info("Replicate client initialized successfully (video generation)")
-    except Exception as e:
-        logger.warning(f"Failed to initialize Replicate client: {e}")
-        replicate_client = None
-else:
+if not replicate_api_token:
     logger.warning("REPLICATE_API_TOKEN not set. Video generation will be disabled.")
 
 
-def load_creative_policy() -> Dict:
+def load_openai_client() -> None:
+    """
+    Initialize openai_client and openai_image_client on first call.
+    
+    Does nothing when OPENAI_REAL_KEY is unset or the client is already set.
+    If the client cannot be built, Gemini becomes the text provider.
+    """
+    global openai_client, openai_image_client, gemini_api_key, _openai_loaded
+    if _openai_loaded:
+        return
+    with _client_lock:
+        if _openai_loaded:
+            return
+        if openai_real_key and openai_client is None:
+            try:
+                from openai import OpenAI
+                # Unified client for both text and image generation (uses native OpenAI API)
+                openai_client = OpenAI(
+                    api_key=openai_real_key,
+                    base_url=settings.OPENAI_BASE_URL,
+                    http_client=httpx.Client(limits=OPENAI_HTTP_LIMITS, timeout=OPENAI_HTTP_TIMEOUT)
+                )
+                # Same client for image generation
+                openai_image_client = openai_client
+                logger.info("OpenAI client initialized successfully (text and image generation)")
+            except Exception as e:
+                logger.warning(f"Failed to initialize OpenAI client: {e}")
+                openai_client = None
+                openai_image_client = None
+                gemini_api_key = os.getenv("GEMINI_API_KEY", settings.GEMINI_API_KEY)
+        _openai_loaded = True
+
+
+def load_gemini_models() -> None:
+    """
+    Initialize gemini_model and gemini_image_model on first call.
+    
+    Does nothing when OpenAI is configured, GEMINI_API_KEY is unset, or the
+    models are already set.
+    """
+    global gemini_model, gemini_image_model, _gemini_loaded
+    if _gemini_loaded:
+        return
+    # The OpenAI loader decides whether Gemini is needed (gemini_api_key)
+    load_openai_client()
+    with _client_lock:
+        if _gemini_loaded:
+            return
+        if gemini_api_key and gemini_model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=gemini_api_key)
+            gemini_model = genai.GenerativeModel(settings.GEMINI_MODEL)
+            if hasattr(settings, 'GEMINI_IMAGE_MODEL'):
+                gemini_image_model = genai.GenerativeModel(settings.GEMINI_IMAGE_MODEL)
+            else:
+                gemini_image_model = gemini_model
+        _gemini_loaded = True
+
+
+def load_replicate_client() -> None:
+    """
+    Initialize replicate_client (video generation) on first call.
+    
+    Does nothing when REPLICATE_API_TOKEN is unset or the client is already set.
+    """
+    global replicate_client, _replicate_loaded
+    if _replicate_loaded:
+        return
+    with _client_lock:
+        if _replicate_loaded:
+            return
+        if replicate_api_token and replicate_client is None:
+            try:
+                import replicate
+                os.environ["REPLICATE_API_TOKEN"] = replicate_api_token
+                replicate_client = replicate.Client(api_token=replicate_api_token)
+                logger.info("Replicate client initialized successfully (video generation)")
+            except Exception as e:
+                logger.warning(f"Failed to initialize Replicate client: {e}")
+                replicate_client = None
+        _replicate_loaded = True
+
+
+# libyaml's C loader parses several times faster; fall back to pure Python without it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Parsed creative policy per path as (mtime_ns, size, policy); editing the YAML
+# invalidates its entry. Least recently used paths are evicted beyond the cap.
+_POLICY_CACHE: "OrderedDict[str, Tuple[int, int, Dict]]" = OrderedDict()
+_POLICY_CACHE_MAX = 16
+
+# Used when the policy file is missing or unreadable
+DEFAULT_POLICY = {
+    "default": {
+        "copy_style": "direct_response",
+        "visual_style": "clean_product_focus",
+        "tone": "professional",
+        "headline_style": "benefit_focused",
+        "primary_text_length": "medium"
+    }
+}
+
+
+def load_creative_policy(policy_path: Optional[str] = None) -> Dict:
     """
     Load creative policy from YAML file or return default policy.
     
+    The parsed policy is cached until the file's modification time or size
+    changes, so per-request calls cost a stat() instead of a YAML parse.
+    
+    Args:
+        policy_path: Policy file to load (defaults to creative_policy.yaml
+            next to this module)
+    
     Returns:
         Dictionary containing policy rules by category
     """
-    policy_path = os.path.join(
-        os.path.dirname(__file__),
-        "creative_policy.yaml"
-    )
-    
-    default_policy = {
-        "default": {
-            "copy_style": "direct_response",
-            "visual_style": "clean_product_focus",
-            "tone": "professional",
-            "headline_style": "benefit_focused",
-            "primary_text_length": "medium"
-        }
-    }
+    if policy_path is None:
+        policy_path = os.path.join(
+            os.path.dirname(__file__),
+            "creative_policy.yaml"
+        )
     
     try:
-        if os.path.exists(policy_path):
+        st = os.stat(policy_path)
+    except OSError:
+        logger.warning(f"Policy file not found at {policy_path}, using default policy")
+        return DEFAULT_POLICY
+    
+    # Size is checked too: a rewrite within the filesystem's mtime granularity keeps the mtime
+    cached = _POLICY_CACHE.get(policy_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        _POLICY_CACHE.move_to_end(policy_path)
+        return cached[2]
+    
+    policy = _read_policy_sidecar(policy_path, st)
+    if policy is None:
+        try:
             with open(policy_path, 'r') as f:
-                policy = yaml.safe_load(f)
-                return policy if policy else default_policy
-        else:
-            logger.warning(f"Policy file not found at {policy_path}, using default policy")
-            return default_policy
-    except Exception as e:
-        logger.error(f"Error loading policy file: {e}, using default policy")
-        return default_policy
+                policy = yaml.load(f, Loader=_YamlLoader) or DEFAULT_POLICY
+        except Exception as e:
+            logger.error(f"Error loading policy file: {e}, using default policy")
+            return DEFAULT_POLICY
+        _write_policy_sidecar(policy_path, st, policy)
+    
+    _POLICY_CACHE[policy_path] = (st.st_mtime_ns, st.st_size, policy)
+    _POLICY_CACHE.move_to_end(policy_path)
+    while len(_POLICY_CACHE) > _POLICY_CACHE_MAX:
+        _POLICY_CACHE.popitem(last=False)
+    return policy
+
+
+def _read_policy_sidecar(policy_path: str, st: os.stat_result) -> Optional[Dict]:
+    """Return the policy from its JSON sidecar if it was written for this version of the YAML."""
+    try:
+        with open(policy_path + ".json", 'rb') as f:
+            sidecar = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if not isinstance(sidecar, dict) or sidecar.get("source") != [st.st_mtime_ns, st.st_size]:
+        return None
+    return sidecar.get("policy")
+
+
+def _write_policy_sidecar(policy_path: str, st: os.stat_result, policy: Dict) -> None:
+    """
+    Write the parsed policy next to the YAML as JSON so later processes skip YAML parsing.
+    
+    The sidecar records the YAML's mtime and size it was parsed from. Best effort:
+    read-only filesystems or non-JSON values just skip the sidecar.
+    """
+    json_path = policy_path + ".json"
+    tmp_path = f"{json_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps({"source": [st.st_mtime_ns, st.st_size], "policy": policy}))
+        os.replace(tmp_path, json_path)
+    except (OSError, TypeError) as e:
+        logger.debug(f"Could not write policy sidecar {json_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+# Category -> rules (and rendered prompt fragments) for the most recently used
+# policy object; load_creative_policy returns the same object until the YAML changes
+_CATEGORY_CACHE: Dict[str, object] = {"policy": None, "resolved": {}, "copy_styles": {}}
+
+
+def _policy_scoped_cache(policy: Dict) -> Dict[str, object]:
+    # Cached entries are only valid for the policy object they were made against
+    if _CATEGORY_CACHE["policy"] is not policy:
+        _CATEGORY_CACHE.update(policy=policy, resolved={}, copy_styles={})
+    return _CATEGORY_CACHE
 
 
 def get_policy_for_category(category: str, policy: Dict) -> Dict:
@@ -121,6 +289,15 @@ def get_policy_for_category(category: str, policy: Dict) -> Dict:
     """
     category_lower = category.lower() if category else ""
     
+    resolved = _policy_scoped_cache(policy)["resolved"]
+    
+    rules = resolved.get(category_lower)
+    if rules is None:
+        rules = resolved[category_lower] = _resolve_category(category_lower, policy)
+    return rules
+
+
+def _resolve_category(category_lower: str, policy: Dict) -> Dict:
     # Try exact match first
     if category_lower in policy:
         return policy[category_lower]
@@ -140,6 +317,38 @@ def get_policy_for_category(category: str, policy: Dict) -> Dict:
     })
 
 
+# Per-variant prompt instructions, shared by every prompt build
+COPY_VARIANT_INSTRUCTIONS = {
+    "A": "Use a direct, benefit-focused approach. Emphasize clear value proposition.",
+    "B": "Use a more emotional or storytelling approach. Create connection with the audience."
+}
+
+IMAGE_VARIANT_STYLES = {
+    "A": "product-focused, clean background, professional studio lighting, minimalist composition",
+    "B": "lifestyle context, natural setting, emotional connection, people using the product",
+    "C": "dynamic action shot, vibrant colors, energetic atmosphere, product in use",
+    "D": "comparison or before/after style, problem-solving visual, clear benefits shown",
+    "E": "aspirational lifestyle, premium aesthetic, sophisticated composition, luxury feel"
+}
+
+
+def _copy_style_guidelines(category: str, policy: Dict, variant: str) -> str:
+    # Depends only on (category, variant), so it is rendered once per policy
+    copy_styles = _policy_scoped_cache(policy)["copy_styles"]
+    key = (category.lower() if category else "", variant)
+    block = copy_styles.get(key)
+    if block is None:
+        category_policy = get_policy_for_category(category, policy)
+        variant_instruction = COPY_VARIANT_INSTRUCTIONS.get(variant, COPY_VARIANT_INSTRUCTIONS["A"])
+        block = copy_styles[key] = f"""Style Guidelines:
+- Copy Style: {category_policy.get('copy_style', 'direct_response')}
+- Tone: {category_policy.get('tone', 'professional')}
+- Headline Style: {category_policy.get('headline_style', 'benefit_focused')}
+- Primary Text Length: {category_policy.get('primary_text_length', 'medium')}
+- Variant Approach: {variant_instruction}"""
+    return block
+
+
 def build_copy_prompt(product, campaign_spec, policy: Dict, variant: str) -> str:
     """
     Build prompt for generating ad copy (headline + primary text).
@@ -153,14 +362,7 @@ def build_copy_prompt(product, campaign_spec, policy: Dict, variant: str) -> str
     Returns:
         Prompt string for LLM
     """
-    category_policy = get_policy_for_category(product.category, policy)
-    
-    variant_instructions = {
-        "A": "Use a direct, benefit-focused approach. Emphasize clear value proposition.",
-        "B": "Use a more emotional or storytelling approach. Create connection with the audience."
-    }
-    
-    variant_instruction = variant_instructions.get(variant, variant_instructions["A"])
+    style_guidelines = _copy_style_guidelines(product.category, policy, variant)
     
     prompt = f"""Generate advertising copy for a {campaign_spec.platform} ad campaign.
 
@@ -174,12 +376,7 @@ Campaign Details:
 - Objective: {campaign_spec.objective}
 - Platform: {campaign_spec.platform}
 
-Style Guidelines:
-- Copy Style: {category_policy.get('copy_style', 'direct_response')}
-- Tone: {category_policy.get('tone', 'professional')}
-- Headline Style: {category_policy.get('headline_style', 'benefit_focused')}
-- Primary Text Length: {category_policy.get('primary_text_length', 'medium')}
-- Variant Approach: {variant_instruction}
+{style_guidelines}
 
 Platform Requirements:
 - Meta: Headline max 40 chars, Primary text max 125 chars
@@ -211,16 +408,7 @@ def build_image_prompt(product, campaign_spec, policy: Dict, variant: str) -> st
         Prompt string for image generation
     """
     category_policy = get_policy_for_category(product.category, policy)
-    
-    variant_styles = {
-        "A": "product-focused, clean background, professional studio lighting, minimalist composition",
-        "B": "lifestyle context, natural setting, emotional connection, people using the product",
-        "C": "dynamic action shot, vibrant colors, energetic atmosphere, product in use",
-        "D": "comparison or before/after style, problem-solving visual, clear benefits shown",
-        "E": "aspirational lifestyle, premium aesthetic, sophisticated composition, luxury feel"
-    }
-    
-    variant_style = variant_styles.get(variant, variant_styles["A"])
+    variant_style = IMAGE_VARIANT_STYLES.get(variant, IMAGE_VARIANT_STYLES["A"])
     visual_style = category_policy.get('visual_style', 'clean_product_focus')
     
     prompt = f"""You are a professional advertising photographer creating an image brief for a {campaign_spec.platform} ad campaign.
@@ -252,19 +440,83 @@ Return ONLY the image description text, no JSON, no markdown, no explanations, j
     return prompt
 
 
+def build_creative_prompt(product, campaign_spec, policy: Dict, variant: str) -> str:
+    """
+    Build one prompt asking for the ad copy and the image brief together.
+    
+    Combines build_copy_prompt and build_image_prompt so a variant needs a
+    single LLM call; the shared product and campaign context is sent once.
+    
+    Args:
+        product: Product object
+        campaign_spec: CampaignSpec object
+        policy: Policy rules for the category
+        variant: Variant ID ("A", "B", "C", etc.)
+        
+    Returns:
+        Prompt string for LLM (JSON with headline, primary_text, image_prompt)
+    """
+    style_guidelines = _copy_style_guidelines(product.category, policy, variant)
+    visual_style = get_policy_for_category(product.category, policy).get('visual_style', 'clean_product_focus')
+    variant_style = IMAGE_VARIANT_STYLES.get(variant, IMAGE_VARIANT_STYLES["A"])
+    
+    prompt = f"""Generate advertising copy and an image brief for a {campaign_spec.platform} ad campaign.
+
+Product Information:
+- Title: {product.title}
+- Description: {product.description}
+- Price: ${product.price}
+- Category: {product.category}
+
+Campaign Details:
+- Objective: {campaign_spec.objective}
+- Platform: {campaign_spec.platform}
+
+{style_guidelines}
+
+Platform Requirements:
+- Meta: Headline max 40 chars, Primary text max 125 chars
+- TikTok: Headline max 80 chars, Primary text max 220 chars
+- Google: Headline max 30 chars, Primary text max 90 chars
+
+Image Brief Requirements:
+1. A detailed image description (2-3 sentences) suitable for professional product photography or AI image generation
+2. Focus on: composition, lighting, mood, colors, background, and key visual elements
+3. Match the visual style: {visual_style}
+4. Match the variant approach: {variant_style}
+5. Do NOT include product name, text overlays, or written content in the image description
+6. Focus on visual elements that will make the ad compelling and conversion-focused
+
+Generate ONLY a JSON object with this exact structure:
+{{
+  "headline": "the headline text",
+  "primary_text": "the primary text content",
+  "image_prompt": "the image description"
+}}
+
+Do not include any markdown formatting, explanations, or additional text. Return only the JSON object."""
+    
+    return prompt
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=30),
     retry=retry_if_exception_type((Exception,)),
     reraise=True
 )
-def _call_openai_api_internal(prompt: str, json_mode: bool = False) -> Optional[str]:
+def _call_openai_api_internal(
+    prompt: str,
+    json_mode: bool = False,
+    max_tokens: int = TEXT_MAX_TOKENS
+) -> Optional[str]:
     """
     Internal function to call OpenAI API with retry logic.
     
     Args:
         prompt: Prompt string
         json_mode: Whether to request JSON output
+        max_tokens: Output token limit
         
     Returns:
         Generated text or None if error
@@ -275,10 +527,10 @@ def _call_openai_api_internal(prompt: str, json_mode: bool = False) -> Optional[
     messages = [{"role": "user", "content": prompt}]
     
     kwargs = {
-        "model": "gpt-4.1-mini",
+        "model": settings.OPENAI_MODEL,
         "messages": messages,
         "temperature": 0.7,
-        "max_tokens": 500
+        "max_tokens": max_tokens
     }
     
     if json_mode:
@@ -294,13 +546,18 @@ def _call_openai_api_internal(prompt: str, json_mode: bool = False) -> Optional[
     retry=retry_if_exception_type((Exception,)),
     reraise=True
 )
-def _call_gemini_api_internal(prompt: str, response_schema: Optional[Dict] = None) -> Optional[str]:
+def _call_gemini_api_internal(
+    prompt: str,
+    response_schema: Optional[Dict] = None,
+    max_tokens: int = TEXT_MAX_TOKENS
+) -> Optional[str]:
     """
     Internal function to call Gemini API with retry logic and optional JSON Mode.
     
     Args:
         prompt: Prompt string
         response_schema: Optional JSON schema for structured output (JSON Mode)
+        max_tokens: Output token limit
         
     Returns:
         Generated text or None if error
@@ -308,15 +565,19 @@ def _call_gemini_api_internal(prompt: str, response_schema: Optional[Dict] = Non
     if not gemini_model:
         return None
     
-    generation_config = genai.types.GenerationConfig(
-        temperature=0.7,
-        max_output_tokens=500
-    )
+    generation_config = GEMINI_GENERATION_CONFIG
+    
+    # Overrides go on a copy; the shared config is never mutated
+    if max_tokens != TEXT_MAX_TOKENS:
+        generation_config = {**generation_config, "max_output_tokens": max_tokens}
     
     # Use JSON Mode if schema provided
     if response_schema:
-        generation_config.response_schema = response_schema
-        generation_config.response_mime_type = "application/json"
+        generation_config = {
+            **generation_config,
+            "response_schema": response_schema,
+            "response_mime_type": "application/json"
+        }
     
     response = gemini_model.generate_content(
         prompt,
@@ -325,7 +586,21 @@ def _call_gemini_api_internal(prompt: str, response_schema: Optional[Dict] = Non
     return response.text.strip() if response and response.text else None
 
 
-def call_gemini_text(prompt: str, response_schema: Optional[Dict] = None) -> Optional[str]:
+# Successful text generations keyed by prompt digest; failures are never cached
+_TEXT_CACHE = TTLCache(maxsize=4096, ttl=3600)
+
+
+def _text_cache_key(prompt: str, response_schema: Optional[Dict], max_tokens: int) -> str:
+    # Models, schema and output budget are part of the key so a config change never serves stale output
+    schema = "" if response_schema is None else orjson.dumps(response_schema, option=orjson.OPT_SORT_KEYS).decode()
+    return hash_key(f"{settings.OPENAI_MODEL}|{settings.GEMINI_MODEL}|{max_tokens}|{schema}|{prompt}")
+
+
+def call_gemini_text(
+    prompt: str,
+    response_schema: Optional[Dict] = None,
+    max_tokens: int = TEXT_MAX_TOKENS
+) -> Optional[str]:
     """
     Call LLM API (OpenAI or Gemini) for text generation with exponential backoff retry.
     
@@ -338,20 +613,37 @@ def call_gemini_text(prompt: str, response_schema: Optional[Dict] = None) -> Opt
         prompt: Prompt string
         response_schema: Optional JSON schema for structured output (JSON Mode)
                        When provided, forces JSON output matching the schema
+        max_tokens: Output token limit
         
     Returns:
         Generated text or None if error after retries
         If response_schema is provided, returns valid JSON string
     """
-    logger.debug(f"call_gemini_text called with prompt length: {len(prompt)}")
+    logger.debug("call_gemini_text called with prompt length: %d", len(prompt))
+    
+    # Identical prompts (re-run campaigns, repeated A/B tests) are served from cache
+    use_cache = settings.LLM_CACHE_ENABLED
+    cache_key = _text_cache_key(prompt, response_schema, max_tokens) if use_cache else None
+    if use_cache:
+        cached = _TEXT_CACHE.get(cache_key)
+        if cached is not None:
+            logger.debug("call_gemini_text cache hit")
+            return cached
     
     # Try OpenAI first
+    load_openai_client()
     if openai_client:
-        logger.debug(f"Calling OpenAI API with model: gpt-4.1-mini, JSON Mode: {response_schema is not None}")
+        logger.debug(
+            "Calling OpenAI API with model: %s, JSON Mode: %s", settings.OPENAI_MODEL, response_schema is not None
+        )
         try:
-            result = _call_openai_api_internal(prompt, json_mode=(response_schema is not None))
+            result = _call_openai_api_internal(
+                prompt, json_mode=(response_schema is not None), max_tokens=max_tokens
+            )
             if result:
-                logger.debug(f"OpenAI API call successful, response length: {len(result)}")
+                logger.debug("OpenAI API call successful, response length: %d", len(result))
+                if use_cache:
+                    _TEXT_CACHE.set(cache_key, result)
                 return result
         except RetryError as e:
             logger.error(f"OpenAI API call failed after retries: {e.last_attempt.exception()}")
@@ -359,11 +651,16 @@ def call_gemini_text(prompt: str, response_schema: Optional[Dict] = None) -> Opt
             logger.error(f"Error calling OpenAI API: {e}", exc_info=True)
     
     # Fallback to Gemini
+    load_gemini_models()
     if gemini_model:
-        logger.debug(f"Calling Gemini API with model: {settings.GEMINI_MODEL}, JSON Mode: {response_schema is not None}")
+        logger.debug(
+            "Calling Gemini API with model: %s, JSON Mode: %s", settings.GEMINI_MODEL, response_schema is not None
+        )
         try:
-            result = _call_gemini_api_internal(prompt, response_schema=response_schema)
-            logger.debug(f"Gemini API call successful, response length: {len(result) if result else 0}")
+            result = _call_gemini_api_internal(prompt, response_schema=response_schema, max_tokens=max_tokens)
+            logger.debug("Gemini API call successful, response length: %d", len(result) if result else 0)
+            if result and use_cache:
+                _TEXT_CACHE.set(cache_key, result)
             return result
         except RetryError as e:
             logger.error(f"Gemini API call failed after retries: {e.last_attempt.exception()}")
@@ -374,6 +671,148 @@ def call_gemini_text(prompt: str, response_schema: Optional[Dict] = None) -> Opt
     return None
 
 
+# One semaphore per event loop; asyncio primitives cannot be shared across loops
+_CALL_SLOTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+async def run_bounded(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking provider call in a worker thread.
+    
+    At most settings.LLM_MAX_CONCURRENCY calls run at once per event loop,
+    so fanning out many variants overlaps their network round trips without
+    bursting past the provider's rate limits.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _CALL_SLOTS.get(loop)
+    if slots is None:
+        slots = _CALL_SLOTS[loop] = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    async with slots:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def call_gemini_text_async(prompt: str, response_schema: Optional[Dict] = None) -> Optional[str]:
+    """
+    Async variant of call_gemini_text for use inside request handlers.
+    
+    The provider clients are synchronous, so the call (with its fallback and
+    retries) runs in a worker thread via run_bounded. The event loop stays
+    free and several calls can be awaited together with asyncio.gather.
+    
+    Args:
+        prompt: Prompt string
+        response_schema: Optional JSON schema for structured output (JSON Mode)
+        
+    Returns:
+        Generated text or None if error after retries
+    """
+    return await run_bounded(call_gemini_text, prompt, response_schema)
+
+
+async def call_gemini_text_batch_async(
+    prompts: List[str],
+    response_schema: Optional[Dict] = None
+) -> List[Optional[str]]:
+    """
+    Generate text for several prompts concurrently.
+    
+    Neither SDK offers a synchronous multi-prompt batch (a list passed to
+    Gemini's generate_content is a single multi-part prompt), so each prompt
+    is sent through call_gemini_text_async and their network round trips
+    overlap within the run_bounded limit.
+    
+    Args:
+        prompts: Prompt strings
+        response_schema: Optional JSON schema applied to every prompt (JSON Mode)
+        
+    Returns:
+        One result per prompt, in order; None where generation failed
+    """
+    return list(await asyncio.gather(*(call_gemini_text_async(prompt, response_schema) for prompt in prompts)))
+
+
+# Prompts packed into one LLM request; latency and answer quality degrade as packs grow
+TEXT_PACK_SIZE = 8
+# Output budget per packed item: a creative (headline, primary text, 2-3 sentence
+# image brief) is ~120 tokens, so TEXT_MAX_TOKENS for the whole pack would truncate
+PACKED_ITEM_MAX_TOKENS = 200
+
+
+def call_gemini_text_packed(prompts: List[str], response_schema: Dict) -> Optional[List[str]]:
+    """
+    Answer several JSON Mode prompts with a single LLM request.
+    
+    The prompts are sent as numbered items and the model returns
+    {"results": [...]} with one object per item, so the shared instructions
+    and one network round trip are amortized over the pack.
+    
+    Args:
+        prompts: Prompt strings, each expecting a JSON object reply
+        response_schema: JSON schema of one item's reply
+        
+    Returns:
+        One JSON string per prompt, in order; None if the response does not
+        contain exactly one object per prompt
+    """
+    
+    items = "\n\n".join(f"### Item {i}\n{prompt}" for i, prompt in enumerate(prompts, 1))
+    packed_prompt = (
+        f"Answer each of the following {len(prompts)} requests independently.\n"
+        f"Return ONLY a JSON object of the form {{\"results\": [...]}} where results contains "
+        f"exactly {len(prompts)} JSON objects, the i-th answering \"### Item i\".\n\n{items}"
+    )
+    packed_schema = {
+        "type": "object",
+        "properties": {"results": {"type": "array", "items": response_schema}},
+        "required": ["results"]
+    }
+    
+    response = call_gemini_text(
+        packed_prompt,
+        response_schema=packed_schema,
+        max_tokens=len(prompts) * PACKED_ITEM_MAX_TOKENS
+    ) or ""
+    try:
+        results = orjson.loads(response[response.find("{"):response.rfind("}") + 1])["results"]
+    except (orjson.JSONDecodeError, TypeError, KeyError):
+        results = None
+    if not isinstance(results, list) or len(results) != len(prompts) \
+            or not all(isinstance(result, dict) for result in results):
+        logger.warning("Packed LLM response unusable for %d prompts", len(prompts))
+        return None
+    
+    return [orjson.dumps(result).decode() for result in results]
+
+
+async def call_gemini_text_packed_async(prompts: List[str], response_schema: Dict) -> List[Optional[str]]:
+    """
+    Answer any number of JSON Mode prompts in packs of TEXT_PACK_SIZE.
+    
+    Packs are sent concurrently (bounded by run_bounded), each through
+    call_gemini_text_packed in a worker thread. A lone prompt, or a pack
+    whose response is unusable, is sent one prompt per request instead
+    (call_gemini_text_batch_async).
+    
+    Returns:
+        One JSON string per prompt, in order; None where generation failed
+    """
+    async def answer_pack(pack: List[str]) -> List[Optional[str]]:
+        if len(pack) > 1:
+            results = await run_bounded(call_gemini_text_packed, pack, response_schema)
+            if results is not None:
+                return results
+        return await call_gemini_text_batch_async(pack, response_schema)
+    
+    packs = [prompts[i:i + TEXT_PACK_SIZE] for i in range(0, len(prompts), TEXT_PACK_SIZE)]
+    results = await asyncio.gather(*(answer_pack(pack) for pack in packs))
+    return [result for pack_results in results for result in pack_results]
+
+
+# Generated image/video URLs keyed by model, settings and prompt. Provider URLs
+# (DALL-E, Replicate delivery) expire after about an hour, so entries live less
+_MEDIA_CACHE = TTLCache(maxsize=512, ttl=50 * 60)
+
+
 def call_openai_image(image_prompt: str) -> Optional[str]:
     """
     Call OpenAI DALL-E 3 for image generation using native OpenAI API.
@@ -384,6 +823,7 @@ def call_openai_image(image_prompt: str) -> Optional[str]:
     Returns:
         Image URL or None if error
     """
+    load_openai_client()
     if not openai_image_client:
         logger.debug("OpenAI image client not available, skipping image generation")
         return None
@@ -396,6 +836,15 @@ def call_openai_image(image_prompt: str) -> Optional[str]:
             image_prompt = image_prompt[:3997] + "..."
             logger.warning(f"Image prompt truncated to 4000 characters")
         
+        # Regenerating an identical prompt costs seconds and money; reuse the recent URL
+        use_cache = settings.LLM_CACHE_ENABLED
+        cache_key = hash_key(f"dall-e-3|1024x1024|standard|{image_prompt}")
+        if use_cache:
+            cached = _MEDIA_CACHE.get(cache_key)
+            if cached is not None:
+                logger.info("DALL-E 3 image served from cache")
+                return cached
+        
         response = openai_image_client.images.generate(
             model="dall-e-3",
             prompt=image_prompt,
@@ -407,6 +856,8 @@ def call_openai_image(image_prompt: str) -> Optional[str]:
         image_url = response.data[0].url
         logger.info(f"✅ DALL-E 3 image generated successfully!")
         logger.info(f"Image URL: {image_url}")
+        if image_url and use_cache:
+            _MEDIA_CACHE.set(cache_key, image_url)
         return image_url
         
     except Exception as e:
@@ -424,6 +875,7 @@ def call_gemini_image(image_prompt: str) -> Optional[str]:
     Returns:
         Image URL or None if not available/error
     """
+    load_gemini_models()
     if not gemini_image_model:
         logger.debug("Gemini image model not available, skipping image generation")
         return None
@@ -433,16 +885,11 @@ def call_gemini_image(image_prompt: str) -> Optional[str]:
         return None
     
     try:
-        logger.debug(f"Calling Gemini Image API with model: {settings.GEMINI_IMAGE_MODEL}")
-        
-        generation_config = genai.types.GenerationConfig(
-            temperature=0.7,
-            max_output_tokens=500
-        )
+        logger.debug("Calling Gemini Image API with model: %s", settings.GEMINI_IMAGE_MODEL)
         
         response = gemini_image_model.generate_content(
             image_prompt,
-            generation_config=generation_config
+            generation_config=GEMINI_GENERATION_CONFIG
         )
         
         # Note: Gemini image model may return image data or URL
@@ -479,26 +926,25 @@ def parse_copy_response(llm_response: str) -> Tuple[Optional[str], Optional[str]
         return None, None
     
     try:
-        import json
         # With JSON Mode, response is already valid JSON
         text = llm_response.strip()
         
         # Try direct JSON parse first (JSON Mode)
         try:
-            data = json.loads(text)
+            data = orjson.loads(text)
             headline = data.get("headline", "").strip()
             primary_text = data.get("primary_text", "").strip()
             if headline and primary_text:
                 return headline, primary_text
-        except json.JSONDecodeError:
-            # Fallback: Remove markdown code blocks if present (legacy format)
-            if "```json" in text:
-                text = text.split("```json")[1].split("```")[0].strip()
-            elif "```" in text:
-                text = text.split("```")[1].split("```")[0].strip()
+        except orjson.JSONDecodeError:
+            # Fallback: slice out the JSON object from markdown-wrapped text (legacy format)
+            start = text.find("{")
+            end = text.rfind("}")
+            if start != -1 and end > start:
+                text = text[start:end + 1]
             
             # Try parsing again after removing markdown
-            data = json.loads(text)
+            data = orjson.loads(text)
             headline = data.get("headline", "").strip()
             primary_text = data.get("primary_text", "").strip()
             if headline and primary_text:
@@ -507,14 +953,54 @@ def parse_copy_response(llm_response: str) -> Tuple[Optional[str], Optional[str]
     except Exception as e:
         logger.warning(f"Failed to parse LLM response as JSON: {e}")
     
-    # Final fallback: try to extract from plain text
-    lines = [line.strip() for line in llm_response.split("\n") if line.strip()]
+    # Final fallback (JSON parsing failed): try to extract from plain text
+    lines = [stripped for line in llm_response.splitlines() if (stripped := line.strip())]
     if len(lines) >= 2:
         return lines[0], " ".join(lines[1:])
     
     return None, None
 
 
+def parse_creative_response(llm_response: Optional[str]) -> Optional[Dict[str, str]]:
+    """
+    Parse a build_creative_prompt response.
+    
+    Args:
+        llm_response: Raw LLM response text (JSON, possibly markdown-wrapped)
+        
+    Returns:
+        Dict with non-empty headline, primary_text and image_prompt, or None
+        if the response is missing any of them (the caller then falls back
+        to the separate copy and image prompts)
+    """
+    if not llm_response:
+        return None
+    
+    text = llm_response.strip()
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        data = orjson.loads(text[start:end + 1])
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    
+    fields = {}
+    for key in ("headline", "primary_text", "image_prompt"):
+        value = data.get(key)
+        if not isinstance(value, str) or not value.strip():
+            return None
+        fields[key] = value.strip()
+    return fields
+
+
+# Phrases rejected by creative QA (simple example)
+BANNED_WORDS = ("spam", "free money", "guaranteed", "click here")
+
+
 def run_creative_qa(creative) -> Tuple[bool, List[str]]:
     """
     Run QA checks on a creative.
@@ -526,35 +1012,44 @@ def run_creative_qa(creative) -> Tuple[bool, List[str]]:
         Tuple of (is_valid, list_of_issues)
     """
     issues = []
+    headline = creative.headline
+    primary_text = creative.primary_text
     
     # Check text length
-    if creative.headline:
-        if len(creative.headline) > 100:
-            issues.append(f"Headline too long: {len(creative.headline)} chars")
-    
-    if len(creative.primary_text) < 10:
-        issues.append(f"Primary text too short: {len(creative.primary_text)} chars")
-    elif len(creative.primary_text) > 500:
-        issues.append(f"Primary text too long: {len(creative.primary_text)} chars")
-    
-    # Check for banned words (simple example)
-    banned_words = ["spam", "free money", "guaranteed", "click here"]
-    text_lower = creative.primary_text.lower()
-    if creative.headline:
-        text_lower += " " + creative.headline.lower()
-    
-    for word in banned_words:
+    if headline:
+        headline_len = len(headline)
+        if headline_len > 100:
+            issues.append(f"Headline too long: {headline_len} chars")
+    
+    primary_len = len(primary_text)
+    if primary_len < 10:
+        issues.append(f"Primary text too short: {primary_len} chars")
+    elif primary_len > 500:
+        issues.append(f"Primary text too long: {primary_len} chars")
+    
+    # Check for banned words (lowercase the combined text in one pass)
+    text_lower = (f"{primary_text} {headline}" if headline else primary_text).lower()
+    
+    for word in BANNED_WORDS:
         if word in text_lower:
             issues.append(f"Banned word detected: {word}")
     
     # Check for empty fields
-    if not creative.primary_text or not creative.primary_text.strip():
+    if not primary_text or not primary_text.strip():
         issues.append("Primary text is empty")
     
     is_valid = len(issues) == 0
     return is_valid, issues
 
 
+# Headline / primary text length limits per platform (see "Platform Requirements" in build_copy_prompt)
+PLATFORM_TEXT_LIMITS = {
+    "meta": {"headline": 40, "primary": 125},
+    "tiktok": {"headline": 80, "primary": 220},
+    "google": {"headline": 30, "primary": 90}
+}
+
+
 def fallback_text_generation(product, campaign_spec, variant: str) -> Tuple[str, str]:
     """
     Generate fallback text when LLM fails.
@@ -597,12 +1092,7 @@ def fallback_text_generation(product, campaign_spec, variant: str) -> Tuple[str,
             primary_text = f"{product.description[:100]}... Shop now and save! Only ${product.price:.2f}."
     
     # Ensure length constraints (platform-specific)
-    platform_max = {
-        "meta": {"headline": 40, "primary": 125},
-        "tiktok": {"headline": 80, "primary": 220},
-        "google": {"headline": 30, "primary": 90}
-    }
-    limits = platform_max.get(campaign_spec.platform, platform_max["meta"])
+    limits = PLATFORM_TEXT_LIMITS.get(campaign_spec.platform, PLATFORM_TEXT_LIMITS["meta"])
     
     if len(headline) > limits["headline"]:
         headline = headline[:limits["headline"]-3] + "..."
@@ -630,7 +1120,6 @@ def fallback_image_url(product) -> str:
     
     # Use deterministic placeholder based on product ID
     # This ensures the same product always gets the same placeholder image
-    import hashlib
     product_hash = hashlib.md5(product.product_id.encode()).hexdigest()[:8]
     
     # Use picsum.photos with seed for deterministic images
@@ -667,6 +1156,7 @@ The video should:
 Describe the video motion, camera movement, and visual effects in detail. Keep it under 200 characters."""
 
     # Try OpenAI first
+    load_openai_client()
     if openai_client:
         try:
             response = openai_client.chat.completions.create(
@@ -710,10 +1200,19 @@ def call_replicate_video(image_url: str, video_description: str) -> Optional[str
     Returns:
         Video URL or None if generation fails
     """
+    load_replicate_client()
     if not replicate_client:
         logger.warning("Replicate client not initialized, video generation disabled")
         return None
     
+    use_cache = settings.LLM_CACHE_ENABLED
+    cache_key = hash_key(f"{settings.REPLICATE_VIDEO_MODEL}|5s|{image_url}|{video_description}")
+    if use_cache:
+        cached = _MEDIA_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info("Replicate video served from cache")
+            return cached
+    
     try:
         logger.info(f"Generating video with Replicate Wan 2.5...")
         logger.info(f"Image URL: {image_url[:100]}...")
@@ -734,6 +1233,8 @@ def call_replicate_video(image_url: str, video_description: str) -> Optional[str
         if output:
             video_url = str(output) if not isinstance(output, str) else output
             logger.info(f"Video generated successfully: {video_url[:100]}...")
+            if use_cache:
+                _MEDIA_CACHE.set(cache_key, video_url)
             return video_url
         else:
             logger.error("Replicate returned empty output")
@@ -760,6 +1261,33 @@ def fallback_video_url(product) -> Optional[str]:
     return None
 
 
+# JSON Mode schema for generate_storyline replies
+STORYLINE_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "theme": {"type": "string"},
+        "style": {"type": "string"},
+        "total_duration": {"type": "integer"},
+        "num_segments": {"type": "integer"},
+        "segments": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "segment_id": {"type": "integer"},
+                    "duration": {"type": "integer"},
+                    "scene_description": {"type": "string"},
+                    "camera_movement": {"type": "string"},
+                    "focus": {"type": "string"},
+                    "text_overlay": {"type": "string"},
+                    "video_prompt": {"type": "string"}
+                }
+            }
+        }
+    }
+}
+
+
 def generate_storyline(
     product_title: str,
     product_description: str,
@@ -818,41 +1346,16 @@ Return valid JSON only (no markdown, no explanations):
 
     try:
         # Use call_gemini_text with JSON Mode enabled
-        response_schema = {
-            "type": "object",
-            "properties": {
-                "theme": {"type": "string"},
-                "style": {"type": "string"},
-                "total_duration": {"type": "integer"},
-                "num_segments": {"type": "integer"},
-                "segments": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "segment_id": {"type": "integer"},
-                            "duration": {"type": "integer"},
-                            "scene_description": {"type": "string"},
-                            "camera_movement": {"type": "string"},
-                            "focus": {"type": "string"},
-                            "text_overlay": {"type": "string"},
-                            "video_prompt": {"type": "string"}
-                        }
-                    }
-                }
-            }
-        }
-        
-        response = call_gemini_text(prompt, response_schema=response_schema)
+        response = call_gemini_text(prompt, response_schema=STORYLINE_RESPONSE_SCHEMA)
         if response:
-            storyline = json.loads(response)
+            storyline = orjson.loads(response)
             logger.info(f"[{request_id}] - Storyline generated successfully")
             return storyline
         
         logger.error(f"[{request_id}] - No LLM available for storyline generation")
         return None
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"[{request_id}] - Failed to parse storyline JSON: {e}")
         return None
     except Exception as e:
@@ -959,12 +1462,6 @@ def concatenate_videos(video_urls: List[str], output_path: str, request_id: str
     Returns:
         Output file path if successful, None otherwise
     """
-    import subprocess
-    import tempfile
-    import os
-    import shutil
-    import contextlib
-    
     logger.info(f"[{request_id}] - Concatenating {len(video_urls)} video segments")
     
     # Check if FFmpeg is available
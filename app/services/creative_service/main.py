@@ -9,8 +9,12 @@ This service generates creative content (text, images) for ad campaigns using:
 - A/B variant generation
 """
 
+import asyncio
+import os
+import tempfile
 from fastapi import FastAPI
-from typing import Union, Dict, Optional, List
+from fastapi.responses import ORJSONResponse
+from typing import Union, Dict, Optional, List, Tuple
 from datetime import datetime
 import uuid
 from app.common.middleware import setup_logging, RequestIDMiddleware, get_cors_middleware_class, get_logger
@@ -19,14 +23,19 @@ from app.common.exceptions import register_exception_handlers
 
 from .schemas import GenerateCreativesRequest, GenerateCreativesResponse, ABConfig
 from app.common.schemas import Creative, ErrorResponse
+from . import creative_utils
 from .creative_utils import (
     load_creative_policy,
     build_copy_prompt,
     build_image_prompt,
-    call_gemini_text,
+    build_creative_prompt,
+    call_gemini_text_async,
+    call_gemini_text_packed_async,
+    run_bounded,
     call_openai_image,
     call_gemini_image,
     parse_copy_response,
+    parse_creative_response,
     run_creative_qa,
     fallback_text_generation,
     fallback_image_url,
@@ -48,7 +57,8 @@ logger = get_logger(__name__)
 app = FastAPI(
     title="Creative Service",
     description="MCP microservice for generating ad creatives",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add middleware
@@ -59,6 +69,27 @@ cors_middleware(app)
 # Register exception handlers
 register_exception_handlers(app)
 
+# JSON schema for copy responses (JSON Mode)
+COPY_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "headline": {"type": "string"},
+        "primary_text": {"type": "string"}
+    },
+    "required": ["headline", "primary_text"]
+}
+
+# JSON schema for combined copy + image brief responses (JSON Mode)
+CREATIVE_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "headline": {"type": "string"},
+        "primary_text": {"type": "string"},
+        "image_prompt": {"type": "string"}
+    },
+    "required": ["headline", "primary_text", "image_prompt"]
+}
+
 
 @app.get("/health")
 async def health_check():
@@ -114,9 +145,9 @@ async def generate_creatives(request: GenerateCreativesRequest) -> Union[Generat
         
         # Step 4: Initialize debug info
         # Check LLM configuration status
-        import os
-        from app.common.config import settings
-        from app.services.creative_service.creative_utils import gemini_model, gemini_image_model
+        creative_utils.load_gemini_models()
+        gemini_model = creative_utils.gemini_model
+        gemini_image_model = creative_utils.gemini_image_model
         gemini_api_key = os.getenv("GEMINI_API_KEY", settings.GEMINI_API_KEY)
         gemini_model_name = settings.GEMINI_MODEL if gemini_api_key else None
         gemini_image_model_name = getattr(settings, 'GEMINI_IMAGE_MODEL', None) if gemini_api_key else None
@@ -149,6 +180,7 @@ async def generate_creatives(request: GenerateCreativesRequest) -> Union[Generat
                 "categories": list(policy.keys()) if policy else [],
                 "default_policy": policy.get("default", {}) if policy else {}
             },
+            "creative_prompts": [],
             "copy_prompts": [],
             "image_prompts": [],
             "raw_llm_responses": [],
@@ -162,339 +194,330 @@ async def generate_creatives(request: GenerateCreativesRequest) -> Union[Generat
         # Step 5: Generate creatives for each product
         variant_labels = ["A", "B", "C", "D", "E"][:variants_per_product]
         
-        for product in request.products:
-            # Check if we've reached max_creatives limit
-            if len(all_creatives) >= max_creatives:
-                logger.info(f"Reached max_creatives limit ({max_creatives}), stopping generation")
-                break
-            
-            logger.info(f"Processing product: {product.product_id} - {product.title}")
-            
-            # Generate variants for this product
-            variants = variant_labels[:variants_per_product]
-            
-            for variant in variants:
-                try:
-                    # Step 4a: Build prompts
-                    copy_prompt = build_copy_prompt(
-                        product,
-                        request.campaign_spec,
-                        policy,
-                        variant
-                    )
-                    image_prompt_prompt = build_image_prompt(
-                        product,
+        # Step 5a: Fetch copy and image briefs for every creative within max_creatives up front,
+        # several creatives per LLM request
+        planned = [
+            (product_index, variant)
+            for product_index in range(len(request.products))
+            for variant in variant_labels
+        ][:max_creatives]
+        planned_texts = await _generate_creative_texts(
+            [(request.products[product_index], variant) for product_index, variant in planned],
+            request.campaign_spec,
+            policy,
+            debug_info
+        )
+        creative_texts = dict(zip(planned, planned_texts))
+        
+        # Step 5b: Start image generation for every planned creative so the image
+        # requests overlap instead of running one variant at a time
+        image_tasks: Dict[Tuple[int, str], asyncio.Task] = {}
+        if enable_image_generation:
+            for (product_index, variant), (_, image_description) in creative_texts.items():
+                image_tasks[(product_index, variant)] = asyncio.ensure_future(_generate_image(
+                    image_description or _fallback_image_description(request.products[product_index], policy)
+                ))
+        
+        try:
+            for product_index, product in enumerate(request.products):
+                # Check if we've reached max_creatives limit
+                if len(all_creatives) >= max_creatives:
+                    logger.info(f"Reached max_creatives limit ({max_creatives}), stopping generation")
+                    break
+                
+                logger.info(f"Processing product: {product.product_id} - {product.title}")
+                
+                # Generate variants for this product (only as many as max_creatives still allows)
+                variants = variant_labels[:max_creatives - len(all_creatives)]
+                
+                # Room freed by a failed creative can reach variants that were not fetched up front
+                missing = [variant for variant in variants if (product_index, variant) not in creative_texts]
+                if missing:
+                    extra_texts = await _generate_creative_texts(
+                        [(product, variant) for variant in missing],
                         request.campaign_spec,
                         policy,
-                        variant
+                        debug_info
                     )
-                    
-                    debug_info["copy_prompts"].append({
-                        "product_id": product.product_id,
-                        "variant": variant,
-                        "prompt": copy_prompt
-                    })
-                    debug_info["image_prompts"].append({
-                        "product_id": product.product_id,
-                        "variant": variant,
-                        "prompt": image_prompt_prompt
-                    })
-                    
-                    # Step 4b: Call LLM for copy with JSON Mode for structured output
-                    logger.debug(f"Calling LLM for copy generation (variant {variant})")
-                    debug_info["execution_steps"].append({
-                        "step": "call_llm_copy",
-                        "product_id": product.product_id,
-                        "variant": variant,
-                        "prompt_length": len(copy_prompt),
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    
-                    # Define JSON schema for copy response (JSON Mode)
-                    copy_schema = {
-                        "type": "object",
-                        "properties": {
-                            "headline": {"type": "string"},
-                            "primary_text": {"type": "string"}
-                        },
-                        "required": ["headline", "primary_text"]
-                    }
-                    copy_response = call_gemini_text(copy_prompt, response_schema=copy_schema)
-                    copy_llm_success = copy_response is not None and len(copy_response) > 0
-                    
-                    debug_info["raw_llm_responses"].append({
-                        "product_id": product.product_id,
-                        "variant": variant,
-                        "type": "copy",
-                        "llm_call_success": copy_llm_success,
-                        "response": copy_response,
-                        "response_length": len(copy_response) if copy_response else 0,
-                        "error": None if copy_llm_success else "LLM returned None or empty response"
-                    })
-                    
-                    # Parse copy response
-                    logger.debug(f"Parsing copy response for variant {variant}")
-                    headline, primary_text = parse_copy_response(copy_response)
-                    parse_success = headline is not None and primary_text is not None
-                    
-                    debug_info["execution_steps"].append({
-                        "step": "parse_copy_response",
-                        "product_id": product.product_id,
-                        "variant": variant,
-                        "parse_success": parse_success,
-                        "headline": headline,
-                        "primary_text": primary_text[:50] + "..." if primary_text and len(primary_text) > 50 else primary_text,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    
-                    # Fallback if LLM failed
-                    if not headline or not primary_text:
-                        logger.warning(f"LLM copy generation failed for variant {variant}, using fallback")
-                        debug_info["execution_steps"].append({
-                            "step": "fallback_copy",
+                    creative_texts.update(zip([(product_index, variant) for variant in missing], extra_texts))
+                    if enable_image_generation:
+                        for variant, (_, image_description) in zip(missing, extra_texts):
+                            image_tasks[(product_index, variant)] = asyncio.ensure_future(_generate_image(
+                                image_description or _fallback_image_description(product, policy)
+                            ))
+                
+                for variant in variants:
+                    copy_response, image_description = creative_texts[(product_index, variant)]
+                    try:
+                        copy_llm_success = copy_response is not None and len(copy_response) > 0
+                        
+                        debug_info["raw_llm_responses"].append({
                             "product_id": product.product_id,
                             "variant": variant,
-                            "reason": "LLM response parsing failed or empty",
-                            "timestamp": datetime.now().isoformat()
+                            "type": "copy",
+                            "llm_call_success": copy_llm_success,
+                            "response": copy_response,
+                            "response_length": len(copy_response) if copy_response else 0,
+                            "error": None if copy_llm_success else "LLM returned None or empty response"
                         })
-                        headline, primary_text = fallback_text_generation(
-                            product,
-                            request.campaign_spec,
-                            variant
-                        )
-                    
-                    # Step 4c: Call LLM for image prompt
-                    logger.debug(f"Calling LLM for image prompt generation (variant {variant})")
-                    debug_info["execution_steps"].append({
-                        "step": "call_llm_image_prompt",
-                        "product_id": product.product_id,
-                        "variant": variant,
-                        "prompt_length": len(image_prompt_prompt),
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    
-                    image_description = call_gemini_text(image_prompt_prompt)
-                    image_description_success = image_description is not None and len(image_description) > 0
-                    
-                    debug_info["raw_llm_responses"].append({
-                        "product_id": product.product_id,
-                        "variant": variant,
-                        "type": "image_prompt",
-                        "llm_call_success": image_description_success,
-                        "response": image_description,
-                        "response_length": len(image_description) if image_description else 0,
-                        "error": None if image_description_success else "LLM returned None or empty response"
-                    })
-                    
-                    if not image_description:
-                        logger.warning(f"LLM image prompt generation failed for variant {variant}, using fallback")
+                        
+                        # Parse copy response
+                        logger.debug(f"Parsing copy response for variant {variant}")
+                        headline, primary_text = parse_copy_response(copy_response)
+                        parse_success = headline is not None and primary_text is not None
+                        
                         debug_info["execution_steps"].append({
-                            "step": "fallback_image_prompt",
+                            "step": "parse_copy_response",
                             "product_id": product.product_id,
                             "variant": variant,
-                            "reason": "LLM returned None or empty response",
+                            "parse_success": parse_success,
+                            "headline": headline,
+                            "primary_text": primary_text[:50] + "..." if primary_text and len(primary_text) > 50 else primary_text,
                             "timestamp": datetime.now().isoformat()
                         })
-                        image_description = f"Professional product photography of {product.title}, {get_policy_for_category(product.category, policy).get('visual_style', 'clean')} style"
-                    
-                    # Step 4d: Optionally call image generator
-                    if enable_image_generation:
-                        logger.debug(f"Calling image generator for variant {variant}")
                         
-                        # Try OpenAI DALL-E 3 first
-                        image_url = call_openai_image(image_description)
+                        # Fallback if LLM failed
+                        if not headline or not primary_text:
+                            logger.warning(f"LLM copy generation failed for variant {variant}, using fallback")
+                            debug_info["execution_steps"].append({
+                                "step": "fallback_copy",
+                                "product_id": product.product_id,
+                                "variant": variant,
+                                "reason": "LLM response parsing failed or empty",
+                                "timestamp": datetime.now().isoformat()
+                            })
+                            headline, primary_text = fallback_text_generation(
+                                product,
+                                request.campaign_spec,
+                                variant
+                            )
+                        
+                        # Step 4c: Use the LLM image prompt
+                        image_description_success = image_description is not None and len(image_description) > 0
                         
-                        # Fallback to Gemini if DALL-E fails
-                        if not image_url:
-                            logger.debug(f"DALL-E 3 failed, trying Gemini")
-                            image_url = call_gemini_image(image_description)
+                        debug_info["raw_llm_responses"].append({
+                            "product_id": product.product_id,
+                            "variant": variant,
+                            "type": "image_prompt",
+                            "llm_call_success": image_description_success,
+                            "response": image_description,
+                            "response_length": len(image_description) if image_description else 0,
+                            "error": None if image_description_success else "LLM returned None or empty response"
+                        })
                         
-                        image_generator_success = image_url is not None and len(image_url) > 0
+                        if not image_description:
+                            logger.warning(f"LLM image prompt generation failed for variant {variant}, using fallback")
+                            debug_info["execution_steps"].append({
+                                "step": "fallback_image_prompt",
+                                "product_id": product.product_id,
+                                "variant": variant,
+                                "reason": "LLM returned None or empty response",
+                                "timestamp": datetime.now().isoformat()
+                            })
+                            image_description = _fallback_image_description(product, policy)
                         
-                        if not image_url:
-                            logger.debug(f"All image generators failed for variant {variant}, using fallback")
+                        # Step 4d: Optionally call image generator (started in step 5b)
+                        if enable_image_generation:
+                            logger.debug(f"Waiting for image generator for variant {variant}")
+                            image_url = await image_tasks.pop((product_index, variant))
+                            
+                            image_generator_success = image_url is not None and len(image_url) > 0
+                            
+                            if not image_url:
+                                logger.debug(f"All image generators failed for variant {variant}, using fallback")
+                                image_url = fallback_image_url(product)
+                        else:
+                            logger.debug(f"Image generation disabled, using fallback")
                             image_url = fallback_image_url(product)
-                    else:
-                        logger.debug(f"Image generation disabled, using fallback")
-                        image_url = fallback_image_url(product)
-                        image_generator_success = False
-                    
-                    # Record image generation debug info
-                    debug_info["image_generation"].append({
-                        "product_id": product.product_id,
-                        "variant": variant,
-                        "image_prompt_llm_success": image_description_success,
-                        "image_description": image_description,
-                        "image_generator_success": image_generator_success,
-                        "final_image_url": image_url,
-                        "used_fallback": not image_generator_success
-                    })
-                    
-                    # Step 4d-2: Optionally generate video from image
-                    video_url = None
-                    storyline = None
-                    product_image_url = None
-                    video_segments = None
-                    final_video_url = None
-                    
-                    enable_storyline_video = ab_config.enable_storyline_video
-                    enable_video_generation = ab_config.enable_video_generation
-                    
-                    if enable_storyline_video:
-                        # New: Storyline-based multi-segment video generation
-                        logger.info(f"Generating storyline-based video for variant {variant}")
-                        request_id = f"{product.product_id}_{variant}"
+                            image_generator_success = False
                         
-                        try:
-                            # Step 1: Generate storyline
-                            storyline = generate_storyline(
-                                product_title=product.title,
-                                product_description=product.description,
-                                category=product.category,
-                                platform=request.campaign_spec.platform,
-                                objective=request.campaign_spec.objective,
-                                num_segments=ab_config.num_video_segments,
-                                request_id=request_id
-                            )
+                        # Record image generation debug info
+                        debug_info["image_generation"].append({
+                            "product_id": product.product_id,
+                            "variant": variant,
+                            "image_prompt_llm_success": image_description_success,
+                            "image_description": image_description,
+                            "image_generator_success": image_generator_success,
+                            "final_image_url": image_url,
+                            "used_fallback": not image_generator_success
+                        })
+                        
+                        # Step 4d-2: Optionally generate video from image
+                        video_url = None
+                        storyline = None
+                        product_image_url = None
+                        video_segments = None
+                        final_video_url = None
+                        
+                        enable_storyline_video = ab_config.enable_storyline_video
+                        enable_video_generation = ab_config.enable_video_generation
+                        
+                        if enable_storyline_video:
+                            # New: Storyline-based multi-segment video generation
+                            logger.info(f"Generating storyline-based video for variant {variant}")
+                            request_id = f"{product.product_id}_{variant}"
                             
-                            if storyline:
-                                # Step 2: Generate lifestyle product image (with person)
-                                lifestyle_prompt = generate_lifestyle_product_image_prompt(
+                            try:
+                                # Step 1: Generate storyline
+                                storyline = await run_bounded(
+                                    generate_storyline,
                                     product_title=product.title,
                                     product_description=product.description,
                                     category=product.category,
-                                    storyline_style=storyline.get('style', 'minimalist_modern'),
+                                    platform=request.campaign_spec.platform,
+                                    objective=request.campaign_spec.objective,
+                                    num_segments=ab_config.num_video_segments,
                                     request_id=request_id
                                 )
                                 
-                                product_image_url = call_openai_image(lifestyle_prompt)
-                                
-                                if product_image_url:
-                                    # Step 3: Generate video segments
-                                    video_segments = generate_video_segments(
-                                        image_url=product_image_url,
-                                        storyline=storyline,
+                                if storyline:
+                                    # Step 2: Generate lifestyle product image (with person)
+                                    lifestyle_prompt = generate_lifestyle_product_image_prompt(
+                                        product_title=product.title,
+                                        product_description=product.description,
+                                        category=product.category,
+                                        storyline_style=storyline.get('style', 'minimalist_modern'),
                                         request_id=request_id
                                     )
                                     
-                                    # Check if all segments were generated
-                                    if video_segments and all(url is not None for url in video_segments):
-                                        # Step 4: Concatenate videos
-                                        import tempfile
-                                        output_path = tempfile.mktemp(suffix=".mp4")
-                                        
-                                        final_video_path = concatenate_videos(
-                                            video_urls=video_segments,
-                                            output_path=output_path,
+                                    product_image_url = await run_bounded(call_openai_image, lifestyle_prompt)
+                                    
+                                    if product_image_url:
+                                        # Step 3: Generate video segments
+                                        video_segments = await run_bounded(
+                                            generate_video_segments,
+                                            image_url=product_image_url,
+                                            storyline=storyline,
                                             request_id=request_id
                                         )
                                         
-                                        if final_video_path:
-                                            # TODO: Upload to cloud storage and get public URL
-                                            # For now, use the first segment URL as placeholder
-                                            final_video_url = video_segments[0]
-                                            logger.info(f"[{request_id}] - Storyline video generation completed!")
+                                        # Check if all segments were generated
+                                        if video_segments and all(url is not None for url in video_segments):
+                                            # Step 4: Concatenate videos
+                                            output_path = tempfile.mktemp(suffix=".mp4")
+                                            
+                                            final_video_path = await run_bounded(
+                                                concatenate_videos,
+                                                video_urls=video_segments,
+                                                output_path=output_path,
+                                                request_id=request_id
+                                            )
+                                            
+                                            if final_video_path:
+                                                # TODO: Upload to cloud storage and get public URL
+                                                # For now, use the first segment URL as placeholder
+                                                final_video_url = video_segments[0]
+                                                logger.info(f"[{request_id}] - Storyline video generation completed!")
+                                            else:
+                                                logger.error(f"[{request_id}] - Failed to concatenate videos")
                                         else:
-                                            logger.error(f"[{request_id}] - Failed to concatenate videos")
+                                            logger.error(f"[{request_id}] - Not all video segments generated successfully")
                                     else:
-                                        logger.error(f"[{request_id}] - Not all video segments generated successfully")
+                                        logger.error(f"[{request_id}] - Failed to generate product image")
                                 else:
-                                    logger.error(f"[{request_id}] - Failed to generate product image")
-                            else:
-                                logger.error(f"[{request_id}] - Failed to generate storyline")
-                                
-                        except Exception as e:
-                            logger.error(f"[{request_id}] - Storyline video generation failed: {e}")
+                                    logger.error(f"[{request_id}] - Failed to generate storyline")
+                                    
+                            except Exception as e:
+                                logger.error(f"[{request_id}] - Storyline video generation failed: {e}")
+                            
+                            # Use final_video_url as video_url for backward compatibility
+                            video_url = final_video_url
+                            
+                            debug_info["storyline_video_generation"] = debug_info.get("storyline_video_generation", [])
+                            debug_info["storyline_video_generation"].append({
+                                "product_id": product.product_id,
+                                "variant": variant,
+                                "storyline": storyline,
+                                "product_image_url": product_image_url,
+                                "num_segments": len(video_segments) if video_segments else 0,
+                                "video_segments": video_segments,
+                                "final_video_url": final_video_url,
+                                "success": final_video_url is not None
+                            })
+                            
+                        elif enable_video_generation and image_url and image_generator_success:
+                            # Old: Single video generation from image
+                            logger.debug(f"Generating single video for variant {variant}")
+                            
+                            # Generate video description
+                            video_description = await run_bounded(
+                                generate_video_description, product, request.campaign_spec, variant
+                            )
+                            
+                            # Generate video from image
+                            try:
+                                video_url = await run_bounded(call_replicate_video, image_url, video_description)
+                                video_generator_success = video_url is not None
+                            except Exception as e:
+                                logger.error(f"Video generation failed: {e}")
+                                video_url = fallback_video_url(product)
+                                video_generator_success = False
+                            
+                            debug_info["video_generation"] = debug_info.get("video_generation", [])
+                            debug_info["video_generation"].append({
+                                "product_id": product.product_id,
+                                "variant": variant,
+                                "video_description": video_description,
+                                "video_generator_success": video_generator_success,
+                                "final_video_url": video_url,
+                                "used_fallback": not video_generator_success
+                            })
                         
-                        # Use final_video_url as video_url for backward compatibility
-                        video_url = final_video_url
+                        # Step 4e: Assemble Creative object
+                        creative = Creative(
+                            creative_id=str(uuid.uuid4()),
+                            product_id=product.product_id,
+                            platform=request.campaign_spec.platform,
+                            variant_id=variant,
+                            primary_text=primary_text,
+                            headline=headline,
+                            image_url=image_url,
+                            video_url=video_url,
+                            # Storyline-based video fields
+                            storyline=storyline,
+                            product_image_url=product_image_url,
+                            video_segments=video_segments,
+                            final_video_url=final_video_url,
+                            style_profile=get_policy_for_category(product.category, policy),
+                            ab_group="control" if variant == "A" else "variant"
+                        )
                         
-                        debug_info["storyline_video_generation"] = debug_info.get("storyline_video_generation", [])
-                        debug_info["storyline_video_generation"].append({
+                        # Step 4f: QA checks
+                        is_valid, issues = run_creative_qa(creative)
+                        debug_info["qa_results"].append({
                             "product_id": product.product_id,
                             "variant": variant,
-                            "storyline": storyline,
-                            "product_image_url": product_image_url,
-                            "num_segments": len(video_segments) if video_segments else 0,
-                            "video_segments": video_segments,
-                            "final_video_url": final_video_url,
-                            "success": final_video_url is not None
+                            "is_valid": is_valid,
+                            "issues": issues
                         })
                         
-                    elif enable_video_generation and image_url and image_generator_success:
-                        # Old: Single video generation from image
-                        logger.debug(f"Generating single video for variant {variant}")
+                        if not is_valid:
+                            logger.warning(f"QA issues for variant {variant}: {issues}")
+                            # Continue anyway, but log the issues
                         
-                        # Generate video description
-                        video_description = generate_video_description(product, request.campaign_spec, variant)
+                        all_creatives.append(creative)
+                        logger.info(f"Generated creative {creative.creative_id} for variant {variant}")
                         
-                        # Generate video from image
-                        try:
-                            video_url = call_replicate_video(image_url, video_description)
-                            video_generator_success = video_url is not None
-                        except Exception as e:
-                            logger.error(f"Video generation failed: {e}")
-                            video_url = fallback_video_url(product)
-                            video_generator_success = False
+                        # Check if we've reached max_creatives limit
+                        if len(all_creatives) >= max_creatives:
+                            logger.info(f"Reached max_creatives limit ({max_creatives})")
+                            break
                         
-                        debug_info["video_generation"] = debug_info.get("video_generation", [])
-                        debug_info["video_generation"].append({
-                            "product_id": product.product_id,
-                            "variant": variant,
-                            "video_description": video_description,
-                            "video_generator_success": video_generator_success,
-                            "final_video_url": video_url,
-                            "used_fallback": not video_generator_success
-                        })
-                    
-                    # Step 4e: Assemble Creative object
-                    creative = Creative(
-                        creative_id=str(uuid.uuid4()),
-                        product_id=product.product_id,
-                        platform=request.campaign_spec.platform,
-                        variant_id=variant,
-                        primary_text=primary_text,
-                        headline=headline,
-                        image_url=image_url,
-                        video_url=video_url,
-                        # Storyline-based video fields
-                        storyline=storyline,
-                        product_image_url=product_image_url,
-                        video_segments=video_segments,
-                        final_video_url=final_video_url,
-                        style_profile=get_policy_for_category(product.category, policy),
-                        ab_group="control" if variant == "A" else "variant"
-                    )
-                    
-                    # Step 4f: QA checks
-                    is_valid, issues = run_creative_qa(creative)
-                    debug_info["qa_results"].append({
-                        "product_id": product.product_id,
-                        "variant": variant,
-                        "is_valid": is_valid,
-                        "issues": issues
-                    })
-                    
-                    if not is_valid:
-                        logger.warning(f"QA issues for variant {variant}: {issues}")
-                        # Continue anyway, but log the issues
-                    
-                    all_creatives.append(creative)
-                    logger.info(f"Generated creative {creative.creative_id} for variant {variant}")
-                    
-                    # Check if we've reached max_creatives limit
-                    if len(all_creatives) >= max_creatives:
-                        logger.info(f"Reached max_creatives limit ({max_creatives})")
-                        break
-                    
-                except Exception as e:
-                    logger.error(f"Error generating creative for variant {variant}: {e}", exc_info=True)
-                    # Continue with next variant
-                    continue
-            
-            # Break outer loop if we've reached max_creatives
-            if len(all_creatives) >= max_creatives:
-                break
+                    except Exception as e:
+                        logger.error(f"Error generating creative for variant {variant}: {e}", exc_info=True)
+                        # Continue with next variant
+                        continue
+                
+                # Break outer loop if we've reached max_creatives
+                if len(all_creatives) >= max_creatives:
+                    break
+        finally:
+            # Images for creatives that were never built (max_creatives reached, or an
+            # error escaped the loop) are not needed. Cancelling only stops tasks still
+            # waiting for a run_bounded slot; a provider call already running in its
+            # worker thread completes (and is billed) regardless.
+            for task in image_tasks.values():
+                task.cancel()
         
         # Step 6: Check if we have any creatives
         if not all_creatives:
@@ -564,6 +587,144 @@ async def generate_creatives(request: GenerateCreativesRequest) -> Union[Generat
         )
 
 
+def _fallback_image_description(product, policy: Dict) -> str:
+    """Image prompt used when the LLM returned none."""
+    visual_style = get_policy_for_category(product.category, policy).get('visual_style', 'clean')
+    return f"Professional product photography of {product.title}, {visual_style} style"
+
+
+async def _generate_image(image_description: str) -> Optional[str]:
+    """
+    Generate an image with DALL-E 3, falling back to Gemini.
+    
+    Returns:
+        Image URL or None if both generators failed
+    """
+    # Try OpenAI DALL-E 3 first
+    image_url = await run_bounded(call_openai_image, image_description)
+    
+    # Fallback to Gemini if DALL-E fails
+    if not image_url:
+        logger.debug("DALL-E 3 failed, trying Gemini")
+        image_url = await run_bounded(call_gemini_image, image_description)
+    return image_url
+
+
+async def _generate_creative_texts(
+    pairs: List[Tuple],
+    campaign_spec,
+    policy: Dict,
+    debug_info: Dict
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Generate copy and image briefs for (product, variant) pairs.
+    
+    Each pair gets one combined prompt, and the prompts are packed several per
+    LLM request. Pairs without a complete combined response fall back to
+    separate copy and image prompts.
+    
+    Returns:
+        (copy_response, image_description) per pair, in order
+    """
+    creative_prompts = []
+    for product, variant in pairs:
+        creative_prompt = build_creative_prompt(product, campaign_spec, policy, variant)
+        creative_prompts.append(creative_prompt)
+        
+        debug_info["creative_prompts"].append({
+            "product_id": product.product_id,
+            "variant": variant,
+            "prompt": creative_prompt
+        })
+        debug_info["execution_steps"].append({
+            "step": "call_llm_creative",
+            "product_id": product.product_id,
+            "variant": variant,
+            "prompt_length": len(creative_prompt),
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    logger.debug(f"Calling LLM for copy and image briefs ({len(pairs)} creatives)")
+    creative_responses = await call_gemini_text_packed_async(creative_prompts, CREATIVE_RESPONSE_SCHEMA)
+    
+    texts = []
+    incomplete = []
+    for index, creative_response in enumerate(creative_responses):
+        parsed = parse_creative_response(creative_response)
+        texts.append((creative_response, parsed["image_prompt"] if parsed else None))
+        if parsed is None:
+            incomplete.append(index)
+    
+    if incomplete:
+        fallback_texts = await _generate_copy_and_image_prompts(
+            [pairs[index] for index in incomplete],
+            campaign_spec,
+            policy,
+            debug_info
+        )
+        for index, text in zip(incomplete, fallback_texts):
+            texts[index] = text
+    return texts
+
+
+async def _generate_copy_and_image_prompts(
+    pairs: List[Tuple],
+    campaign_spec,
+    policy: Dict,
+    debug_info: Dict
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Generate copy and image prompts for (product, variant) pairs with separate LLM calls.
+    
+    Fallback for pairs whose combined creative response was unusable.
+    
+    Returns:
+        (copy_response, image_description) per pair, in order
+    """
+    copy_prompts = []
+    image_prompts = []
+    for product, variant in pairs:
+        copy_prompt = build_copy_prompt(product, campaign_spec, policy, variant)
+        image_prompt_prompt = build_image_prompt(product, campaign_spec, policy, variant)
+        copy_prompts.append(copy_prompt)
+        image_prompts.append(image_prompt_prompt)
+        
+        debug_info["copy_prompts"].append({
+            "product_id": product.product_id,
+            "variant": variant,
+            "prompt": copy_prompt
+        })
+        debug_info["image_prompts"].append({
+            "product_id": product.product_id,
+            "variant": variant,
+            "prompt": image_prompt_prompt
+        })
+        debug_info["execution_steps"].append({
+            "step": "call_llm_copy",
+            "product_id": product.product_id,
+            "variant": variant,
+            "prompt_length": len(copy_prompt),
+            "timestamp": datetime.now().isoformat()
+        })
+        debug_info["execution_steps"].append({
+            "step": "call_llm_image_prompt",
+            "product_id": product.product_id,
+            "variant": variant,
+            "prompt_length": len(image_prompt_prompt),
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    logger.debug(f"Calling LLM for separate copy and image prompts ({len(pairs)} creatives)")
+    copy_responses, image_descriptions = await asyncio.gather(
+        asyncio.gather(*(
+            call_gemini_text_async(prompt, response_schema=COPY_RESPONSE_SCHEMA)
+            for prompt in copy_prompts
+        )),
+        asyncio.gather(*(call_gemini_text_async(prompt) for prompt in image_prompts))
+    )
+    return list(zip(copy_responses, image_descriptions))
+
+
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    from app.common.server import run_server
+    run_server(app, port=8002)
@@ -6,12 +6,13 @@ Configures JSON-structured rotating file logs.
 
 import logging
 import logging.handlers
-import json
 import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict
 
+import orjson
+
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
@@ -32,7 +33,7 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
         
-        return json.dumps(log_data, ensure_ascii=False)
+        return orjson.dumps(log_data, default=str).decode()
 
 
 def setup_file_logging(log_file_path: str = "logs/logs_service.log") -> logging.Logger:
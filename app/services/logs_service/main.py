@@ -8,7 +8,8 @@ This service implements real logging infrastructure with:
 """
 
 from fastapi import FastAPI, Query, HTTPException
-from typing import Optional, Union
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional, Union
 from datetime import datetime
 from app.common.middleware import setup_logging, RequestIDMiddleware, get_cors_middleware_class, get_logger
 from app.common.config import settings
@@ -16,7 +17,13 @@ from app.common.exceptions import register_exception_handlers, ServiceException
 from app.common.schemas import ErrorResponse
 from app.common.db import init_db, is_db_available, create_tables
 
-from .schemas import AppendEventRequest, AppendEventResponse, QueryLogsResponse, AnalyticsResponse
+from .schemas import (
+    AppendEventRequest,
+    AppendEventResponse,
+    AppendEventsBatchResponse,
+    QueryLogsResponse,
+    AnalyticsResponse
+)
 from .repository import LogEventRepository
 from .logger_config import setup_file_logging, log_event_to_file
 
@@ -40,7 +47,8 @@ else:
 app = FastAPI(
     title="Logs Service",
     description="MCP microservice for event logging and auditing",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add middleware
@@ -62,6 +70,83 @@ async def health_check():
     }
 
 
+def _store_event(request: AppendEventRequest) -> Optional[str]:
+    """
+    Persist a single event to the database (if available) and the log file.
+    
+    Args:
+        request: Event data to log (LogEvent format)
+        
+    Returns:
+        Database event ID, or None when running file-only
+    """
+    # Parse timestamp
+    try:
+        event_timestamp = datetime.fromisoformat(request.timestamp.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        event_timestamp = datetime.utcnow()
+        logger.warning(f"Invalid timestamp format, using current time: {request.timestamp}")
+    
+    # Determine log level from success flag
+    level = "INFO" if request.success else "ERROR"
+    
+    # Merge context (request, response, metadata)
+    context = {}
+    if request.request:
+        context["request"] = request.request
+    if request.response:
+        context["response"] = request.response
+    if request.metadata:
+        context["metadata"] = request.metadata
+    
+    # Extract message from context or use default
+    message = "Event logged"
+    if request.metadata and "message" in request.metadata:
+        message = request.metadata["message"]
+    elif request.response and "message" in request.response:
+        message = request.response["message"]
+    
+    # Extract correlation_id from metadata if present
+    correlation_id = None
+    if request.metadata and "correlation_id" in request.metadata:
+        correlation_id = request.metadata["correlation_id"]
+    elif request.metadata and "request_id" in request.metadata:
+        correlation_id = request.metadata["request_id"]
+    
+    # Write to database
+    event_id = None
+    if is_db_available():
+        event_id = LogEventRepository.create_log_event(
+            timestamp=event_timestamp,
+            stage=request.stage,
+            service=request.service,
+            level=level,
+            message=message,
+            context=context,
+            correlation_id=correlation_id,
+            success=request.success
+        )
+    
+    # Write to file
+    log_event_to_file(
+        logger=file_logger,
+        timestamp=request.timestamp,
+        stage=request.stage,
+        service=request.service,
+        level=level,
+        message=message,
+        context=context,
+        correlation_id=correlation_id
+    )
+    
+    logger.info(
+        f"Logged event: stage={request.stage}, service={request.service}, "
+        f"success={request.success}, event_id={event_id}"
+    )
+    
+    return event_id
+
+
 @app.post("/append_event", response_model=Union[AppendEventResponse, ErrorResponse])
 async def append_event(request: AppendEventRequest) -> Union[AppendEventResponse, ErrorResponse]:
     """
@@ -79,69 +164,7 @@ async def append_event(request: AppendEventRequest) -> Union[AppendEventResponse
         Event ID and status
     """
     try:
-        # Parse timestamp
-        try:
-            event_timestamp = datetime.fromisoformat(request.timestamp.replace('Z', '+00:00'))
-        except (ValueError, AttributeError):
-            event_timestamp = datetime.utcnow()
-            logger.warning(f"Invalid timestamp format, using current time: {request.timestamp}")
-        
-        # Determine log level from success flag
-        level = "INFO" if request.success else "ERROR"
-        
-        # Merge context (request, response, metadata)
-        context = {}
-        if request.request:
-            context["request"] = request.request
-        if request.response:
-            context["response"] = request.response
-        if request.metadata:
-            context["metadata"] = request.metadata
-        
-        # Extract message from context or use default
-        message = "Event logged"
-        if request.metadata and "message" in request.metadata:
-            message = request.metadata["message"]
-        elif request.response and "message" in request.response:
-            message = request.response["message"]
-        
-        # Extract correlation_id from metadata if present
-        correlation_id = None
-        if request.metadata and "correlation_id" in request.metadata:
-            correlation_id = request.metadata["correlation_id"]
-        elif request.metadata and "request_id" in request.metadata:
-            correlation_id = request.metadata["request_id"]
-        
-        # Write to database
-        event_id = None
-        if is_db_available():
-            event_id = LogEventRepository.create_log_event(
-                timestamp=event_timestamp,
-                stage=request.stage,
-                service=request.service,
-                level=level,
-                message=message,
-                context=context,
-                correlation_id=correlation_id,
-                success=request.success
-            )
-        
-        # Write to file
-        log_event_to_file(
-            logger=file_logger,
-            timestamp=request.timestamp,
-            stage=request.stage,
-            service=request.service,
-            level=level,
-            message=message,
-            context=context,
-            correlation_id=correlation_id
-        )
-        
-        logger.info(
-            f"Logged event: stage={request.stage}, service={request.service}, "
-            f"success={request.success}, event_id={event_id}"
-        )
+        event_id = _store_event(request)
         
         return AppendEventResponse(
             status="success",
@@ -158,6 +181,40 @@ async def append_event(request: AppendEventRequest) -> Union[AppendEventResponse
         )
 
 
+@app.post("/append_events_batch", response_model=AppendEventsBatchResponse)
+async def append_events_batch(events: List[AppendEventRequest]) -> AppendEventsBatchResponse:
+    """
+    Append several events in one request.
+    
+    Used by the orchestrator's batching LogsClient. The whole batch is
+    validated first: an event missing required fields rejects the request
+    with 422. Valid events are stored independently, so a storage failure
+    for one event does not drop the rest of the batch.
+    
+    Args:
+        events: Events to log (LogEvent format)
+        
+    Returns:
+        Per-event IDs (None for failed or file-only events) and a failure count
+    """
+    event_ids: List[Optional[str]] = []
+    failed = 0
+    
+    for event in events:
+        try:
+            event_ids.append(_store_event(event) or event.event_id)
+        except Exception as e:
+            logger.error(f"Error appending event in batch: {e}", exc_info=True)
+            event_ids.append(None)
+            failed += 1
+    
+    return AppendEventsBatchResponse(
+        status="success" if failed == 0 else "partial",
+        event_ids=event_ids,
+        failed=failed
+    )
+
+
 @app.get("/logs", response_model=Union[QueryLogsResponse, ErrorResponse])
 async def query_logs(
     stage: Optional[str] = Query(None, description="Filter by workflow stage"),
@@ -279,5 +336,5 @@ async def get_analytics() -> Union[AnalyticsResponse, ErrorResponse]:
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8005)
+    from app.common.server import run_server
+    run_server(app, port=8005)
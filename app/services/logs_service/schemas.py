@@ -26,6 +26,13 @@ class AppendEventResponse(BaseModel):
     event_id: Optional[str] = Field(None, description="Event ID if created")
 
 
+class AppendEventsBatchResponse(BaseModel):
+    """Response after appending a batch of events."""
+    status: str = Field(..., description="Operation status (success or partial)")
+    event_ids: List[Optional[str]] = Field(default_factory=list, description="Event IDs in request order")
+    failed: int = Field(0, description="Number of events that could not be stored")
+
+
 class QueryLogsResponse(BaseModel):
     """Response for log query."""
     status: str = Field(..., description="Operation status")
@@ -5,6 +5,7 @@ This service handles campaign creation and management on Meta platforms.
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from app.common.middleware import setup_logging, RequestIDMiddleware, get_cors_middleware_class, get_logger
 from app.common.config import settings
 from app.common.exceptions import register_exception_handlers
@@ -20,7 +21,8 @@ logger = get_logger(__name__)
 app = FastAPI(
     title="Meta Service",
     description="MCP microservice for Meta platform integration",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add middleware
@@ -69,5 +71,5 @@ async def create_campaign(request: CreateCampaignRequest):
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8004)
+    from app.common.server import run_server
+    run_server(app, port=8004)
@@ -6,6 +6,7 @@ to improve ROI and achieve campaign objectives.
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from app.common.middleware import setup_logging, RequestIDMiddleware, get_cors_middleware_class, get_logger
 from app.common.config import settings
 from app.common.exceptions import register_exception_handlers
@@ -21,7 +22,8 @@ logger = get_logger(__name__)
 app = FastAPI(
     title="Optimizer Service",
     description="MCP microservice for campaign optimization",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add middleware
@@ -69,5 +71,5 @@ async def summarize_recent_runs(request: SummarizeRecentRunsRequest):
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8007)
+    from app.common.server import run_server
+    run_server(app, port=8007)
@@ -9,6 +9,7 @@ This service implements real product selection logic including:
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from typing import Union
 from app.common.middleware import setup_logging, RequestIDMiddleware, get_cors_middleware_class, get_logger
 from app.common.config import settings
@@ -40,7 +41,8 @@ else:
 app = FastAPI(
     title="Product Service",
     description="MCP microservice for product selection in ad campaigns",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add middleware
@@ -251,5 +253,5 @@ async def select_products(request: SelectProductsRequest) -> Union[SelectProduct
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    from app.common.server import run_server
+    run_server(app, port=8001)
@@ -8,6 +8,7 @@ This service implements real strategy generation logic including:
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from typing import Union
 from app.common.middleware import setup_logging, RequestIDMiddleware, get_cors_middleware_class, get_logger
 from app.common.config import settings
@@ -35,7 +36,8 @@ logger = get_logger(__name__)
 app = FastAPI(
     title="Strategy Service",
     description="MCP microservice for generating campaign strategies",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add middleware
@@ -370,5 +372,5 @@ async def generate_strategy(request: GenerateStrategyRequest) -> Union[GenerateS
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8003)
+    from app.common.server import run_server
+    run_server(app, port=8003)
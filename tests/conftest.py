@@ -9,7 +9,7 @@ This module provides:
 
 import pytest
 import os
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from fastapi.testclient import TestClient
 from app.common.schemas import (
     CampaignSpec,
@@ -430,6 +430,14 @@ def mock_httpx_client():
         yield mock_instance
 
 
+@pytest.fixture
+def mock_orchestrator_post():
+    """Mock the simple orchestrator's pooled HTTP client; yields its async post()."""
+    with patch('app.orchestrator.simple_service.get_async_client') as mock_get_client:
+        mock_get_client.return_value.post = AsyncMock()
+        yield mock_get_client.return_value.post
+
+
 @pytest.fixture
 def mock_llm_generate():
     """Mock LLM generation for orchestrator."""
@@ -461,3 +469,14 @@ def disable_external_apis(monkeypatch):
     # Disable Meta API key
     monkeypatch.setenv("META_ACCESS_TOKEN", "")
     yield
+
+
+@pytest.fixture(autouse=True)
+def clear_generation_caches():
+    """Start every test without cached LLM text or generated media URLs."""
+    import sys
+    creative_utils = sys.modules.get("app.services.creative_service.creative_utils")
+    if creative_utils is not None:
+        creative_utils._TEXT_CACHE.clear()
+        creative_utils._MEDIA_CACHE.clear()
+    yield
@@ -5,8 +5,9 @@ Tests the full flow:
 product_service → creative_service → strategy_service → meta_service → logs_service
 """
 
+import orjson
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from fastapi.testclient import TestClient
 from tests.testdata import (
     VALID_CAMPAIGN_SPEC_META_ELECTRONICS,
@@ -176,30 +177,31 @@ class TestFullPipelineHappyPath:
         orchestrator_client = TestClient(orchestrator_app)
         
         # Mock all service HTTP calls
-        with patch('app.orchestrator.simple_service.requests.post') as mock_post:
+        with patch('app.orchestrator.simple_service.get_async_client') as mock_get_client:
+            mock_post = mock_get_client.return_value.post = AsyncMock()
             # Setup mock responses
             mock_responses = [
                 # Product service
                 MagicMock(
                     status_code=200,
-                    json=lambda: {
+                    content=orjson.dumps({
                         "status": "success",
                         "products": [p.model_dump() for p in SAMPLE_PRODUCTS_ELECTRONICS],
                         "groups": [g.model_dump() for g in SAMPLE_PRODUCT_GROUPS_ELECTRONICS]
-                    }
+                    })
                 ),
                 # Creative service
                 MagicMock(
                     status_code=200,
-                    json=lambda: {
+                    content=orjson.dumps({
                         "status": "success",
                         "creatives": [c.model_dump() for c in SAMPLE_CREATIVES_ELECTRONICS]
-                    }
+                    })
                 ),
                 # Strategy service
                 MagicMock(
                     status_code=200,
-                    json=lambda: {
+                    content=orjson.dumps({
                         "status": "success",
                         "abstract_strategy": {
                             "objective": "conversions",
@@ -207,23 +209,23 @@ class TestFullPipelineHappyPath:
                             "bidding_strategy": "lowest_cost"
                         },
                         "platform_strategies": []
-                    }
+                    })
                 ),
                 # Meta service
                 MagicMock(
                     status_code=200,
-                    json=lambda: {
+                    content=orjson.dumps({
                         "campaign_id": "CAMP-E2E-123",
                         "ad_set_id": "ADSET-E2E-456",
                         "ad_ids": [
                             {"ad_id": "AD-E2E-789", "creative_id": "CREATIVE-ELEC-001-A", "status": "ACTIVE"}
                         ],
                         "status": "ACTIVE"
-                    }
+                    })
                 ),
                 # Logs service (multiple calls)
-                MagicMock(status_code=200, json=lambda: {"status": "ok", "event_id": "EVENT-E2E-001"}),
-                MagicMock(status_code=200, json=lambda: {"status": "ok", "event_id": "EVENT-E2E-002"}),
+                MagicMock(status_code=200, content=orjson.dumps({"status": "ok", "event_id": "EVENT-E2E-001"})),
+                MagicMock(status_code=200, content=orjson.dumps({"status": "ok", "event_id": "EVENT-E2E-002"})),
             ]
             mock_post.side_effect = mock_responses
             
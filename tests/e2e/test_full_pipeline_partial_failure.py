@@ -4,8 +4,9 @@ End-to-end test for partial failure scenarios.
 Tests pipeline behavior when one or more services fail.
 """
 
+import orjson
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from fastapi.testclient import TestClient
 from tests.testdata import (
     VALID_CAMPAIGN_SPEC_META_ELECTRONICS,
@@ -171,22 +172,23 @@ class TestFullPipelinePartialFailure:
         
         orchestrator_client = TestClient(orchestrator_app)
         
-        with patch('app.orchestrator.simple_service.requests.post') as mock_post:
+        with patch('app.orchestrator.simple_service.get_async_client') as mock_get_client:
+            mock_post = mock_get_client.return_value.post = AsyncMock()
             # Setup: product, creative, strategy succeed, meta fails
             mock_responses = [
                 # Product service succeeds
                 MagicMock(
                     status_code=200,
-                    json=lambda: {
+                    content=orjson.dumps({
                         "status": "success",
                         "products": [p.model_dump() for p in SAMPLE_PRODUCTS_ELECTRONICS],
                         "groups": [g.model_dump() for g in SAMPLE_PRODUCT_GROUPS_ELECTRONICS]
-                    }
+                    })
                 ),
                 # Creative service succeeds
                 MagicMock(
                     status_code=200,
-                    json=lambda: {
+                    content=orjson.dumps({
                         "status": "success",
                         "creatives": [
                             {
@@ -198,28 +200,28 @@ class TestFullPipelinePartialFailure:
                                 "headline": "Test headline"
                             }
                         ]
-                    }
+                    })
                 ),
                 # Strategy service succeeds
                 MagicMock(
                     status_code=200,
-                    json=lambda: {
+                    content=orjson.dumps({
                         "status": "success",
                         "abstract_strategy": {"objective": "conversions"},
                         "platform_strategies": []
-                    }
+                    })
                 ),
                 # Meta service fails
                 MagicMock(
                     status_code=500,
-                    json=lambda: {
+                    content=orjson.dumps({
                         "status": "error",
                         "error_code": "META_API_ERROR",
                         "message": "Meta API unavailable"
-                    }
+                    })
                 ),
                 # Logs service (error logging)
-                MagicMock(status_code=200, json=lambda: {"status": "ok", "event_id": "EVENT-ERROR-001"}),
+                MagicMock(status_code=200, content=orjson.dumps({"status": "ok", "event_id": "EVENT-ERROR-001"})),
             ]
             mock_post.side_effect = mock_responses
             
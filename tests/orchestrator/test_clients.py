@@ -3,7 +3,7 @@ Unit tests for orchestrator clients.
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from app.orchestrator.clients.product_client import ProductClient
 from app.orchestrator.clients.creative_client import CreativeClient
 from app.orchestrator.clients.strategy_client import StrategyClient
@@ -16,7 +16,7 @@ from tests.testdata import VALID_CAMPAIGN_SPEC_META_ELECTRONICS, SAMPLE_PRODUCTS
 class TestProductClient:
     """Tests for ProductClient."""
     
-    @patch('app.orchestrator.clients.product_client.MCPClient')
+    @patch('app.orchestrator.clients.product_client.get_shared_client')
     def test_select_products_success(self, mock_mcp_client_class):
         """Test successful product selection."""
         mock_client_instance = MagicMock()
@@ -47,7 +47,7 @@ class TestProductClient:
         assert call_args[0][0] == "/select_products"
         client.close()
     
-    @patch('app.orchestrator.clients.product_client.MCPClient')
+    @patch('app.orchestrator.clients.product_client.get_shared_client')
     def test_select_products_error(self, mock_mcp_client_class):
         """Test product selection error handling."""
         mock_client_instance = MagicMock()
@@ -69,10 +69,13 @@ class TestProductClient:
 class TestCreativeClient:
     """Tests for CreativeClient."""
     
-    @patch('app.orchestrator.clients.creative_client.MCPClient')
-    def test_generate_creatives_success(self, mock_mcp_client_class):
+    @pytest.mark.asyncio
+    @patch('app.orchestrator.clients.creative_client.AsyncMCPClient')
+    async def test_generate_creatives_success(self, mock_mcp_client_class):
         """Test successful creative generation."""
         mock_client_instance = MagicMock()
+        mock_client_instance.post = AsyncMock()
+        mock_client_instance.close = AsyncMock()
         mock_mcp_client_class.return_value = mock_client_instance
         
         mock_response = {
@@ -93,7 +96,7 @@ class TestCreativeClient:
         client = CreativeClient()
         client.client = mock_client_instance
         
-        result = client.generate_creatives(
+        result = await client.generate_creatives(
             product_ids=["PROD-001"],
             campaign_objective="sales",
             target_audience="tech enthusiasts"
@@ -101,14 +104,14 @@ class TestCreativeClient:
         
         assert result["status"] == "success"
         assert "creatives" in result
-        mock_client_instance.post.assert_called_once()
-        client.close()
+        mock_client_instance.post.assert_awaited_once()
+        await client.close()
 
 
 class TestStrategyClient:
     """Tests for StrategyClient."""
     
-    @patch('app.orchestrator.clients.strategy_client.MCPClient')
+    @patch('app.orchestrator.clients.strategy_client.get_shared_client')
     def test_generate_strategy_success(self, mock_mcp_client_class):
         """Test successful strategy generation."""
         mock_client_instance = MagicMock()
@@ -145,10 +148,13 @@ class TestStrategyClient:
 class TestMetaClient:
     """Tests for MetaClient."""
     
-    @patch('app.orchestrator.clients.meta_client.MCPClient')
-    def test_create_campaign_success(self, mock_mcp_client_class):
+    @pytest.mark.asyncio
+    @patch('app.orchestrator.clients.meta_client.AsyncMCPClient')
+    async def test_create_campaign_success(self, mock_mcp_client_class):
         """Test successful campaign creation."""
         mock_client_instance = MagicMock()
+        mock_client_instance.post = AsyncMock()
+        mock_client_instance.close = AsyncMock()
         mock_mcp_client_class.return_value = mock_client_instance
         
         mock_response = {
@@ -164,7 +170,7 @@ class TestMetaClient:
         client = MetaClient()
         client.client = mock_client_instance
         
-        result = client.create_campaign(
+        result = await client.create_campaign(
             campaign_name="Test Campaign",
             objective="CONVERSIONS",
             daily_budget=100.0,
@@ -175,17 +181,20 @@ class TestMetaClient:
         
         assert "campaign_id" in result
         assert result["campaign_id"] == "CAMP-123"
-        mock_client_instance.post.assert_called_once()
-        client.close()
+        mock_client_instance.post.assert_awaited_once()
+        await client.close()
 
 
 class TestLogsClient:
     """Tests for LogsClient."""
     
-    @patch('app.orchestrator.clients.logs_client.MCPClient')
-    def test_append_event_success(self, mock_mcp_client_class):
+    @pytest.mark.asyncio
+    @patch('app.orchestrator.clients.logs_client.AsyncMCPClient')
+    async def test_append_event_success(self, mock_mcp_client_class):
         """Test successful event logging."""
         mock_client_instance = MagicMock()
+        mock_client_instance.post = AsyncMock()
+        mock_client_instance.close = AsyncMock()
         mock_mcp_client_class.return_value = mock_client_instance
         
         mock_response = {
@@ -194,10 +203,10 @@ class TestLogsClient:
         }
         mock_client_instance.post.return_value = mock_response
         
-        client = LogsClient()
+        client = LogsClient(batched=False)
         client.client = mock_client_instance
         
-        result = client.append_event(
+        result = await client.append_event(
             event_type="campaign_created",
             message="Campaign created successfully",
             campaign_id="CAMP-123"
@@ -205,14 +214,95 @@ class TestLogsClient:
         
         assert result["status"] == "ok"
         assert "event_id" in result
-        mock_client_instance.post.assert_called_once()
-        client.close()
+        mock_client_instance.post.assert_awaited_once()
+        await client.close()
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestrator.clients.logs_client.AsyncMCPClient')
+    async def test_append_event_batched(self, mock_mcp_client_class):
+        """Test that queued events are sent in a single batch request."""
+        mock_client_instance = MagicMock()
+        mock_client_instance.post = AsyncMock(return_value={"status": "success"})
+        mock_client_instance.close = AsyncMock()
+        mock_mcp_client_class.return_value = mock_client_instance
+        
+        client = LogsClient()
+        
+        for i in range(3):
+            result = await client.append_event(event_type="step", message=f"step {i}")
+            assert result["status"] == "queued"
+        
+        await client.flush()
+        
+        mock_client_instance.post.assert_awaited_once()
+        endpoint, events = mock_client_instance.post.call_args[0]
+        assert endpoint == "/append_events_batch"
+        assert [e["metadata"]["message"] for e in events] == ["step 0", "step 1", "step 2"]
+        await client.close()
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestrator.clients.logs_client.AsyncMCPClient')
+    async def test_close_logs_clients_drains_queue(self, mock_mcp_client_class):
+        """Test that the shutdown hook delivers events still queued on open clients."""
+        from app.orchestrator.clients import close_logs_clients
+        
+        mock_client_instance = MagicMock()
+        mock_client_instance.post = AsyncMock(return_value={"status": "success"})
+        mock_client_instance.close = AsyncMock()
+        mock_mcp_client_class.return_value = mock_client_instance
+        
+        client = LogsClient()
+        await client.append_event(event_type="step", message="pending")
+        
+        await close_logs_clients()
+        
+        mock_client_instance.post.assert_awaited_once()
+        mock_client_instance.close.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    @patch('app.orchestrator.clients.logs_client.AsyncMCPClient')
+    async def test_batched_events_accepted_by_logs_service(self, mock_mcp_client_class):
+        """Test that a flushed batch validates against the real /append_events_batch endpoint."""
+        from fastapi.testclient import TestClient
+        from app.services.logs_service.main import app as logs_app
+        
+        logs_service = TestClient(logs_app)
+        responses = []
+        
+        async def post(endpoint, data):
+            response = logs_service.post(endpoint, json=data)
+            responses.append(response)
+            return response.json()
+        
+        mock_client_instance = MagicMock()
+        mock_client_instance.post = AsyncMock(side_effect=post)
+        mock_client_instance.close = AsyncMock()
+        mock_mcp_client_class.return_value = mock_client_instance
+        
+        client = LogsClient()
+        await client.append_event(event_type="campaign_created", message="created", campaign_id="CAMP-1")
+        await client.append_event(event_type="meta", message="failed", metadata={"code": 500}, success=False)
+        await client.flush()
+        await client.close()
+        
+        assert [r.status_code for r in responses] == [200]
+        assert responses[0].json()["failed"] == 0
+        assert len(responses[0].json()["event_ids"]) == 2
+
+    
+    def test_instances_share_one_mcp_client(self):
+        """Test that ProductClient objects reuse the process-wide MCPClient."""
+        first, second = ProductClient(), ProductClient()
+        
+        assert first.client is second.client
+        first.close()
+        assert not second.client.client.is_closed
 
 
 class TestOptimizerClient:
     """Tests for OptimizerClient."""
     
-    @patch('app.orchestrator.clients.optimizer_client.MCPClient')
+    @patch('app.orchestrator.clients.optimizer_client.get_shared_client')
     def test_summarize_recent_runs_success(self, mock_mcp_client_class):
         """Test successful optimization summary."""
         mock_client_instance = MagicMock()
@@ -241,3 +331,55 @@ class TestOptimizerClient:
         mock_client_instance.post.assert_called_once()
         client.close()
 
+
+
+class TestSharedAsyncClient:
+    """Tests for the shared pooled AsyncClient used by async clients."""
+    
+    @pytest.mark.asyncio
+    async def test_shared_client_reused_per_base_url(self):
+        """Test that the same pooled client is returned for a base URL."""
+        from app.common.http_client import get_async_client, close_async_clients
+        
+        first = get_async_client("http://localhost:8002/")
+        second = get_async_client("http://localhost:8002")
+        other = get_async_client("http://localhost:8005")
+        
+        assert first is second
+        assert first is not other
+        
+        await close_async_clients()
+        assert first.is_closed
+        assert get_async_client("http://localhost:8002") is not first
+        await close_async_clients()
+    
+    @pytest.mark.asyncio
+    async def test_mcp_clients_share_pipeline_client(self):
+        """Test that AsyncMCPClient instances use the same pool as the orchestrator pipeline."""
+        from app.common.http_client import AsyncMCPClient, get_async_client, close_async_clients
+        
+        creative = AsyncMCPClient("http://localhost:8002")
+        meta = AsyncMCPClient("http://localhost:8005")
+        
+        assert creative._get_client() is meta._get_client() is get_async_client()
+        await close_async_clients()
+    
+    def test_client_from_previous_loop_is_closed(self):
+        """Test that a client replaced for a new event loop is closed, not leaked."""
+        import asyncio
+        from app.common.http_client import get_async_client, close_async_clients
+        
+        async def fetch():
+            return get_async_client("http://localhost:8002")
+        
+        async def replace():
+            client = get_async_client("http://localhost:8002")
+            await asyncio.sleep(0)
+            return client
+        
+        stale = asyncio.run(fetch())
+        fresh = asyncio.run(replace())
+        
+        assert fresh is not stale
+        assert stale.is_closed
+        asyncio.run(close_async_clients())
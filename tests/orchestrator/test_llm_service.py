@@ -0,0 +1,465 @@
+"""
+Tests for the LLM-enhanced orchestrator pipeline.
+"""
+
+import asyncio
+import json
+import threading
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.orchestrator import core, llm_service
+from app.orchestrator.llm_service import CampaignSpec, NaturalLanguageRequest
+from tests.testdata import SAMPLE_PRODUCTS_ELECTRONICS
+
+
+PARSED_SPEC = CampaignSpec(
+    campaign_objective="sales",
+    target_audience="tech enthusiasts",
+    budget=5000.0,
+    product_category="electronics"
+)
+
+SERVICE_RESPONSES = {
+    "/select_products": {"status": "success", "products": [p.model_dump() for p in SAMPLE_PRODUCTS_ELECTRONICS]},
+    "/generate_strategy": {"status": "success", "strategy_id": "STRAT-1"},
+    "/generate_creatives": {"status": "success", "creatives": [{"creative_id": "CREATIVE-001-A"}]},
+    "/create_campaign": {"campaign_id": "CAMP-123"},
+}
+
+
+def _fake_post(events):
+    """Fake _post_json that records start/end of each call."""
+    async def fake_post(client, url, payload, service):
+        endpoint = url[url.rindex("/"):]
+        events.append(("start", endpoint))
+        await asyncio.sleep(0)
+        events.append(("end", endpoint))
+        return SERVICE_RESPONSES[endpoint]
+    return fake_post
+
+
+@pytest.fixture
+def pipeline_mocks():
+    """Patch intent parsing, summary generation and MCP calls."""
+    events = []
+    with patch.object(llm_service, "parse_user_intent", return_value=PARSED_SPEC), \
+         patch.object(llm_service, "generate_summary", return_value="Summary"), \
+         patch.object(llm_service, "_post_json", side_effect=_fake_post(events)):
+        yield events
+
+
+class TestCreateCampaignNL:
+    """Tests for /create_campaign_nl."""
+    
+    @pytest.mark.asyncio
+    async def test_pipeline_success(self, pipeline_mocks):
+        """Test that the pipeline returns all stage results."""
+        result = await llm_service.create_campaign_natural_language(
+            NaturalLanguageRequest(user_request="Sell electronics to tech fans, $5000")
+        )
+        
+        assert result.status == "success"
+        assert result.campaigns[0].campaign_id == "CAMP-123"
+        assert result.campaigns[0].strategy["strategy_id"] == "STRAT-1"
+        assert result.summary == "Summary"
+    
+    @pytest.mark.asyncio
+    async def test_products_and_strategy_run_concurrently(self, pipeline_mocks):
+        """Test that independent stages overlap and dependent ones follow."""
+        await llm_service.create_campaign_natural_language(
+            NaturalLanguageRequest(user_request="Sell electronics")
+        )
+        
+        events = pipeline_mocks
+        first_end = next(i for i, e in enumerate(events) if e[0] == "end")
+        started_before_first_end = {e[1] for e in events[:first_end] if e[0] == "start"}
+        assert started_before_first_end == {"/select_products", "/generate_strategy"}
+        assert events[-2:] == [("start", "/create_campaign"), ("end", "/create_campaign")]
+
+    
+    @pytest.mark.asyncio
+    async def test_summary_overlaps_meta_campaign_creation(self, pipeline_mocks):
+        """Test that the summary is generated while the Meta call is in flight."""
+        summary_started = threading.Event()
+        summary_inputs = []
+        meta_saw_summary = []
+        
+        def fake_summary(spec_dump, results):
+            summary_inputs.append(results)
+            summary_started.set()
+            return "Summary"
+        
+        async def slow_meta(campaign_spec, creatives):
+            for _ in range(200):
+                if summary_started.is_set():
+                    break
+                await asyncio.sleep(0.005)
+            meta_saw_summary.append(summary_started.is_set())
+            return "CAMP-123"
+        
+        with patch.object(llm_service, "generate_summary", side_effect=fake_summary), \
+             patch.object(llm_service, "_create_meta_campaign", side_effect=slow_meta):
+            result = await llm_service.create_campaign_natural_language(
+                NaturalLanguageRequest(user_request="Sell electronics")
+            )
+        
+        assert meta_saw_summary == [True]
+        assert "campaign_id" not in summary_inputs[0]
+        assert result.campaigns[0].campaign_id == "CAMP-123"
+        assert result.summary == "Summary"
+
+
+class TestIntentCache:
+    """Tests for LLM response caching in parse_user_intent."""
+    
+    @pytest.mark.asyncio
+    async def test_repeated_request_skips_llm(self):
+        """Test that an identical request is answered from the cache."""
+        llm_service._INTENT_CACHE.clear()
+        content = PARSED_SPEC.model_dump_json()
+        with patch.object(llm_service, "_call_gemini_with_retry", return_value=content) as mock_llm:
+            first = await llm_service.parse_user_intent("Sell electronics, $5000")
+            second = await llm_service.parse_user_intent("  sell electronics, $5000 ")
+        
+        assert first == second == PARSED_SPEC
+        assert mock_llm.call_count == 1
+        llm_service._INTENT_CACHE.clear()
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_llm_call(self):
+        """Test that concurrent identical requests are coalesced into one Gemini call."""
+        llm_service._INTENT_CACHE.clear()
+        
+        async def slow_llm(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return PARSED_SPEC.model_dump_json()
+        
+        with patch.object(llm_service, "_call_gemini_with_retry", side_effect=slow_llm) as mock_llm:
+            specs = await asyncio.gather(
+                *(llm_service.parse_user_intent("Sell electronics, $5000") for _ in range(3))
+            )
+        llm_service._INTENT_CACHE.clear()
+        
+        assert specs == [PARSED_SPEC] * 3
+        assert mock_llm.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_invalid_json_is_reported_and_not_cached(self):
+        """Test that malformed LLM output becomes a 400 and is not cached."""
+        llm_service._INTENT_CACHE.clear()
+        with patch.object(llm_service, "_call_gemini_with_retry", return_value='{"budget": '):
+            with pytest.raises(llm_service.HTTPException) as exc_info:
+                await llm_service.parse_user_intent("Sell electronics")
+        
+        assert exc_info.value.status_code == 400
+        assert "Invalid JSON response from LLM" in exc_info.value.detail
+        assert len(llm_service._INTENT_CACHE) == 0
+    
+    @pytest.mark.asyncio
+    async def test_agent_prompt_is_sent_as_system_instruction(self):
+        """Test that only the user request goes into the per-call prompt."""
+        llm_service._INTENT_CACHE.clear()
+        content = PARSED_SPEC.model_dump_json()
+        with patch.object(llm_service, "_call_gemini_with_retry", return_value=content) as mock_llm:
+            await llm_service.parse_user_intent("Sell electronics to gamers")
+        llm_service._INTENT_CACHE.clear()
+        
+        prompt = mock_llm.call_args.args[0]
+        assert "Sell electronics to gamers" in prompt
+        assert llm_service.AGENT_PROMPT not in prompt
+        assert mock_llm.call_args.kwargs["model"] is llm_service.intent_model
+
+
+class TestIntentBatching:
+    """Tests for batched intent parsing."""
+    
+    @pytest.mark.asyncio
+    async def test_distinct_requests_share_one_llm_call(self):
+        """Test that several uncached requests are parsed by one Gemini call."""
+        llm_service._INTENT_CACHE.clear()
+        other = PARSED_SPEC.model_copy(update={"budget": 100.0})
+        content = json.dumps([PARSED_SPEC.model_dump(), other.model_dump()])
+        with patch.object(llm_service, "_call_gemini_with_retry", return_value=content) as mock_llm:
+            specs = await llm_service.parse_user_intents(["Sell electronics", "Sell toys", "Sell electronics"])
+        llm_service._INTENT_CACHE.clear()
+        
+        assert specs == [PARSED_SPEC, other, PARSED_SPEC]
+        assert mock_llm.call_count == 1
+        assert mock_llm.call_args.kwargs["response_schema"] == llm_service.CAMPAIGN_SPEC_LIST_SCHEMA
+    
+    @pytest.mark.asyncio
+    async def test_bad_batch_falls_back_to_single_calls(self):
+        """Test that a malformed batch response is retried one request at a time."""
+        llm_service._INTENT_CACHE.clear()
+        with patch.object(llm_service, "_call_gemini_with_retry", return_value="[]"), \
+             patch.object(llm_service, "parse_user_intent", side_effect=[PARSED_SPEC, ValueError("bad")]) as mock_parse:
+            specs = await llm_service.parse_user_intents(["Sell electronics", "???"])
+        llm_service._INTENT_CACHE.clear()
+        
+        assert mock_parse.call_count == 2
+        assert specs[0] == PARSED_SPEC
+        assert isinstance(specs[1], ValueError)
+
+
+class TestCreateCampaignStructured:
+    """Tests for /create_campaign."""
+    
+    @pytest.mark.asyncio
+    async def test_structured_request_skips_intent_parsing(self, pipeline_mocks):
+        """Test that a structured spec runs the pipeline without the LLM parse."""
+        with patch.object(llm_service, "parse_user_intent") as mock_parse:
+            result = await llm_service.create_campaign_structured(PARSED_SPEC)
+        
+        mock_parse.assert_not_called()
+        assert result.status == "success"
+        assert result.campaign_spec["budget"] == PARSED_SPEC.budget
+
+
+class _FakeStreamingModel:
+    """Gemini model stub whose async generation streams fixed chunks."""
+    
+    def __init__(self, chunks):
+        self.chunks = chunks
+    
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        async def response():
+            for text in self.chunks:
+                yield MagicMock(text=text)
+        return response()
+
+
+class TestCreateCampaignNLStream:
+    """Tests for /create_campaign_nl/stream."""
+    
+    @pytest.mark.asyncio
+    async def test_streams_campaign_then_summary_chunks(self, pipeline_mocks):
+        """Test that campaign results come first, followed by summary deltas."""
+        llm_service._SUMMARY_CACHE.clear()
+        transport = httpx.ASGITransport(app=llm_service.app)
+        with patch.object(llm_service, "summary_model", _FakeStreamingModel(["Created ", "a campaign."])):
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post(
+                    "/create_campaign_nl/stream", json={"user_request": "Sell electronics"}
+                )
+        llm_service._SUMMARY_CACHE.clear()
+        
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert [line["type"] for line in lines] == [
+            "step", "step", "campaign", "summary_delta", "summary_delta", "done"
+        ]
+        assert [line["step"] for line in lines[:2]] == ["intent_parsed", "creatives_generated"]
+        assert lines[1]["creatives"] == 1
+        assert lines[2]["campaigns"][0]["campaign_id"] == "CAMP-123"
+        assert "".join(line["text"] for line in lines[3:5]) == "Created a campaign."
+    
+    @pytest.mark.asyncio
+    async def test_service_failure_ends_stream_with_error(self, pipeline_mocks):
+        """Test that a failing stage is reported after the steps that succeeded."""
+        transport = httpx.ASGITransport(app=llm_service.app)
+        with patch.object(llm_service, "_create_meta_campaign", side_effect=ValueError("meta down")):
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post(
+                    "/create_campaign_nl/stream", json={"user_request": "Sell electronics", "fast_mode": True}
+                )
+        
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["type"] for line in lines] == ["step", "step", "error"]
+        assert lines[-1]["errors"] == ["meta down"]
+
+
+class TestBatch:
+    """Tests for /batch."""
+    
+    @pytest.mark.asyncio
+    async def test_layers_run_in_dependency_order(self, pipeline_mocks):
+        """Test that independent calls share a layer and results are forwarded."""
+        request = llm_service.BatchRequest(calls=[
+            {"id": "products", "service": "product", "endpoint": "/select_products"},
+            {"id": "strategy", "service": "strategy", "endpoint": "/generate_strategy"},
+            {"id": "creatives", "service": "creative", "endpoint": "/generate_creatives", "input_from": 0},
+        ])
+        
+        response = await llm_service.execute_batch(request)
+        
+        assert [r.status for r in response.results] == ["success"] * 3
+        assert response.results[2].result["creatives"][0]["creative_id"] == "CREATIVE-001-A"
+        events = pipeline_mocks
+        assert events[:2] == [("start", "/select_products"), ("start", "/generate_strategy")]
+        assert events[-2:] == [("start", "/generate_creatives"), ("end", "/generate_creatives")]
+    
+    @pytest.mark.asyncio
+    async def test_dependents_of_failed_call_are_skipped(self, pipeline_mocks):
+        """Test that a failing call marks its dependents as errors."""
+        request = llm_service.BatchRequest(calls=[
+            {"id": "missing", "service": "product", "endpoint": "/unknown"},
+            {"id": "creatives", "service": "creative", "endpoint": "/generate_creatives", "input_from": 0},
+        ])
+        
+        response = await llm_service.execute_batch(request)
+        
+        assert [r.status for r in response.results] == ["error", "error"]
+        assert "Skipped" in response.results[1].error
+    
+    @pytest.mark.parametrize("endpoint", [
+        "@evil.host/x", ".evil.host/x", "//evil.host/x", "/../admin", "/a@b", "select_products", "/x?y=1"
+    ])
+    def test_non_path_endpoint_is_rejected(self, endpoint):
+        """Test that an endpoint which could point the call at another host is refused."""
+        with pytest.raises(ValueError):
+            llm_service.BatchCall(id="a", service="product", endpoint=endpoint)
+    
+    @pytest.mark.asyncio
+    async def test_non_path_endpoint_returns_422(self):
+        """Test that /batch answers 422 without calling any service for a host-changing endpoint."""
+        transport = httpx.ASGITransport(app=llm_service.app)
+        with patch.object(llm_service, "_post_json") as mock_post:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/batch", json={"calls": [
+                    {"id": "a", "service": "product", "endpoint": "@evil.host/x"}
+                ]})
+        
+        assert response.status_code == 422
+        mock_post.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_breakers_are_keyed_by_service(self):
+        """Test that batch calls use their service's breaker whatever the endpoint."""
+        request = llm_service.BatchRequest(calls=[
+            {"id": "a", "service": "product", "endpoint": "/select_products"},
+            {"id": "b", "service": "product", "endpoint": "/other"},
+        ])
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json={})))
+        llm_service._BREAKERS.clear()
+        try:
+            with patch.object(llm_service, "get_async_client", return_value=client):
+                response = await llm_service.execute_batch(request)
+            breakers = set(llm_service._BREAKERS)
+        finally:
+            llm_service._BREAKERS.clear()
+            await client.aclose()
+        
+        assert [r.status for r in response.results] == ["success", "success"]
+        assert breakers == {"product"}
+    
+    def test_forward_reference_is_rejected(self):
+        """Test that input_from must point to an earlier call."""
+        calls = [llm_service.BatchCall(id="a", service="product", endpoint="/x", input_from=0)]
+        
+        with pytest.raises(llm_service.HTTPException) as exc_info:
+            llm_service._batch_layers(calls)
+        assert exc_info.value.status_code == 400
+
+
+class TestCircuitBreaker:
+    """Tests for per-service circuit breaking in the pipeline."""
+    
+    @pytest.mark.asyncio
+    async def test_open_breaker_returns_503(self):
+        """Test that a tripped service breaker fails the pipeline fast with 503."""
+        calls = []
+        
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500)
+        
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        llm_service._BREAKERS.clear()
+        try:
+            for _ in range(5):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await llm_service._post_json(
+                        client, f"{llm_service.PRODUCT_SERVICE_URL}/select_products", {}, service="product"
+                    )
+            
+            with patch.object(llm_service, "get_async_client", return_value=client):
+                with pytest.raises(llm_service.HTTPException) as exc_info:
+                    await llm_service.create_campaign_structured(PARSED_SPEC)
+        finally:
+            llm_service._BREAKERS.clear()
+            await client.aclose()
+        
+        assert exc_info.value.status_code == 503
+        assert len(calls) == 5 + 1  # product breaker open; only strategy was called
+    
+    @pytest.mark.asyncio
+    async def test_transient_gateway_error_is_retried(self):
+        """Test that a 503 is retried and does not count against the breaker."""
+        responses = [httpx.Response(503), httpx.Response(200, json={"status": "success"})]
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: responses.pop(0)))
+        llm_service._BREAKERS.clear()
+        try:
+            with patch.object(llm_service.send_json.retry, "sleep", AsyncMock()):
+                result = await llm_service._post_json(
+                    client, f"{llm_service.PRODUCT_SERVICE_URL}/select_products", {}, service="product"
+                )
+            breaker = llm_service._get_breaker("product")
+        finally:
+            llm_service._BREAKERS.clear()
+            await client.aclose()
+        
+        assert result == {"status": "success"}
+        assert breaker.failure_count == 0
+
+
+class TestStaticEndpoints:
+    """Tests for the pre-serialized / and /health responses."""
+    
+    @pytest.mark.asyncio
+    async def test_health_returns_static_payload(self):
+        """Test that /health serves the precomputed JSON payload."""
+        transport = httpx.ASGITransport(app=llm_service.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/health")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json()["status"] == "healthy"
+        assert response.content == llm_service._HEALTH_BYTES
+
+
+class TestServicesStatus:
+    """Tests for /services/status."""
+    
+    @pytest.mark.asyncio
+    async def test_repeated_polls_are_served_from_cache(self):
+        """Test that polls within the TTL reuse the last probe result."""
+        status = {"orchestrator_status": "healthy", "services": {}}
+        core.clear_status_cache()
+        transport = httpx.ASGITransport(app=llm_service.app)
+        with patch.object(core, "probe_services", AsyncMock(return_value=status)) as mock_probe:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                first = await client.get("/services/status")
+                second = await client.get("/services/status")
+        core.clear_status_cache()
+        
+        assert first.json() == second.json() == {**status, "llm_enabled": True}
+        assert mock_probe.await_count == 1
+        assert second.headers["cache-control"] == "max-age=2"
+
+
+class TestFastMode:
+    """Tests for fast_mode, which keeps the LLM off the critical path."""
+    
+    @pytest.mark.asyncio
+    async def test_fast_mode_uses_template_summary(self, pipeline_mocks):
+        """Test that fast mode skips the LLM summary."""
+        with patch.object(llm_service, "generate_summary") as mock_summary:
+            result = await llm_service.create_campaign_structured(PARSED_SPEC, fast_mode=True)
+        
+        mock_summary.assert_not_called()
+        assert result.summary == "Created 3 products, 1 creatives, campaign CAMP-123."
+    
+    @pytest.mark.asyncio
+    async def test_fast_mode_returns_raw_errors(self):
+        """Test that fast mode does not ask the LLM to explain errors."""
+        with patch.object(llm_service, "parse_user_intent", side_effect=ValueError("bad request")), \
+             patch.object(llm_service, "explain_error") as mock_explain:
+            result = await llm_service.create_campaign_natural_language(
+                NaturalLanguageRequest(user_request="???", fast_mode=True)
+            )
+        
+        mock_explain.assert_not_called()
+        assert result.status == "error"
+        assert result.errors == ["bad request"]
@@ -2,8 +2,9 @@
 Tests for simple orchestrator pipeline execution.
 """
 
+import orjson
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import MagicMock
 from tests.testdata import (
     VALID_CAMPAIGN_SPEC_META_ELECTRONICS,
     SAMPLE_PRODUCTS_ELECTRONICS,
@@ -16,8 +17,7 @@ class TestOrchestratorPipelineSimple:
     """Tests for simple orchestrator pipeline."""
     
     @pytest.mark.asyncio
-    @patch('app.orchestrator.simple_service.requests.post')
-    async def test_create_campaign_full_pipeline(self, mock_post):
+    async def test_create_campaign_full_pipeline(self, mock_orchestrator_post):
         """Test full pipeline execution through orchestrator."""
         from app.orchestrator.simple_service import create_campaign, CampaignRequest
         
@@ -26,24 +26,24 @@ class TestOrchestratorPipelineSimple:
             # Product service response
             MagicMock(
                 status_code=200,
-                json=lambda: {
+                content=orjson.dumps({
                     "status": "success",
                     "products": [p.model_dump() for p in SAMPLE_PRODUCTS_ELECTRONICS],
                     "groups": [g.model_dump() for g in SAMPLE_PRODUCT_GROUPS_ELECTRONICS]
-                }
+                })
             ),
             # Creative service response
             MagicMock(
                 status_code=200,
-                json=lambda: {
+                content=orjson.dumps({
                     "status": "success",
                     "creatives": [c.model_dump() for c in SAMPLE_CREATIVES_ELECTRONICS]
-                }
+                })
             ),
             # Strategy service response
             MagicMock(
                 status_code=200,
-                json=lambda: {
+                content=orjson.dumps({
                     "status": "success",
                     "abstract_strategy": {
                         "objective": "conversions",
@@ -51,12 +51,12 @@ class TestOrchestratorPipelineSimple:
                         "bidding_strategy": "lowest_cost"
                     },
                     "platform_strategies": []
-                }
+                })
             ),
             # Meta service response
             MagicMock(
                 status_code=200,
-                json=lambda: {
+                content=orjson.dumps({
                     "campaign_id": "CAMP-123",
                     "ad_set_id": "ADSET-456",
                     "ad_ids": [
@@ -64,14 +64,14 @@ class TestOrchestratorPipelineSimple:
                         {"ad_id": "AD-789-B", "creative_id": "CREATIVE-ELEC-001-B", "status": "ACTIVE"}
                     ],
                     "status": "ACTIVE"
-                }
+                })
             ),
             # Logs service response (multiple calls)
-            MagicMock(status_code=200, json=lambda: {"status": "ok", "event_id": "EVENT-001"}),
-            MagicMock(status_code=200, json=lambda: {"status": "ok", "event_id": "EVENT-002"}),
-            MagicMock(status_code=200, json=lambda: {"status": "ok", "event_id": "EVENT-003"}),
+            MagicMock(status_code=200, content=orjson.dumps({"status": "ok", "event_id": "EVENT-001"})),
+            MagicMock(status_code=200, content=orjson.dumps({"status": "ok", "event_id": "EVENT-002"})),
+            MagicMock(status_code=200, content=orjson.dumps({"status": "ok", "event_id": "EVENT-003"})),
         ]
-        mock_post.side_effect = mock_responses
+        mock_orchestrator_post.side_effect = mock_responses
         
         request = CampaignRequest(
             campaign_objective="sales",
@@ -92,17 +92,16 @@ class TestOrchestratorPipelineSimple:
         assert response.meta_campaign is not None
         
         # Verify service calls were made in correct order
-        assert mock_post.call_count >= 4  # At least product, creative, strategy, meta
+        assert mock_orchestrator_post.call_count >= 4  # At least product, creative, strategy, meta
     
     @pytest.mark.asyncio
-    @patch('app.orchestrator.simple_service.requests.post')
-    async def test_create_campaign_product_service_failure(self, mock_post):
+    async def test_create_campaign_product_service_failure(self, mock_orchestrator_post):
         """Test pipeline behavior when product service fails."""
         from app.orchestrator.simple_service import create_campaign, CampaignRequest
         
         # Mock product service failure
-        mock_post.side_effect = [
-            MagicMock(status_code=500, json=lambda: {"status": "error", "message": "Service unavailable"}),
+        mock_orchestrator_post.side_effect = [
+            MagicMock(status_code=500, content=orjson.dumps({"status": "error", "message": "Service unavailable"})),
         ]
         
         request = CampaignRequest(
@@ -123,24 +122,23 @@ class TestOrchestratorPipelineSimple:
             assert e.status_code == 500
     
     @pytest.mark.asyncio
-    @patch('app.orchestrator.simple_service.requests.post')
-    async def test_create_campaign_creative_service_failure(self, mock_post):
+    async def test_create_campaign_creative_service_failure(self, mock_orchestrator_post):
         """Test pipeline behavior when creative service fails."""
         from app.orchestrator.simple_service import create_campaign, CampaignRequest
         
         # Mock responses: product succeeds, creative fails
-        mock_post.side_effect = [
+        mock_orchestrator_post.side_effect = [
             # Product service succeeds
             MagicMock(
                 status_code=200,
-                json=lambda: {
+                content=orjson.dumps({
                     "status": "success",
                     "products": [p.model_dump() for p in SAMPLE_PRODUCTS_ELECTRONICS],
                     "groups": [g.model_dump() for g in SAMPLE_PRODUCT_GROUPS_ELECTRONICS]
-                }
+                })
             ),
             # Creative service fails
-            MagicMock(status_code=500, json=lambda: {"status": "error", "message": "Creative generation failed"}),
+            MagicMock(status_code=500, content=orjson.dumps({"status": "error", "message": "Creative generation failed"})),
         ]
         
         request = CampaignRequest(
@@ -8,14 +8,81 @@ Tests:
 - JSON Mode parsing
 """
 
+import os
 import pytest
 from unittest.mock import patch, MagicMock, Mock
 from app.services.creative_service import creative_utils
 
 
+@pytest.fixture(autouse=True)
+def clear_text_cache():
+    """Each test starts with an empty prompt -> response cache."""
+    creative_utils._TEXT_CACHE.clear()
+    yield
+    creative_utils._TEXT_CACHE.clear()
+
+
 class TestLLMFallback:
     """Test LLM fallback logic."""
     
+    def test_repeated_prompt_served_from_cache(self):
+        """Test an identical prompt does not call the provider twice."""
+        with patch.object(creative_utils, 'openai_client', MagicMock()), \
+             patch.object(creative_utils, '_call_openai_api_internal') as mock_call:
+            
+            mock_call.return_value = '{"headline": "Test", "primary_text": "Content"}'
+            
+            first = creative_utils.call_gemini_text("cached prompt")
+            second = creative_utils.call_gemini_text("cached prompt")
+            json_mode = creative_utils.call_gemini_text("cached prompt", response_schema={"type": "object"})
+            
+            assert first == second == json_mode
+            # JSON Mode requests are cached separately from plain ones
+            assert mock_call.call_count == 2
+    
+    def test_cache_disabled_calls_provider_every_time(self):
+        """Test LLM_CACHE_ENABLED=False bypasses the response cache."""
+        with patch.object(creative_utils.settings, 'LLM_CACHE_ENABLED', False), \
+             patch.object(creative_utils, 'openai_client', MagicMock()), \
+             patch.object(creative_utils, '_call_openai_api_internal', return_value="text") as mock_call:
+            
+            creative_utils.call_gemini_text("uncached prompt")
+            creative_utils.call_gemini_text("uncached prompt")
+            
+            assert mock_call.call_count == 2
+            assert len(creative_utils._TEXT_CACHE) == 0
+    
+    def test_cache_key_includes_schema(self):
+        """Test the same prompt under different JSON schemas is not shared."""
+        with patch.object(creative_utils, 'openai_client', MagicMock()), \
+             patch.object(creative_utils, '_call_openai_api_internal', side_effect=["one", "two"]):
+            
+            first = creative_utils.call_gemini_text("prompt", response_schema={"type": "object"})
+            second = creative_utils.call_gemini_text("prompt", response_schema={"type": "array"})
+            
+            assert (first, second) == ("one", "two")
+    
+    def test_openai_request_uses_configured_model(self):
+        """Test the OpenAI request uses settings.OPENAI_MODEL, the model in the cache key."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value.choices = [MagicMock()]
+        mock_client.chat.completions.create.return_value.choices[0].message.content = "text"
+        with patch.object(creative_utils.settings, 'OPENAI_MODEL', 'gpt-test'), \
+             patch.object(creative_utils, 'openai_client', mock_client):
+            
+            creative_utils._call_openai_api_internal("prompt")
+            
+            assert mock_client.chat.completions.create.call_args.kwargs["model"] == "gpt-test"
+    
+    def test_failed_result_not_cached(self):
+        """Test a failed generation is retried on the next call."""
+        with patch.object(creative_utils, 'openai_client', None), \
+             patch.object(creative_utils, 'gemini_model', MagicMock()), \
+             patch.object(creative_utils, '_call_gemini_api_internal', side_effect=[None, "ok"]):
+            
+            assert creative_utils.call_gemini_text("flaky prompt") is None
+            assert creative_utils.call_gemini_text("flaky prompt") == "ok"
+    
     def test_openai_primary_success(self):
         """Test OpenAI is used first when available."""
         with patch.object(creative_utils, 'openai_client', MagicMock()), \
@@ -101,6 +168,76 @@ class TestLLMFallback:
             call_args, call_kwargs = mock_gemini.call_args
             assert call_kwargs['response_schema'] == schema
     
+    def test_json_mode_gemini_leaves_shared_config_untouched(self):
+        """Test JSON Mode derives its own generation config."""
+        schema = {"type": "object", "properties": {"headline": {"type": "string"}}}
+        mock_model = MagicMock()
+        mock_model.generate_content.return_value.text = '{"headline": "Gemini"}'
+        
+        with patch.object(creative_utils, 'gemini_model', mock_model):
+            creative_utils._call_gemini_api_internal("test prompt", response_schema=schema)
+        
+        config = mock_model.generate_content.call_args.kwargs['generation_config']
+        assert config["response_schema"] == schema
+        assert config["response_mime_type"] == "application/json"
+        assert config["temperature"] == 0.7
+        assert "response_schema" not in creative_utils.GEMINI_GENERATION_CONFIG
+    
+    def test_gemini_sdk_loaded_lazily(self):
+        """Test the Gemini models are built on first use, not at import."""
+        with patch.object(creative_utils, 'gemini_api_key', 'test-key'), \
+             patch.object(creative_utils, 'gemini_model', None), \
+             patch.object(creative_utils, 'gemini_image_model', None), \
+             patch.object(creative_utils, '_gemini_loaded', False), \
+             patch.object(creative_utils, '_openai_loaded', True), \
+             patch('google.generativeai.configure') as mock_configure, \
+             patch('google.generativeai.GenerativeModel') as mock_model_cls:
+            
+            creative_utils.load_gemini_models()
+            creative_utils.load_gemini_models()
+            
+            mock_configure.assert_called_once_with(api_key='test-key')
+            assert creative_utils.gemini_model is mock_model_cls.return_value
+    
+    def test_gemini_loaded_when_openai_client_fails_first(self):
+        """Test Gemini is enabled when it is loaded before a failing OpenAI client."""
+        with patch.object(creative_utils, 'openai_real_key', 'test-key'), \
+             patch.object(creative_utils, 'openai_client', None), \
+             patch.object(creative_utils, 'openai_image_client', None), \
+             patch.object(creative_utils, '_openai_loaded', False), \
+             patch.object(creative_utils, 'gemini_api_key', None), \
+             patch.object(creative_utils, 'gemini_model', None), \
+             patch.object(creative_utils, 'gemini_image_model', None), \
+             patch.object(creative_utils, '_gemini_loaded', False), \
+             patch.object(creative_utils.settings, 'GEMINI_API_KEY', 'gemini-key'), \
+             patch.dict(os.environ, {}, clear=False), \
+             patch('openai.OpenAI', side_effect=Exception("bad base url")), \
+             patch('google.generativeai.configure') as mock_configure, \
+             patch('google.generativeai.GenerativeModel') as mock_model_cls:
+            os.environ.pop('GEMINI_API_KEY', None)
+            
+            creative_utils.load_gemini_models()
+            creative_utils.load_openai_client()
+            
+            assert creative_utils.openai_client is None
+            mock_configure.assert_called_once_with(api_key='gemini-key')
+            assert creative_utils.gemini_model is mock_model_cls.return_value
+    
+    def test_openai_client_built_lazily(self):
+        """Test the OpenAI client is built once, on first use."""
+        with patch.object(creative_utils, 'openai_real_key', 'test-key'), \
+             patch.object(creative_utils, 'openai_client', None), \
+             patch.object(creative_utils, 'openai_image_client', None), \
+             patch.object(creative_utils, '_openai_loaded', False), \
+             patch('openai.OpenAI') as mock_openai_cls:
+            
+            creative_utils.load_openai_client()
+            creative_utils.load_openai_client()
+            
+            mock_openai_cls.assert_called_once()
+            assert creative_utils.openai_client is mock_openai_cls.return_value
+            assert creative_utils.openai_image_client is creative_utils.openai_client
+    
     def test_openai_retry_exhausted_fallback(self):
         """Test fallback when OpenAI retries are exhausted."""
         from tenacity import RetryError
@@ -135,6 +272,17 @@ class TestLLMFallback:
             assert result == "https://example.com/image.jpg"
             mock_client.images.generate.assert_called_once()
     
+    def test_image_generation_reuses_recent_url(self):
+        """Test an identical DALL-E prompt is served from the media cache."""
+        with patch.object(creative_utils, 'openai_image_client') as mock_client:
+            mock_client.images.generate.return_value = MagicMock(data=[MagicMock(url="https://example.com/image.jpg")])
+            
+            first = creative_utils.call_openai_image("same image prompt")
+            second = creative_utils.call_openai_image("same image prompt")
+            
+            assert first == second == "https://example.com/image.jpg"
+            mock_client.images.generate.assert_called_once()
+    
     def test_image_generation_openai_failure_fallback_to_gemini(self):
         """Test image generation falls back to Gemini when DALL-E fails."""
         with patch.object(creative_utils, 'openai_image_client', None), \
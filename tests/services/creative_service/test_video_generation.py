@@ -52,6 +52,17 @@ class TestVideoGeneration:
             call_args = mock_client.run.call_args
             assert call_args[0][0] == settings.REPLICATE_VIDEO_MODEL
     
+    def test_call_replicate_video_reuses_recent_url(self):
+        """Test an identical image + description is not generated twice."""
+        with patch.object(creative_utils, 'replicate_client') as mock_client:
+            mock_client.run.return_value = "https://replicate.com/cached.mp4"
+            
+            first = creative_utils.call_replicate_video("https://example.com/image.jpg", "cached description")
+            second = creative_utils.call_replicate_video("https://example.com/image.jpg", "cached description")
+            
+            assert first == second == "https://replicate.com/cached.mp4"
+            mock_client.run.assert_called_once()
+    
     def test_call_replicate_video_no_client(self):
         """Test video generation when Replicate client is not available."""
         with patch.object(creative_utils, 'replicate_client', None):
@@ -136,6 +147,7 @@ class TestVideoGeneration:
             assert result["num_segments"] == 3
             assert len(result["segments"]) == 3
             assert result["segments"][0]["segment_id"] == 1
+            assert mock_llm.call_args.kwargs["response_schema"] is creative_utils.STORYLINE_RESPONSE_SCHEMA
     
     def test_generate_storyline_json_parse_error(self):
         """Test storyline generation with invalid JSON."""
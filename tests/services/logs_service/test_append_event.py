@@ -130,3 +130,24 @@ class TestAppendEvent:
             data = response.json()
             assert data["status"] == "success"
 
+
+
+class TestAppendEventsBatch:
+    """Test append_events_batch endpoint."""
+    
+    def test_append_events_batch_success(self, sample_log_event):
+        """Test logging several events in one request."""
+        response = client.post("/append_events_batch", json=[sample_log_event, sample_log_event])
+        
+        assert response.status_code == 200
+        data = response.json()
+        
+        assert data["status"] == "success"
+        assert len(data["event_ids"]) == 2
+        assert data["failed"] == 0
+    
+    def test_append_events_batch_invalid_event(self, sample_log_event):
+        """Test that invalid events reject the batch with 422."""
+        response = client.post("/append_events_batch", json=[sample_log_event, {"stage": "product"}])
+        
+        assert response.status_code == 422
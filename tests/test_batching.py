@@ -0,0 +1,63 @@
+"""
+Tests for the async micro-batcher.
+"""
+
+import asyncio
+import pytest
+from app.common.batching import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_share_one_batch():
+    """Test that items submitted together are handled in a single call."""
+    batches = []
+
+    async def handler(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(handler, max_size=8, max_wait=0.01)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+    assert results == [0, 2, 4]
+    assert batches == [[0, 1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_size():
+    """Test that a burst larger than max_size is split into several batches."""
+    batches = []
+
+    async def handler(items):
+        batches.append(len(items))
+        return items
+
+    batcher = MicroBatcher(handler, max_size=2, max_wait=0.01)
+    await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert sorted(batches) == [1, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_exception_results_fail_only_their_item():
+    """Test that a per-item exception is raised to that caller alone."""
+    async def handler(items):
+        return [ValueError(item) if item == "bad" else item for item in items]
+
+    batcher = MicroBatcher(handler, max_wait=0.01)
+    results = await asyncio.gather(batcher.submit("ok"), batcher.submit("bad"), return_exceptions=True)
+
+    assert results[0] == "ok"
+    assert isinstance(results[1], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_handler_failure_fails_whole_batch():
+    """Test that an exception from the handler reaches every caller in the batch."""
+    async def handler(items):
+        raise RuntimeError("down")
+
+    batcher = MicroBatcher(handler, max_wait=0.01)
+    results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
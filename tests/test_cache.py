@@ -0,0 +1,77 @@
+"""
+Tests for the in-process TTL cache and single-flight helper.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.common.cache import SingleFlight, TTLCache, hash_key
+
+
+def test_get_returns_stored_value():
+    """Test that a stored value is returned before it expires."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+
+
+def test_entries_expire_after_ttl():
+    """Test that entries are dropped once their TTL has passed."""
+    cache = TTLCache(maxsize=2, ttl=10)
+    with patch("app.common.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("app.common.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the LRU entry is evicted when the cache is full."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_hash_key_is_stable():
+    """Test that equal inputs produce equal digests."""
+    assert hash_key("sell shoes") == hash_key("sell shoes")
+    assert hash_key("sell shoes") != hash_key("sell hats")
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    """Test that concurrent calls with the same key run the function once."""
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    flights = SingleFlight()
+    results = await asyncio.gather(*(flights.do("k", work, 21) for _ in range(5)))
+
+    assert results == [42] * 5
+    assert calls == [21]
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_exceptions():
+    """Test that a failure is raised to every waiting caller."""
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    flights = SingleFlight()
+    results = await asyncio.gather(flights.do("k", fail), flights.do("k", fail), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
@@ -0,0 +1,73 @@
+"""
+Tests for the downstream-service circuit breaker.
+"""
+
+import pytest
+from unittest.mock import patch
+from app.common.circuit_breaker import CircuitBreaker, CircuitBreakerError
+
+
+async def _fail():
+    raise ConnectionError("down")
+
+
+async def _ok():
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_opens_after_fail_max_failures():
+    """Test that the breaker fails fast once fail_max failures are seen."""
+    breaker = CircuitBreaker("product", fail_max=2, reset_timeout=30)
+    
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await breaker.call(_fail)
+    
+    assert breaker.state == "open"
+    with pytest.raises(CircuitBreakerError):
+        await breaker.call(_ok)
+
+
+@pytest.mark.asyncio
+async def test_success_resets_failure_count():
+    """Test that only consecutive failures open the breaker."""
+    breaker = CircuitBreaker("product", fail_max=2, reset_timeout=30)
+    
+    with pytest.raises(ConnectionError):
+        await breaker.call(_fail)
+    assert await breaker.call(_ok) == "ok"
+    with pytest.raises(ConnectionError):
+        await breaker.call(_fail)
+    
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_half_open_trial_closes_or_reopens():
+    """Test that a trial call after reset_timeout decides the next state."""
+    breaker = CircuitBreaker("product", fail_max=1, reset_timeout=10)
+    with patch("app.common.circuit_breaker.time.monotonic", return_value=100.0):
+        with pytest.raises(ConnectionError):
+            await breaker.call(_fail)
+    
+    with patch("app.common.circuit_breaker.time.monotonic", return_value=111.0):
+        assert breaker.state == "half_open"
+        with pytest.raises(ConnectionError):
+            await breaker.call(_fail)
+        assert breaker.state == "open"
+    
+    with patch("app.common.circuit_breaker.time.monotonic", return_value=122.0):
+        assert await breaker.call(_ok) == "ok"
+        assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_ignored_exceptions_do_not_count():
+    """Test that exceptions rejected by is_failure leave the breaker closed."""
+    breaker = CircuitBreaker("product", fail_max=1, is_failure=lambda exc: False)
+    
+    with pytest.raises(ConnectionError):
+        await breaker.call(_fail)
+    
+    assert breaker.state == "closed"
@@ -0,0 +1,37 @@
+"""
+Tests for the structured-concurrency helpers.
+"""
+
+import asyncio
+import pytest
+from app.common.concurrency import gather_or_cancel
+
+
+@pytest.mark.asyncio
+async def test_gather_or_cancel_returns_results_in_order():
+    """Test that results come back in argument order."""
+    async def delayed(value, delay):
+        await asyncio.sleep(delay)
+        return value
+
+    assert await gather_or_cancel(delayed("a", 0.02), delayed("b", 0)) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_gather_or_cancel_cancels_siblings_and_reraises():
+    """Test that the first failure cancels the other tasks and is re-raised unwrapped."""
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await gather_or_cancel(slow(), fail())
+    assert cancelled.is_set()
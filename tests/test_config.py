@@ -0,0 +1,21 @@
+"""
+Tests for settings loading.
+"""
+
+from app.common.config import get_settings
+
+
+def test_get_settings_is_cached():
+    """Test that settings are parsed once and shared."""
+    assert get_settings() is get_settings()
+
+
+def test_get_settings_cache_clear(monkeypatch):
+    """Test that cache_clear picks up environment changes."""
+    monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+    get_settings.cache_clear()
+    try:
+        assert get_settings().LOG_LEVEL == "DEBUG"
+    finally:
+        monkeypatch.undo()
+        get_settings.cache_clear()
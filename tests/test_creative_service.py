@@ -9,6 +9,7 @@ Tests cover:
 - Error handling
 """
 
+import json
 import pytest
 import sys
 import os
@@ -21,6 +22,7 @@ project_root = os.path.dirname(test_dir)
 sys.path.insert(0, project_root)
 
 from app.services.creative_service.main import app
+from app.services.creative_service import creative_utils
 from app.services.creative_service.schemas import GenerateCreativesRequest, GenerateCreativesResponse
 from app.common.schemas import CampaignSpec, Product, Creative, ErrorResponse
 from app.services.creative_service.creative_utils import (
@@ -29,8 +31,10 @@ from app.services.creative_service.creative_utils import (
     build_copy_prompt,
     build_image_prompt,
     parse_copy_response,
+    parse_creative_response,
     fallback_text_generation,
     fallback_image_url,
+    run_creative_qa,
 )
 
 
@@ -119,7 +123,7 @@ class TestGenerateCreatives:
         # Should return 422 validation error from FastAPI
         assert response.status_code == 422
     
-    @patch('app.services.creative_service.main.call_gemini_text')
+    @patch('app.services.creative_service.creative_utils.call_gemini_text')
     @patch('app.services.creative_service.main.call_gemini_image')
     def test_generate_creatives_success(self, mock_image, mock_text, sample_request):
         """Test successful creative generation."""
@@ -155,7 +159,7 @@ class TestGenerateCreatives:
         assert "raw_llm_responses" in data["debug"]
         assert "qa_results" in data["debug"]
     
-    @patch('app.services.creative_service.main.call_gemini_text')
+    @patch('app.services.creative_service.creative_utils.call_gemini_text')
     @patch('app.services.creative_service.main.call_gemini_image')
     def test_generate_creatives_multiple_products(self, mock_image, mock_text, sample_campaign_spec):
         """Test generating creatives for multiple products."""
@@ -189,7 +193,7 @@ class TestGenerateCreatives:
         assert data["status"] == "success"
         assert len(data["creatives"]) >= 6
     
-    @patch('app.services.creative_service.main.call_gemini_text')
+    @patch('app.services.creative_service.creative_utils.call_gemini_text')
     @patch('app.services.creative_service.main.call_gemini_image')
     def test_generate_creatives_llm_fallback(self, mock_image, mock_text, sample_request):
         """Test that fallback is used when LLM fails."""
@@ -209,6 +213,78 @@ class TestGenerateCreatives:
         creative = data["creatives"][0]
         assert creative["primary_text"]
         assert len(creative["primary_text"]) > 0
+    
+    @patch('app.services.creative_service.creative_utils.call_gemini_text')
+    @patch('app.services.creative_service.main.call_gemini_image')
+    def test_generate_creatives_one_llm_call_per_variant(self, mock_image, mock_text, sample_request):
+        """Test copy and image briefs for all variants come from one packed LLM call."""
+        item = {"headline": "Amazing Headphones", "primary_text": "Experience premium sound quality.", "image_prompt": "Headphones on a marble desk at sunrise"}
+        mock_text.side_effect = lambda prompt, response_schema=None, max_tokens=None: json.dumps(
+            {"results": [item] * prompt.count("\n### Item ")}
+        )
+        mock_image.return_value = None
+        
+        response = client.post("/generate_creatives", json=sample_request)
+        data = response.json()
+        
+        assert data["status"] == "success"
+        # All variants fit in one packed request
+        assert mock_text.call_count == 1
+        assert data["creatives"][0]["headline"] == "Amazing Headphones"
+        assert data["debug"]["image_generation"][0]["image_description"] == "Headphones on a marble desk at sunrise"
+        assert data["debug"]["copy_prompts"] == []
+    
+    @patch('app.services.creative_service.creative_utils.call_gemini_text')
+    @patch('app.services.creative_service.main.call_gemini_image')
+    def test_generate_creatives_incomplete_combined_response_falls_back(self, mock_image, mock_text, sample_request):
+        """Test separate copy and image prompts are used when the combined response lacks a field."""
+        item = {"headline": "Amazing Headphones", "primary_text": "Experience premium sound quality."}
+        mock_text.side_effect = lambda prompt, response_schema=None, max_tokens=None: json.dumps(
+            {"results": [item] * prompt.count("\n### Item ")} if "\n### Item " in prompt else item
+        )
+        mock_image.return_value = None
+        
+        response = client.post("/generate_creatives", json=sample_request)
+        data = response.json()
+        
+        assert data["status"] == "success"
+        # One packed call plus separate copy and image calls per variant
+        assert mock_text.call_count == 1 + 2 * len(data["creatives"])
+        assert len(data["debug"]["copy_prompts"]) == len(data["creatives"])
+        assert data["creatives"][0]["headline"] == "Amazing Headphones"
+
+    
+    @patch('app.services.creative_service.creative_utils.call_gemini_text')
+    @patch('app.services.creative_service.main.call_openai_image')
+    def test_generate_creatives_images_generated_concurrently(self, mock_image, mock_text, sample_request):
+        """Test image generation for different variants overlaps."""
+        import threading
+        import time
+        
+        lock = threading.Lock()
+        running = []
+        peak = []
+        
+        def slow_image(prompt):
+            with lock:
+                running.append(prompt)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(prompt)
+            return "https://example.com/generated.jpg"
+        
+        mock_text.return_value = None
+        mock_image.side_effect = slow_image
+        sample_request["ab_config"] = {"variants_per_product": 3, "enable_image_generation": True}
+        
+        response = client.post("/generate_creatives", json=sample_request)
+        data = response.json()
+        
+        assert data["status"] == "success"
+        assert all(c["image_url"] == "https://example.com/generated.jpg" for c in data["creatives"])
+        assert mock_image.call_count == len(data["creatives"]) == 3
+        assert max(peak) > 1
 
 
 class TestCreativeUtils:
@@ -222,6 +298,58 @@ class TestCreativeUtils:
         assert "copy_style" in policy["default"]
         assert "visual_style" in policy["default"]
     
+    def test_load_creative_policy_is_cached_until_file_changes(self, tmp_path):
+        """Test that the policy is parsed once per file version."""
+        policy_file = tmp_path / "policy.yaml"
+        policy_file.write_text("default:\n  tone: calm\n")
+        
+        first = load_creative_policy(str(policy_file))
+        assert load_creative_policy(str(policy_file)) is first
+        
+        policy_file.write_text("default:\n  tone: bold\n")
+        os.utime(policy_file, ns=(0, os.stat(policy_file).st_mtime_ns + 1_000_000))
+        assert load_creative_policy(str(policy_file))["default"]["tone"] == "bold"
+    
+    def test_load_creative_policy_detects_same_mtime_rewrite(self, tmp_path):
+        """Test that a rewrite keeping the mtime is still noticed through the file size."""
+        policy_file = tmp_path / "policy.yaml"
+        policy_file.write_text("default:\n  tone: calm\n")
+        mtime_ns = os.stat(policy_file).st_mtime_ns
+        load_creative_policy(str(policy_file))
+        
+        policy_file.write_text("default:\n  tone: cheerful\n")
+        os.utime(policy_file, ns=(mtime_ns, mtime_ns))
+        assert load_creative_policy(str(policy_file))["default"]["tone"] == "cheerful"
+    
+    def test_load_creative_policy_cache_is_bounded(self, tmp_path):
+        """Test that the least recently used policy files are evicted."""
+        creative_utils._POLICY_CACHE.clear()
+        paths = []
+        for i in range(creative_utils._POLICY_CACHE_MAX + 2):
+            policy_file = tmp_path / f"policy_{i}.yaml"
+            policy_file.write_text(f"default:\n  tone: t{i}\n")
+            paths.append(str(policy_file))
+            load_creative_policy(paths[-1])
+        
+        assert len(creative_utils._POLICY_CACHE) == creative_utils._POLICY_CACHE_MAX
+        assert paths[0] not in creative_utils._POLICY_CACHE
+        assert paths[-1] in creative_utils._POLICY_CACHE
+    
+    def test_load_creative_policy_uses_fresh_json_sidecar(self, tmp_path):
+        """Test that a parsed policy is written as JSON and preferred while fresh."""
+        policy_file = tmp_path / "policy.yaml"
+        policy_file.write_text("default:\n  tone: calm\n")
+        sidecar = tmp_path / "policy.yaml.json"
+        
+        load_creative_policy(str(policy_file))
+        assert sidecar.exists()
+        
+        creative_utils._POLICY_CACHE.clear()
+        with patch.object(creative_utils.yaml, "load") as mock_yaml:
+            policy = load_creative_policy(str(policy_file))
+        mock_yaml.assert_not_called()
+        assert policy == {"default": {"tone": "calm"}}
+    
     def test_get_policy_for_category_exact_match(self):
         """Test getting policy for exact category match."""
         policy = {
@@ -241,6 +369,15 @@ class TestCreativeUtils:
         result = get_policy_for_category("unknown_category", policy)
         assert result["copy_style"] == "default_style"
     
+    def test_get_policy_for_category_resets_for_new_policy(self):
+        """Test cached category resolutions are not reused across policies."""
+        first = {"default": {"tone": "plain"}, "electronics": {"tone": "tech"}}
+        assert get_policy_for_category("Consumer Electronics", first)["tone"] == "tech"
+        assert get_policy_for_category("consumer electronics", first) is first["electronics"]
+        
+        second = {"default": {"tone": "bold"}}
+        assert get_policy_for_category("Consumer Electronics", second)["tone"] == "bold"
+    
     def test_build_copy_prompt(self, sample_product, sample_campaign_spec):
         """Test building copy prompt."""
         policy = load_creative_policy()
@@ -252,6 +389,13 @@ class TestCreativeUtils:
         assert sample_campaign_spec.platform in prompt
         assert "variant" in prompt.lower() or "A" in prompt
     
+    def test_build_copy_prompt_follows_policy_changes(self, sample_product, sample_campaign_spec):
+        """Test the cached style block is rebuilt for a new policy object."""
+        calm = {"default": {"tone": "calm"}}
+        bold = {"default": {"tone": "bold"}}
+        assert "- Tone: calm" in build_copy_prompt(sample_product, sample_campaign_spec, calm, "A")
+        assert "- Tone: bold" in build_copy_prompt(sample_product, sample_campaign_spec, bold, "A")
+    
     def test_build_image_prompt(self, sample_product, sample_campaign_spec):
         """Test building image prompt."""
         policy = load_creative_policy()
@@ -261,6 +405,120 @@ class TestCreativeUtils:
         assert len(prompt) > 0
         assert sample_product.title in prompt
     
+    @pytest.mark.asyncio
+    async def test_call_gemini_text_batch_async_preserves_order(self):
+        """Test batched text generation returns one result per prompt, in order."""
+        with patch.object(creative_utils, "call_gemini_text", side_effect=lambda prompt, response_schema=None: prompt.upper()) as mock_text:
+            results = await creative_utils.call_gemini_text_batch_async(["a", "b", "c"], response_schema={"type": "object"})
+        
+        assert results == ["A", "B", "C"]
+        assert mock_text.call_count == 3
+        assert all(call.args[1] == {"type": "object"} for call in mock_text.call_args_list)
+    
+    @pytest.mark.asyncio
+    async def test_call_gemini_text_batch_async_respects_concurrency_limit(self):
+        """Test batched prompts share the run_bounded limit instead of opening their own pool."""
+        import threading
+        import time
+        
+        running = 0
+        peak = []
+        lock = threading.Lock()
+        
+        def slow_call(prompt, response_schema=None):
+            nonlocal running
+            with lock:
+                running += 1
+                peak.append(running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return prompt
+        
+        with patch.object(creative_utils.settings, "LLM_MAX_CONCURRENCY", 2), \
+                patch.object(creative_utils, "_CALL_SLOTS", creative_utils.weakref.WeakKeyDictionary()), \
+                patch.object(creative_utils, "call_gemini_text", side_effect=slow_call):
+            results = await creative_utils.call_gemini_text_batch_async([str(i) for i in range(6)])
+        
+        assert results == [str(i) for i in range(6)]
+        assert max(peak) <= 2
+    
+    @pytest.mark.asyncio
+    async def test_call_gemini_text_async_runs_sync_call(self):
+        """Test the async wrapper returns the provider chain's result."""
+        with patch.object(creative_utils, "call_gemini_text", return_value="text") as mock_text:
+            result = await creative_utils.call_gemini_text_async("prompt", response_schema={"type": "object"})
+        
+        assert result == "text"
+        mock_text.assert_called_once_with("prompt", {"type": "object"})
+
+    @pytest.mark.asyncio
+    async def test_run_bounded_limits_concurrent_calls(self):
+        """Test that no more than LLM_MAX_CONCURRENCY provider calls run at once."""
+        import asyncio
+        import threading
+        import time
+    
+        lock = threading.Lock()
+        running = []
+        peak = []
+    
+        def slow_call(value):
+            with lock:
+                running.append(value)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(value)
+            return value
+    
+        with patch.object(creative_utils.settings, "LLM_MAX_CONCURRENCY", 2), \
+                patch.object(creative_utils, "_CALL_SLOTS", creative_utils.weakref.WeakKeyDictionary()):
+            results = await asyncio.gather(*(creative_utils.run_bounded(slow_call, i) for i in range(6)))
+    
+        assert results == list(range(6))
+        assert max(peak) <= 2
+    
+    def test_call_gemini_text_packed_splits_results(self):
+        """Test packed text generation answers several prompts with one call."""
+        packed = '{"results": [{"headline": "A"}, {"headline": "B"}]}'
+        with patch.object(creative_utils, "call_gemini_text", return_value=packed) as mock_text:
+            results = creative_utils.call_gemini_text_packed(["a", "b"], {"type": "object"})
+    
+        assert [json.loads(r) for r in results] == [{"headline": "A"}, {"headline": "B"}]
+        assert mock_text.call_count == 1
+    
+    def test_call_gemini_text_packed_scales_output_budget(self):
+        """Test the packed request gets an output token budget per item."""
+        packed = '{"results": [{"headline": "A"}, {"headline": "B"}, {"headline": "C"}]}'
+        with patch.object(creative_utils, "call_gemini_text", return_value=packed) as mock_text:
+            creative_utils.call_gemini_text_packed(["a", "b", "c"], {"type": "object"})
+        
+        assert mock_text.call_args.kwargs["max_tokens"] == 3 * creative_utils.PACKED_ITEM_MAX_TOKENS
+    
+    @pytest.mark.asyncio
+    async def test_call_gemini_text_packed_falls_back_on_truncated_reply(self):
+        """Test a packed reply cut off at the token limit falls back to one call per prompt."""
+        truncated = '{"results": [{"headline": "A", "primary_text": "x"}, {"headline": "B", "prim'
+        with patch.object(creative_utils, "call_gemini_text", return_value=truncated):
+            assert creative_utils.call_gemini_text_packed(["a", "b"], {"type": "object"}) is None
+        
+        with patch.object(creative_utils, "call_gemini_text", side_effect=[truncated, "a", "b"]) as mock_text:
+            results = await creative_utils.call_gemini_text_packed_async(["a", "b"], {"type": "object"})
+        
+        assert sorted(results) == ["a", "b"]
+        assert mock_text.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_call_gemini_text_packed_falls_back_on_count_mismatch(self):
+        """Test a packed response with the wrong number of results falls back to one call per prompt."""
+        responses = ['{"results": [{"headline": "A"}]}', "a", "b"]
+        with patch.object(creative_utils, "call_gemini_text", side_effect=responses) as mock_text:
+            results = await creative_utils.call_gemini_text_packed_async(["a", "b"], {"type": "object"})
+    
+        assert sorted(results) == ["a", "b"]
+        assert mock_text.call_count == 3
+    
     def test_parse_copy_response_valid_json(self):
         """Test parsing valid JSON response."""
         response = '{"headline": "Test Headline", "primary_text": "Test text"}'
@@ -275,6 +533,13 @@ class TestCreativeUtils:
         assert headline == "Test"
         assert primary_text == "Text"
     
+    def test_parse_copy_response_surrounded_by_prose(self):
+        """Test parsing a JSON object with explanation text around it."""
+        response = 'Here is your copy:\n```\n{"headline": "Test", "primary_text": "Text"}\n```\nEnjoy!'
+        headline, primary_text = parse_copy_response(response)
+        assert headline == "Test"
+        assert primary_text == "Text"
+    
     def test_parse_copy_response_invalid(self):
         """Test parsing invalid response returns None."""
         response = "This is not JSON"
@@ -285,6 +550,26 @@ class TestCreativeUtils:
         assert headline is None or isinstance(headline, str)
         assert primary_text is None or isinstance(primary_text, str)
     
+    def test_parse_copy_response_plain_text_fallback(self):
+        """Test non-JSON text uses the first line as headline and the rest as body."""
+        response = "  Big Sale Today  \r\n\r\nGreat prices on everything.\r\nShop now.\n"
+        headline, primary_text = parse_copy_response(response)
+        assert headline == "Big Sale Today"
+        assert primary_text == "Great prices on everything. Shop now."
+    
+    def test_parse_creative_response(self):
+        """Test the combined response needs all three fields."""
+        complete = '```json\n{"headline": " Test ", "primary_text": "Text", "image_prompt": "A photo"}\n```'
+        assert parse_creative_response(complete) == {
+            "headline": "Test",
+            "primary_text": "Text",
+            "image_prompt": "A photo"
+        }
+        assert parse_creative_response('{"headline": "Test", "primary_text": "Text"}') is None
+        assert parse_creative_response('{"headline": "Test", "primary_text": "Text", "image_prompt": ""}') is None
+        assert parse_creative_response("Not JSON at all") is None
+        assert parse_creative_response(None) is None
+    
     def test_parse_copy_response_empty(self):
         """Test parsing empty response."""
         headline, primary_text = parse_copy_response("")
@@ -323,6 +608,25 @@ class TestCreativeUtils:
         # Verify it's deterministic (same product_id should give same URL)
         url2 = fallback_image_url(product)
         assert url == url2
+    
+    def test_run_creative_qa_checks_headline_and_text(self):
+        """Test QA flags banned words in either field and length limits."""
+        creative = Creative(
+            product_id="PROD-001",
+            platform="meta",
+            variant_id="A",
+            primary_text="A perfectly ordinary description.",
+            headline="Click Here Now"
+        )
+        assert run_creative_qa(creative) == (False, ["Banned word detected: click here"])
+        
+        creative.headline = "Great Deal"
+        assert run_creative_qa(creative) == (True, [])
+        
+        creative.primary_text = "Spam"
+        is_valid, issues = run_creative_qa(creative)
+        assert not is_valid
+        assert issues == ["Primary text too short: 4 chars", "Banned word detected: spam"]
 
 
 class TestSchemas:
@@ -0,0 +1,83 @@
+"""
+Tests for database engine initialization.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from app.common import db
+
+
+@pytest.fixture
+def reset_db_state():
+    """Restore module-level engine state after each test."""
+    engine, session_local = db._engine, db._SessionLocal
+    yield
+    if db._engine is not None and db._engine is not engine:
+        db._engine.dispose()
+    db._engine, db._SessionLocal = engine, session_local
+
+
+def test_engine_options_defaults(monkeypatch):
+    """Test pool sizing defaults and env overrides."""
+    monkeypatch.delenv("DB_NULL_POOL", raising=False)
+    monkeypatch.delenv("DB_POOL_SIZE", raising=False)
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "5")
+    
+    options = db._engine_options()
+    
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 5
+    assert options["pool_recycle"] == 1800
+    assert options["pool_timeout"] == 10
+
+
+def test_engine_options_null_pool(monkeypatch):
+    """Test that DB_NULL_POOL disables pooling."""
+    monkeypatch.setenv("DB_NULL_POOL", "true")
+    
+    options = db._engine_options()
+    
+    assert options["poolclass"] is db.NullPool
+    assert "pool_size" not in options
+
+
+def test_init_db_sqlite(tmp_path, reset_db_state):
+    """Test that init_db connects and passes the smoke query."""
+    assert db.init_db(f"sqlite:///{tmp_path / 'test.db'}") is True
+    assert db.is_db_available()
+
+
+def test_get_db_session_without_database(reset_db_state):
+    """Test that sessions are None when no database is configured."""
+    db._engine, db._SessionLocal = None, None
+    
+    with db.get_db_session() as session:
+        assert session is None
+
+
+def test_get_db_closes_session(reset_db_state):
+    """Test that the get_db dependency closes its session."""
+    session = MagicMock()
+    db._SessionLocal = MagicMock(return_value=session)
+    
+    gen = db.get_db()
+    assert next(gen) is session
+    gen.close()
+    
+    session.close.assert_called_once()
+
+
+def test_json_columns_use_orjson(tmp_path, reset_db_state):
+    """Test that JSON columns round-trip through the orjson serializers."""
+    from sqlalchemy import Column, Integer, MetaData, Table, insert, select
+    
+    assert db._engine_options()["json_deserializer"] is db.orjson.loads
+    assert db.init_db(f"sqlite:///{tmp_path / 'json.db'}") is True
+    
+    table = Table("json_rows", MetaData(), Column("id", Integer, primary_key=True), Column("data", db.JSONType))
+    table.create(db._engine)
+    payload = {"request": {"budget": 1000.5}, "tags": ["a", "b"]}
+    
+    with db._engine.begin() as conn:
+        conn.execute(insert(table).values(id=1, data=payload))
+        assert conn.execute(select(table.c.data)).scalar_one() == payload
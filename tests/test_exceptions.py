@@ -0,0 +1,68 @@
+"""
+Tests for the shared exception handlers.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from app.common import exceptions
+from app.common.exceptions import register_exception_handlers
+from app.common.middleware import RequestIDMiddleware
+
+
+def _make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestIDMiddleware)
+    register_exception_handlers(app)
+    
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+    
+    return app
+
+
+def test_unexpected_error_returns_500_and_logs_traceback():
+    """Test that unhandled errors return a standard 500 and are logged off-loop."""
+    client = TestClient(_make_app(), raise_server_exceptions=False)
+    
+    # Single worker so the trailing no-op job runs after the logging job
+    executor = ThreadPoolExecutor(max_workers=1)
+    with patch.object(exceptions, "_error_log_executor", executor), \
+         patch.object(exceptions, "_log_unexpected_error") as mock_log:
+        response = client.get("/boom", headers={"X-Request-ID": "err-1"})
+        executor.submit(lambda: None).result()
+    executor.shutdown()
+    
+    assert response.status_code == 500
+    data = response.json()
+    assert data["error_code"] == "INTERNAL_ERROR"
+    assert data["details"] == {"request_id": "err-1", "exception_type": "RuntimeError"}
+    
+    mock_log.assert_called_once()
+    request_id, exc = mock_log.call_args[0]
+    assert request_id == "err-1"
+    assert isinstance(exc, RuntimeError)
+
+
+def test_unexpected_error_log_record_carries_request_id():
+    """Test the traceback record is stamped with the request's ID, not the reset context."""
+    client = TestClient(_make_app(), raise_server_exceptions=False)
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    
+    executor = ThreadPoolExecutor(max_workers=1)
+    exceptions.logger.addHandler(handler)
+    try:
+        with patch.object(exceptions, "_error_log_executor", executor):
+            client.get("/boom", headers={"X-Request-ID": "rid-42"})
+            executor.submit(lambda: None).result()
+    finally:
+        exceptions.logger.removeHandler(handler)
+        executor.shutdown()
+    
+    assert len(records) == 1
+    assert records[0].request_id == "rid-42"
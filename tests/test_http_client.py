@@ -0,0 +1,118 @@
+"""
+Tests for the MCP HTTP client retry behaviour.
+"""
+
+import httpx
+import pytest
+from unittest.mock import patch
+from tenacity import wait_none
+from app.common.http_client import MCPClient, AsyncMCPClient
+
+
+def _flaky_handler(statuses):
+    """Return a handler that answers with the given statuses in order."""
+    calls = []
+
+    def handler(request):
+        status = statuses[min(len(calls), len(statuses) - 1)]
+        calls.append(request)
+        return httpx.Response(status, json={"status": "ok"})
+
+    return handler, calls
+
+
+def test_post_retries_gateway_errors():
+    """Test that 503 responses are retried until success."""
+    handler, calls = _flaky_handler([503, 502, 200])
+    client = MCPClient("http://mcp.test")
+    client.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    with patch.object(MCPClient._send.retry, "wait", wait_none()):
+        result = client.post("/append_event", {"event_type": "test"})
+
+    assert result == {"status": "ok"}
+    assert len(calls) == 3
+    client.close()
+
+
+def test_post_does_not_retry_client_errors():
+    """Test that 4xx responses fail immediately."""
+    handler, calls = _flaky_handler([422])
+    client = MCPClient("http://mcp.test")
+    client.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.post("/append_event", {})
+
+    assert len(calls) == 1
+    client.close()
+
+
+@pytest.mark.asyncio
+async def test_async_post_retries_gateway_errors():
+    """Test that the async client retries 504 responses."""
+    handler, calls = _flaky_handler([504, 200])
+    client = AsyncMCPClient("http://mcp.test")
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch.object(AsyncMCPClient._send.retry, "wait", wait_none()):
+        result = await client.post("/generate_creatives", {})
+
+    assert result == {"status": "ok"}
+    assert len(calls) == 2
+    await client.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_warmup_ignores_unreachable_services():
+    """Test that warmup never raises for services that are down."""
+    from app.common.http_client import warmup_async_clients, close_async_clients
+    
+    await warmup_async_clients(["http://127.0.0.1:9", "http://127.0.0.1:9"], timeout=1.0)
+    await close_async_clients()
+
+
+@pytest.mark.asyncio
+async def test_warmup_uses_shared_pipeline_client():
+    """Test that warmup opens connections on the client the orchestrators call through."""
+    from app.common import http_client
+    
+    seen = []
+    
+    def handler(request):
+        seen.append(str(request.url))
+        return httpx.Response(200, json={"status": "healthy"})
+    
+    shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch.object(http_client, "get_async_client", return_value=shared) as mock_get:
+        await http_client.warmup_async_clients(["http://localhost:8001/", "http://localhost:8004"])
+    await shared.aclose()
+    
+    assert all(call.args == () for call in mock_get.call_args_list)
+    assert sorted(seen) == ["http://localhost:8001/health", "http://localhost:8004/health"]
+
+
+def test_post_records_latency_histogram():
+    """Test that calls are recorded per service, endpoint and status."""
+    prometheus_client = pytest.importorskip("prometheus_client")
+    labels = {"service": "metrics.test", "endpoint": "/select_products", "status": "200"}
+    before = prometheus_client.REGISTRY.get_sample_value("mcp_client_latency_seconds_count", labels) or 0
+    
+    handler, _ = _flaky_handler([200])
+    client = MCPClient("http://metrics.test")
+    client.client = httpx.Client(transport=httpx.MockTransport(handler))
+    client.post("/select_products", {})
+    client.close()
+    
+    after = prometheus_client.REGISTRY.get_sample_value("mcp_client_latency_seconds_count", labels)
+    assert after == before + 1
+
+
+def test_sync_clients_share_connection_pool():
+    """Test that MCPClient instances reuse one pooled httpx.Client."""
+    first = MCPClient("http://product.test")
+    second = MCPClient("http://strategy.test")
+
+    assert first.client is second.client
+    first.close()
+    assert not second.client.is_closed
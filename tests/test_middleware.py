@@ -0,0 +1,70 @@
+"""
+Tests for logging configuration and request ID middleware.
+"""
+
+import json
+import logging
+import pytest
+from app.common.middleware import RequestIDMiddleware, _build_formatter, request_id_context
+
+
+def _make_record(message: str) -> logging.LogRecord:
+    return logging.getLogger("tests.middleware").makeRecord(
+        "tests.middleware", logging.INFO, __file__, 1, message, None, None
+    )
+
+
+def test_json_formatter_includes_request_id():
+    """Test that JSON logs carry the current request ID and service name."""
+    token = request_id_context.set("req-123")
+    try:
+        record = _make_record("hello")
+    finally:
+        request_id_context.reset(token)
+    
+    payload = json.loads(_build_formatter("json", "test_service").format(record))
+    
+    assert payload["message"] == "hello"
+    assert payload["request_id"] == "req-123"
+    assert payload["level"] == "INFO"
+    assert payload["service"] == "test_service"
+
+
+def test_text_formatter():
+    """Test that the plain text format is still available."""
+    record = _make_record("hello")
+    
+    line = _build_formatter("text").format(record)
+    
+    assert "[no-request-id] - hello" in line
+
+
+def test_request_id_header_is_echoed(product_client):
+    """Test that a caller-supplied request ID is reused."""
+    response = product_client.get("/health", headers={"X-Request-ID": "caller-id"})
+    
+    assert response.headers["X-Request-ID"] == "caller-id"
+    assert response.headers["X-Process-Time"].endswith("ms")
+
+
+@pytest.mark.asyncio
+async def test_middleware_resets_request_id_context():
+    """Test that the request ID is visible during the request and reset afterwards."""
+    seen = {}
+    sent = []
+    
+    async def app(scope, receive, send):
+        seen["request_id"] = request_id_context.get()
+        seen["state"] = scope["state"]["request_id"]
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+    
+    async def send(message):
+        sent.append(message)
+    
+    middleware = RequestIDMiddleware(app)
+    await middleware({"type": "http", "headers": [(b"x-request-id", b"inner-id")]}, None, send)
+    
+    assert seen == {"request_id": "inner-id", "state": "inner-id"}
+    assert (b"x-request-id", b"inner-id") in sent[0]["headers"]
+    assert request_id_context.get() is None
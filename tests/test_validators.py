@@ -0,0 +1,88 @@
+"""
+Tests for in-process schema validation.
+"""
+
+from app.common.validators import validate_data, validate_list, validate_many
+from tests.testdata import VALID_CAMPAIGN_SPEC_META_ELECTRONICS
+
+
+VALID_SPEC = VALID_CAMPAIGN_SPEC_META_ELECTRONICS.model_dump()
+
+
+def test_validate_data_valid():
+    """Test that a valid campaign spec passes."""
+    result = validate_data("campaign_spec", VALID_SPEC)
+    
+    assert result.valid
+    assert result.errors == ()
+
+
+def test_validate_data_invalid_field():
+    """Test that field errors are reported with their path."""
+    result = validate_data("campaign_spec", {**VALID_SPEC, "platform": "myspace"})
+    
+    assert not result.valid
+    assert result.errors[0]["field"] == "platform"
+    assert result.errors[0]["value"] == "myspace"
+
+
+def test_validate_data_unknown_schema():
+    """Test that unknown schema names are reported as errors."""
+    result = validate_data("does_not_exist", {})
+    
+    assert not result.valid
+    assert result.errors[0]["field"] == "schema_name"
+
+
+def test_validate_list_prefixes_item_index():
+    """Test that list errors are attributed to the failing item."""
+    items = [VALID_SPEC, {**VALID_SPEC, "budget": "lots"}, VALID_SPEC]
+    
+    result = validate_list("campaign_spec", items)
+    
+    assert not result.valid
+    assert [e["field"] for e in result.errors] == ["[1].budget"]
+
+
+def test_validate_list_valid():
+    """Test that a list of valid items passes."""
+    result = validate_list("campaign_spec", [VALID_SPEC, VALID_SPEC])
+    
+    assert result.valid
+
+
+def test_validation_result_to_dict():
+    """Test that results serialize errors as a list."""
+    result = validate_data("campaign_spec", {})
+    
+    data = result.to_dict()
+    
+    assert data["valid"] is False
+    assert isinstance(data["errors"], list)
+    assert len(data["errors"]) == len(result.errors)
+
+
+def test_validate_many_returns_one_result_per_item():
+    """Test that each item gets its own result with unprefixed field paths."""
+    items = [VALID_SPEC, {**VALID_SPEC, "budget": "lots"}, VALID_SPEC]
+    
+    results = validate_many("campaign_spec", items)
+    
+    assert [r.valid for r in results] == [True, False, True]
+    assert [e["field"] for e in results[1].errors] == ["budget"]
+
+
+def test_validate_many_unknown_schema():
+    """Test that every item is rejected for an unknown schema."""
+    results = validate_many("does_not_exist", [{}, {}])
+    
+    assert [r.valid for r in results] == [False, False]
+
+
+def test_validate_many_non_list_input():
+    """Test that a non-list input gets one failed result instead of raising."""
+    results = validate_many("campaign_spec", {"a": 1})
+    
+    assert len(results) == 1
+    assert results[0].valid is False
+    assert "valid list" in results[0].errors[0]["error"]